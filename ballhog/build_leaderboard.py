@@ -7,45 +7,78 @@ Run with:
 from __future__ import annotations
 
 import argparse
+import hashlib
+import inspect
+import json
+import os
 import sys
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-import pandas as pd
-from nba_api.stats.endpoints import leaguedashplayerstats, leaguedashteamstats
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import metric_graph  # noqa: E402
+import nba_data  # noqa: E402
+from nba_data.cache import season_is_finished  # noqa: E402
+from nba_data.lazy import lazy_import  # noqa: E402
+
+# Deferred until first use so --help and imports do not load pandas/nba_api
+pd = lazy_import("pandas")
+leaguedashplayerstats = lazy_import("nba_api.stats.endpoints.leaguedashplayerstats")
+leaguedashteamstats = lazy_import("nba_api.stats.endpoints.leaguedashteamstats")
 
 DEFAULT_SEASONS: List[str] = ["2020-21", "2021-22", "2022-23", "2023-24", "2024-25"]
-REQUEST_DELAY = 0.65  # seconds, satisfies NBA API rate limiting guidance
+DEFAULT_CALLS_PER_HOUR = 550  # stays under the NBA API's ~600 calls/hour ceiling
+DEFAULT_WORKERS = 3
+
+# Requests needed per season, keyed by name; player kinds map to a measure type
+FETCH_KINDS: Dict[str, str] = {
+    "player_base": "Base",
+    "player_advanced": "Advanced",
+    "team_base": "Base",
+}
+
+
+def season_request(season: str, season_type: str, kind: str) -> Tuple[Any, Dict[str, str]]:
+    """Endpoint class and arguments for one ``FETCH_KINDS`` request."""
+    endpoint = (
+        leaguedashteamstats.LeagueDashTeamStats
+        if kind == "team_base"
+        else leaguedashplayerstats.LeagueDashPlayerStats
+    )
+    return endpoint, {
+        "season": season,
+        "season_type_all_star": season_type,
+        "per_mode_detailed": "Totals",
+        "measure_type_detailed_defense": FETCH_KINDS[kind],
+    }
 
 
-def fetch_player_stats(season: str, season_type: str) -> pd.DataFrame:
-    """Pull season aggregate player stats from LeagueDashPlayerStats.
+def season_frame(response: Any, season: str, kind: str) -> pd.DataFrame:
+    """The frame a fetched ``season_request`` contributes to the build."""
+    df = response.get_data_frames()[0]
+    if kind == "team_base":
+        df["SEASON"] = season
+    return df
 
-    Fetches both Base (for FTA, TOV) and Advanced (for AST_PCT) measure types
-    and merges them to get all required columns for the Kobe Quotient calculation.
-    """
-    # Fetch Base stats (has FTA, TOV, TEAM_NAME, etc.)
-    response_base = leaguedashplayerstats.LeagueDashPlayerStats(
-        season=season,
-        season_type_all_star=season_type,
-        per_mode_detailed="Totals",
-        measure_type_detailed_defense="Base",
-    )
-    time.sleep(REQUEST_DELAY)
-    df_base = response_base.get_data_frames()[0]
 
-    # Fetch Advanced stats (has AST_PCT)
-    response_adv = leaguedashplayerstats.LeagueDashPlayerStats(
+def fetch_player_frame(season: str, season_type: str, measure_type: str) -> pd.DataFrame:
+    """Pull one measure type of season aggregate player stats."""
+    response = nba_data.fetch(
+        leaguedashplayerstats.LeagueDashPlayerStats,
         season=season,
         season_type_all_star=season_type,
         per_mode_detailed="Totals",
-        measure_type_detailed_defense="Advanced",
+        measure_type_detailed_defense=measure_type,
     )
-    time.sleep(REQUEST_DELAY)
-    df_adv = response_adv.get_data_frames()[0]
+    return response.get_data_frames()[0]
+
 
-    # Merge on player and team identifiers, keeping all Base columns plus AST_PCT
+def merge_player_frames(df_base: pd.DataFrame, df_adv: pd.DataFrame, season: str) -> pd.DataFrame:
+    """Merge on player and team identifiers, keeping all Base columns plus AST_PCT."""
     df = df_base.merge(
         df_adv[['PLAYER_ID', 'TEAM_ID', 'AST_PCT']],
         on=['PLAYER_ID', 'TEAM_ID'],
@@ -55,22 +88,42 @@ def fetch_player_stats(season: str, season_type: str) -> pd.DataFrame:
     return df
 
 
+def fetch_player_stats(season: str, season_type: str) -> pd.DataFrame:
+    """Pull season aggregate player stats from LeagueDashPlayerStats.
+
+    Fetches both Base (for FTA, TOV) and Advanced (for AST_PCT) measure types
+    and merges them to get all required columns for the Kobe Quotient calculation.
+    """
+    df_base = fetch_player_frame(season, season_type, "Base")
+    df_adv = fetch_player_frame(season, season_type, "Advanced")
+    return merge_player_frames(df_base, df_adv, season)
+
+
 def fetch_team_stats(season: str, season_type: str) -> pd.DataFrame:
     """Pull season aggregate team stats for denominator values."""
-    response = leaguedashteamstats.LeagueDashTeamStats(
+    response = nba_data.fetch(
+        leaguedashteamstats.LeagueDashTeamStats,
         season=season,
         season_type_all_star=season_type,
         per_mode_detailed="Totals",
         measure_type_detailed_defense="Base",
     )
-    time.sleep(REQUEST_DELAY)
     df = response.get_data_frames()[0]
     df["SEASON"] = season
     return df
 
 
-def compute_kobe_quotient(players: pd.DataFrame, teams: pd.DataFrame) -> pd.DataFrame:
-    """Join player and team stats to calculate the Kobe Quotient per player-season."""
+def compute_kobe_quotient(
+    players: pd.DataFrame,
+    teams: pd.DataFrame,
+    metrics: Iterable[str] = metric_graph.DEFAULT_METRICS,
+) -> pd.DataFrame:
+    """Join player and team stats to calculate the Kobe Quotient per player-season.
+
+    ``metrics`` names the columns to add, from ``metric_graph.METRICS``. Only
+    those metrics and what they depend on are computed, in fused NumPy passes.
+    The default is the full leaderboard.
+    """
     player_cols = [
         "SEASON",
         "PLAYER_ID",
@@ -94,101 +147,269 @@ def compute_kobe_quotient(players: pd.DataFrame, teams: pd.DataFrame) -> pd.Data
         "TOV",
     ]
 
-    players_clean = players[player_cols].copy()
-    teams_clean = teams[team_cols].copy()
-
-    merged = players_clean.merge(
-        teams_clean,
+    merged = players[player_cols].merge(
+        teams[team_cols],
         on=["SEASON", "TEAM_ID"],
         suffixes=("", "_TEAM"),
         how="left",
     )
+    return metric_graph.assign(merged, metric_graph.evaluate(merged, metrics))
 
-    merged["PLAYER_POSSESSIONS"] = (
-        merged["FGA"] + 0.44 * merged["FTA"] + merged["TOV"]
-    )
-    merged["TEAM_POSSESSIONS"] = (
-        merged["FGA_TEAM"] + 0.44 * merged["FTA_TEAM"] + merged["TOV_TEAM"]
-    )
-
-    merged["TEAM_POSSESSIONS"] = merged["TEAM_POSSESSIONS"].replace(0, pd.NA)
-
-    # Standard Usage Rate (% of team possessions used)
-    merged["USG_PCT"] = (
-        merged["PLAYER_POSSESSIONS"] / merged["TEAM_POSSESSIONS"]
-    ).fillna(0)
-
-    # Self-Creation Index (usage adjusted down by assist percentage)
-    # High value = high usage with low playmaking = selfish
-    merged["SELF_CREATION_INDEX"] = merged["USG_PCT"] * (1 - (merged["AST_PCT"] / 100.0))
-
-    # Assist-to-Usage Ratio (how much playmaking relative to usage)
-    # Lower ratio = more selfish (high usage, low assists)
-    merged["AST_TO_USG_RATIO"] = (merged["AST_PCT"] / 100.0) / merged["USG_PCT"]
-    merged["AST_TO_USG_RATIO"] = merged["AST_TO_USG_RATIO"].replace([float('inf'), float('-inf')], 0).fillna(0)
 
-    # Shot Creation Load (what % of player's possessions are shots vs turnovers)
-    # Higher = more shooting, less playmaking/turnovers
-    merged["SHOT_CREATION_LOAD"] = (
-        merged["FGA"] / merged["PLAYER_POSSESSIONS"]
-    ).fillna(0)
+def fingerprint_inputs(frames: Dict[str, pd.DataFrame], season_type: str) -> str:
+    """Hash a season's raw input frames together with the metric formulas.
 
-    # Composite Selfishness Score
-    # Combines high usage + low assists + high shot creation
-    # Normalized to 0-100 scale where higher = more selfish
-    merged["SELFISHNESS_SCORE"] = (
-        (merged["USG_PCT"] * 100) * 0.4 +  # 40% weight on usage
-        ((1 - merged["AST_PCT"] / 100.0) * 100) * 0.4 +  # 40% weight on low assists
-        (merged["SHOT_CREATION_LOAD"] * 100) * 0.2  # 20% weight on shot-heavy play
-    )
-
-    # Keep Kobe Quotient for backwards compatibility (same as Self-Creation Index)
-    merged["KOBE_QUOTIENT"] = merged["SELF_CREATION_INDEX"]
-
-    # Rankings based on Selfishness Score (primary metric for identifying selfish players)
-    merged["TEAM_RANK"] = (
-        merged.groupby(["SEASON", "TEAM_ID"])["SELFISHNESS_SCORE"]
-        .rank(ascending=False, method="dense")
-        .astype(int)
-    )
-    merged["LEAGUE_RANK"] = (
-        merged.groupby("SEASON")["SELFISHNESS_SCORE"]
-        .rank(ascending=False, method="min")
-        .astype(int)
-    )
+    Any change to a player or team row, to ``compute_kobe_quotient`` or to
+    the metric formulas yields a new fingerprint and forces that season to be
+    recomputed.
+    """
+    digest = hashlib.sha256()
+    digest.update(season_type.encode("utf-8"))
+    digest.update(inspect.getsource(compute_kobe_quotient).encode("utf-8"))
+    digest.update(inspect.getsource(metric_graph).encode("utf-8"))
+    for kind in sorted(frames):
+        frame = frames[kind]
+        digest.update(kind.encode("utf-8"))
+        digest.update("\x1f".join(map(str, frame.columns)).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(frame, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+class LeaderboardManifest:
+    """Per-season input fingerprints for an existing leaderboard output.
+
+    Stored as JSON next to the output (``ballhog_metrics.csv.manifest.json``).
+    A season whose fingerprint still matches is left as it is in the output.
+    A season recorded as ``final`` (computed after it finished) is not even
+    fetched again.
+    """
 
-    return merged
+    def __init__(self, path: Path, season_type: str) -> None:
+        self.path = Path(path)
+        self.season_type = season_type
+        self.seasons: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("season_type") == season_type:
+                self.seasons = data.get("seasons", {})
+
+    @classmethod
+    def for_output(cls, output_path: Path, season_type: str) -> "LeaderboardManifest":
+        output_path = Path(output_path)
+        manifest = cls(output_path.with_name(output_path.name + ".manifest.json"), season_type)
+        if not output_path.exists():
+            # Fingerprints are meaningless without the rows they describe
+            manifest.seasons = {}
+        return manifest
+
+    def fingerprint(self, season: str) -> Optional[str]:
+        return self.seasons.get(season, {}).get("fingerprint")
+
+    def is_final(self, season: str) -> bool:
+        return bool(self.seasons.get(season, {}).get("final"))
+
+    def update(self, season: str, fingerprint: str, rows: int) -> None:
+        self.seasons[season] = {
+            "fingerprint": fingerprint,
+            "rows": rows,
+            "final": season_is_finished(int(season[:4])),
+            "computed_at": datetime.now().isoformat(timespec="seconds"),
+        }
+
+    def save(self) -> None:
+        """Write atomically so a crash never leaves fingerprints for unwritten rows."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"season_type": self.season_type, "seasons": dict(sorted(self.seasons.items()))}
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def _fetch_season_frame(season: str, season_type: str, kind: str) -> Tuple[pd.DataFrame, float]:
+    """Run one (season, endpoint, measure type) request and time it."""
+    started = time.perf_counter()
+    if kind == "team_base":
+        frame = fetch_team_stats(season, season_type)
+    else:
+        frame = fetch_player_frame(season, season_type, FETCH_KINDS[kind])
+    return frame, time.perf_counter() - started
+
+
+def _threaded_frames(
+    seasons: List[str], season_type: str, workers: int
+) -> Iterator[Tuple[str, str, pd.DataFrame, float]]:
+    """Yield ``(season, kind, frame, seconds)`` as a thread pool completes requests.
+
+    If a request fails, or the consumer stops early, requests that have not
+    started are cancelled instead of spending the hourly budget.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_fetch_season_frame, season, season_type, kind): (season, kind)
+            for season in seasons
+            for kind in FETCH_KINDS
+        }
+        try:
+            for future in as_completed(futures):
+                season, kind = futures[future]
+                frame, elapsed = future.result()
+                yield season, kind, frame, elapsed
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+
+def _async_frames(
+    seasons: List[str], season_type: str, workers: int
+) -> Iterator[Tuple[str, str, pd.DataFrame, float]]:
+    """Yield the same tuples from one concurrent batch over a pooled async client."""
+    keys = [(season, kind) for season in seasons for kind in FETCH_KINDS]
+    with nba_data.FetchSession(workers) as session:
+        responses = session.fetch_all(season_request(season, season_type, kind) for season, kind in keys)
+    for (season, kind), response in zip(keys, responses):
+        if isinstance(response, Exception):
+            raise response
+        yield season, kind, season_frame(response, season, kind), response.fetch_seconds
 
 
 def build_leaderboard(
     seasons: Iterable[str],
     season_type: str,
+    workers: int = DEFAULT_WORKERS,
+    manifest: Optional[LeaderboardManifest] = None,
+    use_async: bool = False,
 ) -> pd.DataFrame:
-    """Fetch stats for the requested seasons and compute the Kobe Quotient."""
-    outputs = []
-    for season in seasons:
-        print(f"Processing season {season} ({season_type})...")
-        players = fetch_player_stats(season, season_type)
-        teams = fetch_team_stats(season, season_type)
-        leaderboard = compute_kobe_quotient(players, teams)
-        outputs.append(leaderboard)
+    """Fetch stats for the requested seasons and compute the Kobe Quotient.
+
+    Every (season, endpoint, measure type) request is submitted to a bounded
+    thread pool up front; the shared rate limiter keeps the pool inside the
+    global budget. Each season is computed as soon as its three frames land.
+    With ``use_async`` the same requests go out as one batch over a pooled
+    asyncio client with ``workers`` requests in flight.
+
+    With a ``manifest`` the build is incremental: final seasons are skipped,
+    seasons whose input fingerprint is unchanged are not recomputed, and the
+    returned frame holds only the seasons that changed. The manifest is
+    updated in memory; the caller saves it once the output is written.
+    """
+    seasons = list(seasons)
+    if manifest is not None:
+        final = [season for season in seasons if manifest.is_final(season)]
+        if final:
+            print(f"Skipping {len(final)} final season(s) already in the output: {', '.join(final)}")
+        seasons = [season for season in seasons if season not in final]
+    frames: Dict[str, Dict[str, pd.DataFrame]] = {season: {} for season in seasons}
+    timings: Dict[str, Dict[str, float]] = {
+        season: {"fetch": 0.0, "compute": 0.0} for season in seasons
+    }
+    outputs: Dict[str, pd.DataFrame] = {}
+    misses_before = nba_data.fetch_counts["misses"]
+    started = time.perf_counter()
+
+    print(f"Processing {len(seasons)} season(s) ({season_type}) with {workers} {'async ' if use_async else ''}worker(s)...")
+    fetched = (_async_frames if use_async else _threaded_frames)(seasons, season_type, workers)
+    for season, kind, frame, elapsed in fetched:
+        frames[season][kind] = frame
+        timings[season]["fetch"] += elapsed
+        if len(frames[season]) < len(FETCH_KINDS):
+            continue
+
+        compute_started = time.perf_counter()
+        season_frames = frames.pop(season)
+        metrics = nba_data.get_metrics()
+        if manifest is not None:
+            with metrics.stage("fingerprint_inputs"):
+                fingerprint = fingerprint_inputs(season_frames, season_type)
+            if fingerprint == manifest.fingerprint(season):
+                timings[season]["ready"] = time.perf_counter() - started
+                print(f"  {season}: inputs unchanged; keeping existing rows")
+                continue
+        with metrics.stage("merge_player_frames"):
+            players = merge_player_frames(
+                season_frames["player_base"], season_frames["player_advanced"], season
+            )
+        with metrics.stage("compute_kobe_quotient"):
+            leaderboard = compute_kobe_quotient(players, season_frames["team_base"])
+        outputs[season] = leaderboard
+        if manifest is not None:
+            manifest.update(season, fingerprint, len(leaderboard))
+        timings[season]["compute"] = time.perf_counter() - compute_started
+        timings[season]["ready"] = time.perf_counter() - started
         print(
-            f"  -> {len(leaderboard)} player rows processed; "
+            f"  {season}: {len(leaderboard)} player rows processed; "
             f"most selfish: "
             f"{leaderboard.sort_values('SELFISHNESS_SCORE', ascending=False).iloc[0]['PLAYER_NAME']}"
         )
-    return pd.concat(outputs, ignore_index=True)
+
+    print_timing_report(timings, time.perf_counter() - started, nba_data.fetch_counts["misses"] - misses_before)
+    changed = [outputs[season] for season in seasons if season in outputs]
+    if not changed:
+        return pd.DataFrame(columns=["SEASON"])
+    return pd.concat(changed, ignore_index=True)
+
+
+def print_timing_report(
+    timings: Dict[str, Dict[str, float]],
+    wall_seconds: float,
+    network_calls: int,
+) -> None:
+    """Summarize per-season latency against the rate limiter's floor."""
+    limiter = nba_data.get_rate_limiter()
+    floor = max(0, network_calls - 1) * limiter.min_interval
+    if timings:
+        print("\nSeason timing (fetch = summed request latency):")
+    for season, timing in timings.items():
+        print(
+            f"  {season}: fetch {timing['fetch']:.2f}s | "
+            f"compute {timing['compute']:.3f}s | ready at +{timing.get('ready', 0.0):.2f}s"
+        )
+    print(
+        f"Wall clock {wall_seconds:.2f}s for {network_calls} network call(s); "
+        f"rate-limit floor {floor:.2f}s"
+    )
 
 
 def write_csv(df: pd.DataFrame, output_path: Path) -> None:
     """Persist the leaderboard to disk."""
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    df.sort_values(["SEASON", "SELFISHNESS_SCORE"], ascending=[True, False]).to_csv(
-        output_path, index=False
-    )
+    with nba_data.get_metrics().stage("write_output"):
+        df.sort_values(["SEASON", "SELFISHNESS_SCORE"], ascending=[True, False]).to_csv(
+            output_path, index=False
+        )
     print(f"Saved leaderboard to {output_path}")
 
 
+def merge_csv(df: pd.DataFrame, output_path: Path) -> None:
+    """Replace only the seasons in ``df`` within an existing CSV leaderboard.
+
+    Ranks are per season, so rows from untouched seasons keep their stored
+    ``TEAM_RANK``/``LEAGUE_RANK`` and only the rebuilt seasons are re-ranked.
+    """
+    if output_path.exists():
+        existing = pd.read_csv(output_path, dtype={"SEASON": str})
+        existing = existing[~existing["SEASON"].isin(df["SEASON"].unique())]
+        df = pd.concat([existing, df[existing.columns]], ignore_index=True)
+    write_csv(df, output_path)
+
+
+def write_parquet(df: pd.DataFrame, output_path: Path) -> None:
+    """Persist the leaderboard as season-partitioned Parquet.
+
+    Only the seasons present in ``df`` are replaced, so a partial rebuild
+    leaves other seasons' partitions untouched.
+    """
+    from nba_data.storage import write_partitioned
+
+    with nba_data.get_metrics().stage("write_output"):
+        write_partitioned(
+            df.sort_values(["SEASON", "SELFISHNESS_SCORE"], ascending=[True, False]),
+            output_path,
+            "leaderboard",
+        )
+    print(f"Saved leaderboard partitions to {output_path}")
+
+
 def parse_args(argv: List[str]) -> argparse.Namespace:
     """CLI argument parsing."""
     parser = argparse.ArgumentParser(
@@ -209,7 +430,47 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
     parser.add_argument(
         "--output",
         default="ballhog/ballhog_metrics.csv",
-        help="Path for the CSV output.",
+        help="Path for the CSV output (a .parquet directory with --format parquet).",
+    )
+    parser.add_argument(
+        "--format",
+        default="csv",
+        choices=["csv", "parquet"],
+        help="Output storage format.",
+    )
+    parser.add_argument(
+        "--calls-per-hour",
+        type=float,
+        default=DEFAULT_CALLS_PER_HOUR,
+        help="Request budget shared by every NBA API call.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Recompute only seasons whose inputs changed and merge them into the existing output.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Concurrent API requests (all share the --calls-per-hour budget).",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Send the --workers concurrent requests over one pooled asyncio client instead of threads.",
+    )
+    parser.add_argument(
+        "--metrics-dir",
+        type=Path,
+        help="Write fetch/stage events (events.jsonl), a Prometheus snapshot "
+        "(metrics.prom) and summary.json here.",
+    )
+    parser.add_argument(
+        "--stats-server",
+        help="Base URL to send stats requests to, e.g. a local nba_data.standin "
+        "server (default: $NBA_STATS_SERVER or stats.nba.com).",
     )
     return parser.parse_args(argv)
 
@@ -217,8 +478,46 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
 def main(argv: List[str]) -> int:
     """Script entrypoint."""
     args = parse_args(argv)
-    leaderboard = build_leaderboard(args.seasons, args.season_type)
-    write_csv(leaderboard, Path(args.output))
+    metrics = nba_data.configure_metrics(args.metrics_dir / "events.jsonl" if args.metrics_dir else None)
+    try:
+        return run(args)
+    finally:
+        metrics.finish(args.metrics_dir)
+
+
+def run(args: argparse.Namespace) -> int:
+    """Build and write the leaderboard as ``args`` describe."""
+    nba_data.configure_stats_server(args.stats_server)
+    nba_data.configure_rate_limiter(args.calls_per_hour)
+    output_path = Path(args.output)
+    if args.format == "parquet":
+        output_path = output_path.with_suffix(".parquet")
+
+    manifest = LeaderboardManifest.for_output(output_path, args.season_type)
+
+    if not args.incremental:
+        leaderboard = build_leaderboard(args.seasons, args.season_type, args.workers, use_async=args.use_async)
+        if args.format == "parquet":
+            write_parquet(leaderboard, output_path)
+        else:
+            write_csv(leaderboard, output_path)
+        # A full rebuild may drop seasons, so stale fingerprints must not survive it
+        manifest.path.unlink(missing_ok=True)
+        return 0
+
+    leaderboard = build_leaderboard(
+        args.seasons, args.season_type, args.workers, manifest, use_async=args.use_async
+    )
+    if leaderboard.empty:
+        print(f"No season inputs changed; {output_path} is up to date")
+        return 0
+    if args.format == "parquet":
+        # Partition writes already replace only the seasons present
+        write_parquet(leaderboard, output_path)
+    else:
+        merge_csv(leaderboard, output_path)
+    manifest.save()
+    print(f"Recomputed {leaderboard['SEASON'].nunique()} season(s): {', '.join(sorted(leaderboard['SEASON'].unique()))}")
     return 0
 
 
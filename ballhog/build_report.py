@@ -0,0 +1,395 @@
+"""
+Headless, incremental report builder for the selfishness figures.
+
+``selfishness_analysis.ipynb`` re-filters the leaderboard and re-renders
+every 300 dpi PNG on each run, even when the leaderboard has not changed.
+This script builds the same three figures for any number of seasons and
+minutes thresholds:
+
+* the usage/assist landscape
+* the top-10 metric comparison
+* the metric distributions
+
+It works in two steps:
+
+1. **Aggregate** (pandas, in-process): each figure's inputs are reduced to a
+   small JSON artifact. That means the qualified player points, the top-10
+   lists, or histogram counts and medians. Artifacts are cheap to build.
+   Their content hash, combined with the plot parameters and
+   ``RENDER_VERSION``, keys the figure.
+2. **Render** (matplotlib, in a process pool): only figures whose key differs
+   from the one in ``report_manifest.json`` are drawn. A leaderboard change
+   that does not move a season's filtered inputs leaves that season's PNGs
+   alone.
+
+Run with:
+    uv run python3 ballhog/build_report.py --seasons 2022-23 2023-24 --min-minutes 15 20
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from nba_data.lazy import lazy_import  # noqa: E402
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# Bump when a renderer changes so every figure is redrawn once
+RENDER_VERSION = 1
+DEFAULT_INPUT = Path("ballhog/ballhog_metrics.csv")
+DEFAULT_OUTPUT_DIR = Path("ballhog/report")
+DEFAULT_MIN_GP = 20
+DEFAULT_MIN_MINUTES = [15]
+DEFAULT_DPI = 300
+MANIFEST_NAME = "report_manifest.json"
+
+COMPARISON_METRICS = [
+    ("SELFISHNESS_SCORE", "Selfishness Score"),
+    ("SELF_CREATION_INDEX", "Self-Creation Index"),
+    ("USG_PCT", "Standard Usage Rate"),
+]
+DISTRIBUTIONS = [
+    # column, scale, bar color, median line color, x label, title, median format
+    ("SELFISHNESS_SCORE", 1.0, "coral", "red", "Selfishness Score", "Distribution of Selfishness Scores", "{:.1f}"),
+    ("USG_PCT", 100.0, "skyblue", "blue", "Usage Rate (%)", "Distribution of Usage Rates", "{:.1f}%"),
+    ("AST_PCT", 1.0, "lightgreen", "green", "Assist Percentage (%)", "Distribution of Assist Percentages", "{:.1f}%"),
+    ("AST_TO_USG_RATIO", 1.0, "plum", "purple", "AST-to-USG Ratio (lower = more selfish)",
+     "Distribution of AST-to-USG Ratios", "{:.3f}"),
+]
+
+Aggregate = Callable[["pd.DataFrame"], Dict[str, Any]]
+Render = Callable[[Dict[str, Any], Dict[str, Any]], Any]
+FIGURES: Dict[str, Tuple[Aggregate, Render]] = {}
+
+
+def figure(name: str, aggregate: Aggregate) -> Callable[[Render], Render]:
+    """Register a figure: ``aggregate(qualified)`` feeds ``render(artifact, params)``."""
+    def register(render: Render) -> Render:
+        FIGURES[name] = (aggregate, render)
+        return render
+    return register
+
+
+def _landscape_inputs(qualified: pd.DataFrame) -> Dict[str, Any]:
+    top = qualified.nlargest(10, "SELFISHNESS_SCORE")
+    return {
+        "usg": (qualified["USG_PCT"] * 100).round(4).tolist(),
+        "ast": qualified["AST_PCT"].round(4).tolist(),
+        "score": qualified["SELFISHNESS_SCORE"].round(4).tolist(),
+        "minutes": qualified["MIN"].round(2).tolist(),
+        "labels": [
+            [row.PLAYER_NAME, round(row.USG_PCT * 100, 4), round(row.AST_PCT, 4)]
+            for row in top.itertuples()
+        ],
+    }
+
+
+def _comparison_inputs(qualified: pd.DataFrame) -> Dict[str, Any]:
+    panels = {}
+    for metric, _ in COMPARISON_METRICS:
+        top = qualified.nlargest(10, metric)
+        panels[metric] = {"names": top["PLAYER_NAME"].tolist(), "values": top[metric].round(6).tolist()}
+    return panels
+
+
+def _distribution_inputs(qualified: pd.DataFrame) -> Dict[str, Any]:
+    panels = {}
+    for column, scale, *_ in DISTRIBUTIONS:
+        values = (qualified[column] * scale).dropna().to_numpy()
+        counts, edges = np.histogram(values, bins=30) if len(values) else (np.zeros(0), np.zeros(0))
+        panels[column] = {
+            "counts": counts.astype(int).tolist(),
+            "edges": np.round(edges, 6).tolist(),
+            "median": round(float(np.median(values)), 6) if len(values) else None,
+        }
+    return panels
+
+
+def _pyplot():
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    plt.style.use("seaborn-v0_8-whitegrid")
+    return plt
+
+
+@figure("selfishness_landscape", _landscape_inputs)
+def render_landscape(data: Dict[str, Any], params: Dict[str, Any]) -> Any:
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(14, 10))
+    scatter = ax.scatter(
+        data["usg"], data["ast"], c=data["score"], s=[m * 2 for m in data["minutes"]],
+        alpha=0.6, cmap="YlOrRd", edgecolors="black", linewidth=0.5,
+    )
+    cbar = plt.colorbar(scatter, ax=ax)
+    cbar.set_label("Selfishness Score", fontsize=12, fontweight="bold")
+    for name, x, y in data["labels"]:
+        ax.annotate(
+            name, (x, y), xytext=(5, 5), textcoords="offset points", fontsize=9, fontweight="bold",
+            bbox=dict(boxstyle="round,pad=0.3", facecolor="yellow", alpha=0.7),
+        )
+    ax.axhline(y=25, color="gray", linestyle="--", alpha=0.5, label="25% AST (typical for guards)")
+    ax.axvline(x=22, color="gray", linestyle="--", alpha=0.5, label="22% USG (high usage threshold)")
+    ax.set_xlabel("Usage Rate (%)", fontsize=14, fontweight="bold")
+    ax.set_ylabel("Assist Percentage (%)", fontsize=14, fontweight="bold")
+    ax.set_title(
+        f"NBA Player Selfishness Landscape ({params['season']} Season)", fontsize=16, fontweight="bold", pad=20
+    )
+    ax.legend(loc="upper right", fontsize=10)
+    for x, y, text, align, color, extra in (
+        (0.05, 0.95, "Low Usage\nHigh Assists\n(Role Players)", ("top", "left"), "lightblue", {"alpha": 0.5}),
+        (0.95, 0.95, "High Usage\nHigh Assists\n(Elite Playmakers)", ("top", "right"), "lightgreen", {"alpha": 0.5}),
+        (0.95, 0.05, "High Usage\nLow Assists\n(SELFISH SCORERS)", ("bottom", "right"), "salmon",
+         {"alpha": 0.7, "edgecolor": "red", "linewidth": 2}),
+    ):
+        ax.text(
+            x, y, text, transform=ax.transAxes, fontsize=10,
+            verticalalignment=align[0], horizontalalignment=align[1],
+            bbox=dict(boxstyle="round", facecolor=color, **extra),
+        )
+    return fig
+
+
+@figure("metric_comparison", _comparison_inputs)
+def render_comparison(data: Dict[str, Any], params: Dict[str, Any]) -> Any:
+    plt = _pyplot()
+    fig, axes = plt.subplots(1, 3, figsize=(18, 6))
+    for ax, (metric, title) in zip(axes, COMPARISON_METRICS):
+        names, values = data[metric]["names"], data[metric]["values"]
+        positions = range(len(values))
+        ax.barh(positions, values, color=plt.cm.RdYlGn_r(np.linspace(0.2, 0.8, 10))[: len(values)])
+        ax.set_yticks(list(positions))
+        ax.set_yticklabels(names)
+        ax.set_xlabel(title, fontweight="bold")
+        ax.set_title(f"Top 10 by {title}", fontweight="bold", pad=10)
+        ax.invert_yaxis()
+        for i, v in enumerate(values):
+            label = f" {v * 100:.1f}%" if metric == "USG_PCT" else f" {v:.3f}"
+            ax.text(v, i, label, va="center", fontweight="bold")
+    return fig
+
+
+@figure("distribution_analysis", _distribution_inputs)
+def render_distributions(data: Dict[str, Any], params: Dict[str, Any]) -> Any:
+    plt = _pyplot()
+    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+    for ax, (column, _, color, line_color, xlabel, title, fmt) in zip(axes.flat, DISTRIBUTIONS):
+        panel = data[column]
+        if panel["counts"]:
+            edges = panel["edges"]
+            ax.hist(edges[:-1], bins=edges, weights=panel["counts"], color=color, edgecolor="black", alpha=0.7)
+            ax.axvline(
+                panel["median"], color=line_color, linestyle="--", linewidth=2,
+                label=f"Median: {fmt.format(panel['median'])}",
+            )
+            ax.legend()
+        ax.set_xlabel(xlabel, fontweight="bold")
+        ax.set_ylabel("Number of Players", fontweight="bold")
+        ax.set_title(title, fontweight="bold")
+    return fig
+
+
+def figure_key(name: str, data: Dict[str, Any], params: Dict[str, Any]) -> str:
+    """Content hash of a figure's artifact, plot parameters and renderer version."""
+    payload = json.dumps(
+        {"figure": name, "data": data, "params": params, "version": RENDER_VERSION},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def plan_figures(
+    df: pd.DataFrame,
+    seasons: List[str],
+    thresholds: List[float],
+    min_gp: int,
+    dpi: int,
+    output_dir: Path,
+) -> List[Dict[str, Any]]:
+    """Aggregate every (figure, season, threshold) input and write its artifact."""
+    artifact_dir = output_dir / "artifacts"
+    artifact_dir.mkdir(parents=True, exist_ok=True)
+    jobs = []
+    for season in seasons:
+        in_season = df[(df["SEASON"] == season) & (df["GP"] >= min_gp)]
+        for threshold in thresholds:
+            qualified = in_season[in_season["MIN"] >= threshold]
+            params = {"season": season, "min_gp": min_gp, "min_minutes": threshold, "dpi": dpi}
+            for name, (aggregate, _) in FIGURES.items():
+                stem = f"{name}_{season}_min{threshold:g}"
+                data = aggregate(qualified)
+                artifact = artifact_dir / f"{stem}.json"
+                artifact.write_text(json.dumps({"params": params, "data": data}), encoding="utf-8")
+                jobs.append({
+                    "figure": name,
+                    "season": season,
+                    "artifact": artifact,
+                    "output": output_dir / f"{stem}.png",
+                    "key": figure_key(name, data, params),
+                })
+    return jobs
+
+
+def render_job(name: str, artifact: Path, output: Path) -> str:
+    """Draw one figure from its artifact; runs in a worker process."""
+    payload = json.loads(Path(artifact).read_text(encoding="utf-8"))
+    fig = FIGURES[name][1](payload["data"], payload["params"])
+    fig.tight_layout()
+    tmp_path = Path(output).with_name(Path(output).name + ".tmp.png")
+    fig.savefig(tmp_path, dpi=payload["params"]["dpi"], bbox_inches="tight")
+    os.replace(tmp_path, output)
+    import matplotlib.pyplot as plt
+
+    plt.close(fig)
+    return str(output)
+
+
+def load_manifest(output_dir: Path) -> Dict[str, str]:
+    path = output_dir / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def write_index(jobs: List[Dict[str, Any]], output_dir: Path) -> None:
+    """A Markdown page listing every figure by season."""
+    lines = ["# Selfishness report", ""]
+    for season in sorted({job["season"] for job in jobs}):
+        lines += [f"## {season}", ""]
+        lines += [f"![{job['output'].stem}]({job['output'].name})" for job in jobs if job["season"] == season]
+        lines.append("")
+    (output_dir / "index.md").write_text("\n".join(lines), encoding="utf-8")
+
+
+def build_report(
+    input_path: Path,
+    output_dir: Path = DEFAULT_OUTPUT_DIR,
+    seasons: Optional[List[str]] = None,
+    thresholds: List[float] = DEFAULT_MIN_MINUTES,
+    min_gp: int = DEFAULT_MIN_GP,
+    dpi: int = DEFAULT_DPI,
+    workers: Optional[int] = None,
+    force: bool = False,
+) -> Dict[str, int]:
+    """Re-render only the figures whose inputs or parameters changed."""
+    from nba_data.storage import load_leaderboard
+
+    started = time.perf_counter()
+    df = load_leaderboard(input_path)
+    df["SEASON"] = df["SEASON"].astype(str)
+    seasons = seasons or sorted(df["SEASON"].unique())
+    output_dir.mkdir(parents=True, exist_ok=True)
+    jobs = plan_figures(df, seasons, thresholds, min_gp, dpi, output_dir)
+    aggregated = time.perf_counter() - started
+
+    manifest = load_manifest(output_dir)
+    stale = [
+        job for job in jobs
+        if force or manifest.get(job["output"].name) != job["key"] or not job["output"].exists()
+    ]
+    workers = min(workers or os.cpu_count() or 1, len(stale))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(render_job, job["figure"], job["artifact"], job["output"]) for job in stale]
+            for future, job in zip(futures, stale):
+                future.result()
+                manifest[job["output"].name] = job["key"]
+    else:
+        for job in stale:
+            render_job(job["figure"], job["artifact"], job["output"])
+            manifest[job["output"].name] = job["key"]
+
+    (output_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    write_index(jobs, output_dir)
+    print(
+        f"{len(jobs)} figure(s): rendered {len(stale)}, unchanged {len(jobs) - len(stale)} "
+        f"(aggregation {aggregated:.2f}s, total {time.perf_counter() - started:.2f}s)"
+    )
+    return {"figures": len(jobs), "rendered": len(stale)}
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """CLI argument parsing."""
+    parser = argparse.ArgumentParser(
+        description="Render the selfishness report figures, skipping any whose inputs are unchanged."
+    )
+    parser.add_argument(
+        "--input",
+        type=Path,
+        default=DEFAULT_INPUT,
+        help="Leaderboard CSV or season-partitioned Parquet directory.",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=DEFAULT_OUTPUT_DIR,
+        help="Where figures, artifacts, the manifest and index.md are written.",
+    )
+    parser.add_argument(
+        "--seasons",
+        nargs="+",
+        help="Seasons to report on (default: every season in the input).",
+    )
+    parser.add_argument(
+        "--min-minutes",
+        nargs="+",
+        type=float,
+        default=DEFAULT_MIN_MINUTES,
+        help="MIN thresholds; one set of figures is drawn per threshold.",
+    )
+    parser.add_argument(
+        "--min-gp",
+        type=int,
+        default=DEFAULT_MIN_GP,
+        help="Minimum games played.",
+    )
+    parser.add_argument(
+        "--dpi",
+        type=int,
+        default=DEFAULT_DPI,
+        help="Output resolution.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Render processes (default: one per CPU).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Redraw every figure even if its key is unchanged.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    """Script entrypoint."""
+    args = parse_args(argv)
+    build_report(
+        args.input,
+        args.output_dir,
+        args.seasons,
+        args.min_minutes,
+        args.min_gp,
+        args.dpi,
+        args.workers,
+        args.force,
+    )
+    print(f"Report index: {args.output_dir / 'index.md'}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
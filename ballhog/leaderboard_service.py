@@ -0,0 +1,406 @@
+"""
+Indexed, cached query layer over the selfishness leaderboard.
+
+The leaderboard (CSV or season-partitioned Parquet) is loaded once, and then
+three kinds of lookup are prepared:
+
+* a ``(SEASON, PLAYER_ID)`` index to single rows;
+* a ``(SEASON, TEAM_ID)`` index to that team's rows, in team-rank order;
+* a presorted row order per metric, both for each season and across all
+  seasons.
+
+A top-k query walks the presorted order in chunks and applies its filters
+(minimum games or minutes, team) until it has k rows. No query ever sorts.
+The same queries are served as JSON over HTTP, behind an LRU response cache.
+The data file is re-read only when its modification time changes, so
+dashboards that poll all day never re-parse it per request:
+
+    uv run python3 ballhog/leaderboard_service.py --data ballhog/ballhog_metrics.csv
+    curl 'http://127.0.0.1:8766/top?season=2023-24&metric=SELFISHNESS_SCORE&k=20&min_gp=20'
+    curl 'http://127.0.0.1:8766/team?season=2023-24&team=NYK'
+    curl 'http://127.0.0.1:8766/player?season=2023-24&player_id=1628973'
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from nba_data.lazy import lazy_import  # noqa: E402
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+DEFAULT_DATA = Path(__file__).resolve().parent / "ballhog_metrics.csv"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_K = 20
+MAX_K = 1000
+SCAN_CHUNK = 256  # rows of a presorted order filtered per step
+
+# Metrics with a presorted order built at load time; other numeric columns
+# get one on first use
+METRICS = [
+    "SELFISHNESS_SCORE",
+    "SELF_CREATION_INDEX",
+    "KOBE_QUOTIENT",
+    "USG_PCT",
+    "AST_PCT",
+    "AST_TO_USG_RATIO",
+    "SHOT_CREATION_LOAD",
+]
+
+
+class QueryError(ValueError):
+    """A request the index cannot answer (unknown metric, season, player...)."""
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, (np.integer,)):
+        return int(value)
+    if isinstance(value, (np.floating, float)):
+        return None if math.isnan(value) else float(value)
+    return value
+
+
+def _widen_float32(df: pd.DataFrame) -> pd.DataFrame:
+    """``df`` with float32 columns as the float64 values of their shortest repr.
+
+    The stored metrics are float32, and widening them directly serves noise
+    such as 0.3149999976158142 for 0.315.
+    """
+    narrow = [column for column in df.columns if df[column].dtype == "float32"]
+    return df.assign(**{column: df[column].to_numpy().astype(str).astype("float64") for column in narrow})
+
+
+class LeaderboardIndex:
+    """In-memory leaderboard with player/team indexes and per-metric sort orders."""
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.df = df.reset_index(drop=True)
+        self.columns = list(self.df.columns)
+        self.records: List[Dict[str, Any]] = [
+            {column: _json_value(value) for column, value in row.items()}
+            for row in _widen_float32(self.df).to_dict("records")
+        ]
+
+        seasons = self.df["SEASON"].astype(str).to_numpy()
+        player_ids = self.df["PLAYER_ID"].astype(str).to_numpy()
+        team_ids = self.df["TEAM_ID"].astype(str).to_numpy()
+        self.seasons: List[str] = sorted(set(seasons))
+        self._season_rows = {season: np.flatnonzero(seasons == season) for season in self.seasons}
+
+        self.by_player: Dict[Tuple[str, str], int] = {
+            key: row for row, key in enumerate(zip(seasons, player_ids))
+        }
+        team_rank = self.df["TEAM_RANK"].to_numpy() if "TEAM_RANK" in self.df else np.zeros(len(self.df))
+        self.by_team: Dict[Tuple[str, str], np.ndarray] = {}
+        for (season, team_id), rows in self.df.groupby([seasons, team_ids]).indices.items():
+            self.by_team[(season, team_id)] = rows[np.argsort(team_rank[rows], kind="stable")]
+        self.team_aliases: Dict[str, str] = {
+            str(abbreviation).upper(): str(team_id)
+            for abbreviation, team_id in zip(self.df["TEAM_ABBREVIATION"], team_ids)
+        }
+
+        # Filterable columns as plain arrays, so a scan never touches pandas
+        self._gp = self.df["GP"].to_numpy(dtype="float64")
+        self._min = self.df["MIN"].to_numpy(dtype="float64")
+        self._team_ids = team_ids
+        self._known_teams = set(team_ids)
+
+        self._orders: Dict[Tuple[Optional[str], str], np.ndarray] = {}
+        self._valid: Dict[Tuple[Optional[str], str], int] = {}
+        self._orders_lock = threading.Lock()
+        for metric in METRICS:
+            if metric in self.df:
+                self._build_orders(metric)
+
+    @classmethod
+    def from_path(cls, path: Path) -> "LeaderboardIndex":
+        """Load a leaderboard CSV or Parquet directory with the declared schema."""
+        from nba_data.storage import load_leaderboard
+
+        return cls(load_leaderboard(path))
+
+    def _build_orders(self, metric: str) -> None:
+        """Descending row order for ``metric``, league-wide and per season (NaNs last)."""
+        values = self.df[metric].to_numpy(dtype="float64")
+        # Negate for a descending stable sort; NaN sorts last either way
+        overall = np.argsort(-values, kind="stable")
+        missing = np.isnan(values[overall])
+        self._valid[(None, metric)] = int(len(overall) - missing.sum())
+        seasons = self.df["SEASON"].astype(str).to_numpy()[overall]
+        for season in self.seasons:
+            in_season = seasons == season
+            self._valid[(season, metric)] = int(np.count_nonzero(in_season & ~missing))
+            self._orders[(season, metric)] = overall[in_season]
+        self._orders[(None, metric)] = overall
+
+    def order(self, metric: str, season: Optional[str] = None) -> np.ndarray:
+        """Presorted (descending) row indices for ``metric``, optionally one season."""
+        if metric not in self.df or not pd.api.types.is_numeric_dtype(self.df[metric]):
+            raise QueryError(f"Unknown metric {metric!r}")
+        if season is not None and season not in self._season_rows:
+            raise QueryError(f"Unknown season {season!r}")
+        key = (season, metric)
+        if key not in self._orders:
+            with self._orders_lock:
+                if key not in self._orders:
+                    self._build_orders(metric)
+        return self._orders[key]
+
+    def resolve_team(self, team: str) -> str:
+        """Accept a TEAM_ID or an abbreviation such as ``NYK``."""
+        team_id = self.team_aliases.get(str(team).upper(), str(team))
+        if team_id not in self._known_teams:
+            raise QueryError(f"Unknown team {team!r}")
+        return team_id
+
+    def top(
+        self,
+        metric: str = "SELFISHNESS_SCORE",
+        season: Optional[str] = None,
+        k: int = DEFAULT_K,
+        min_gp: float = 0,
+        min_minutes: float = 0,
+        team: Optional[str] = None,
+        ascending: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """The k highest (or lowest) rows for ``metric`` that pass the filters.
+
+        The presorted order is filtered one chunk at a time, so a query that
+        filters out few rows touches little more than k of them.
+        """
+        order = self.order(metric, season)
+        if ascending:
+            # Reverse the non-NaN prefix so missing values still come last
+            valid = self._valid[(season, metric)]
+            order = np.concatenate([order[:valid][::-1], order[valid:]])
+        team_id = self.resolve_team(team) if team is not None else None
+
+        picked: List[np.ndarray] = []
+        found = 0
+        for start in range(0, len(order), max(SCAN_CHUNK, k)):
+            rows = order[start:start + max(SCAN_CHUNK, k)]
+            keep = (self._gp[rows] >= min_gp) & (self._min[rows] >= min_minutes)
+            if team_id is not None:
+                keep &= self._team_ids[rows] == team_id
+            rows = rows[keep]
+            picked.append(rows[: k - found])
+            found += len(picked[-1])
+            if found >= k:
+                break
+        rows = np.concatenate(picked) if picked else np.array([], dtype=int)
+        return [dict(self.records[row], RANK=rank) for rank, row in enumerate(rows, start=1)]
+
+    def player(self, season: str, player_id: str) -> Dict[str, Any]:
+        row = self.by_player.get((str(season), str(player_id)))
+        if row is None:
+            raise QueryError(f"No row for player {player_id} in {season}")
+        return self.records[row]
+
+    def team(self, season: str, team: str) -> List[Dict[str, Any]]:
+        """A team's players in TEAM_RANK order."""
+        rows = self.by_team.get((str(season), self.resolve_team(team)))
+        if rows is None:
+            raise QueryError(f"No rows for team {team} in {season}")
+        return [self.records[row] for row in rows]
+
+
+class ResponseLRU:
+    """Thread-safe LRU of encoded responses keyed by normalized request."""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: Tuple, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class LeaderboardService:
+    """Routes query parameters to a ``LeaderboardIndex``, reloading it when the file changes."""
+
+    def __init__(self, path: Path, cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        self.path = Path(path)
+        self.cache = ResponseLRU(cache_size)
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self.index: Optional[LeaderboardIndex] = None
+        self.refresh()
+
+    def _current_mtime(self) -> Optional[float]:
+        try:
+            if self.path.is_dir():
+                return max((p.stat().st_mtime for p in self.path.rglob("*.parquet")), default=0.0)
+            return self.path.stat().st_mtime
+        except FileNotFoundError:
+            # write_partitioned is replacing partitions; keep the loaded index
+            # until it has finished and the new files change the mtime
+            return self._mtime
+
+    def refresh(self) -> LeaderboardIndex:
+        """Rebuild the index (and drop cached responses) if the data file changed."""
+        mtime = self._current_mtime()
+        if self.index is not None and mtime == self._mtime:
+            return self.index
+        with self._lock:
+            if self.index is None or mtime != self._mtime:
+                try:
+                    index = LeaderboardIndex.from_path(self.path)
+                except FileNotFoundError:
+                    # Partitions vanished mid-swap; retry on the next request
+                    if self.index is None:
+                        raise
+                    return self.index
+                self.index = index
+                self._mtime = mtime
+                self.cache.clear()
+        return self.index
+
+    def query(self, route: str, params: Dict[str, str], index: Optional[LeaderboardIndex] = None) -> Any:
+        """Answer one route from ``index`` or the current index (no caching)."""
+        index = index or self.index
+        if route == "top":
+            k = int(params.get("k", DEFAULT_K))
+            if not 1 <= k <= MAX_K:
+                raise QueryError(f"k must be between 1 and {MAX_K}")
+            return index.top(
+                metric=params.get("metric", "SELFISHNESS_SCORE"),
+                season=params.get("season"),
+                k=k,
+                min_gp=float(params.get("min_gp", 0)),
+                min_minutes=float(params.get("min_minutes", 0)),
+                team=params.get("team"),
+                ascending=params.get("ascending", "0").lower() in ("1", "true"),
+            )
+        if route == "player":
+            return index.player(params["season"], params["player_id"])
+        if route == "team":
+            return index.team(params["season"], params["team"])
+        if route == "seasons":
+            return index.seasons
+        if route == "metrics":
+            return [column for column in index.columns if pd.api.types.is_numeric_dtype(index.df[column])]
+        raise QueryError(f"Unknown route {route!r}")
+
+    def respond(self, route: str, params: Dict[str, str]) -> Tuple[int, bytes, bool]:
+        """Return ``(status, body, cache_hit)`` for one request."""
+        index = self.refresh()
+        key = (route, tuple(sorted(params.items())))
+        body = self.cache.get(key)
+        if body is not None:
+            return 200, body, True
+        try:
+            result = self.query(route, params, index)
+        except KeyError as exc:
+            return 400, json.dumps({"error": f"Missing parameter {exc.args[0]}"}).encode("utf-8"), False
+        except (QueryError, ValueError) as exc:
+            return 400, json.dumps({"error": str(exc)}).encode("utf-8"), False
+        body = json.dumps(result).encode("utf-8")
+        # A reload that finished while this query ran has already cleared the
+        # cache; only the index it installed may fill it again
+        with self._lock:
+            if self.index is index:
+                self.cache.put(key, body)
+        return 200, body, False
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "LeaderboardServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        route = url.path.strip("/")
+        if route == "stats":
+            status, body, hit = 200, json.dumps(self.server.service.cache.stats()).encode("utf-8"), False
+        else:
+            status, body, hit = self.server.service.respond(route, dict(parse_qsl(url.query)))
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Cache", "HIT" if hit else "MISS")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class LeaderboardServer(ThreadingHTTPServer):
+    """Local HTTP/JSON front end for a ``LeaderboardService``."""
+
+    daemon_threads = True
+
+    def __init__(self, service: LeaderboardService, host: str = DEFAULT_HOST,
+                 port: int = DEFAULT_PORT, quiet: bool = True) -> None:
+        super().__init__((host, port), _Handler)
+        self.service = service
+        self.quiet = quiet
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """CLI argument parsing."""
+    parser = argparse.ArgumentParser(description="Serve leaderboard queries over HTTP/JSON.")
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATA, help="Leaderboard CSV or Parquet directory.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE, help="Cached responses kept (LRU).")
+    parser.add_argument("--verbose", action="store_true", help="Log every request.")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    """Script entrypoint."""
+    args = parse_args(argv)
+    service = LeaderboardService(args.data, args.cache_size)
+    server = LeaderboardServer(service, args.host, args.port, quiet=not args.verbose)
+    print(f"Serving {len(service.index.records)} leaderboard rows from {args.data} "
+          f"on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
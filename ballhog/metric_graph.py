@@ -0,0 +1,259 @@
+"""
+Declarative registry of the per-season selfishness metrics.
+
+Each metric is a small NumPy function registered with ``@metric``. Its
+parameters name its inputs, which are other metrics or columns of the
+merged player/team frame. ``plan`` compiles a request for some metrics into
+the dependency-ordered list of nodes they actually need, and ``evaluate``
+runs that list over plain arrays:
+
+* a requested subset computes nothing else;
+* shared intermediates (possessions, usage) are computed once and reused;
+* no intermediate frames, ``.copy()``, ``replace`` or ``fillna`` temporaries;
+* aliases (``KOBE_QUOTIENT``) return the same array rather than a copy.
+
+Adding a selfishness variant is one decorated function. Builds that do not
+ask for it pay nothing::
+
+    @metric("USAGE_WEIGHTED_LOAD")
+    def usage_weighted_load(USG_PCT, SHOT_CREATION_LOAD):
+        return USG_PCT * SHOT_CREATION_LOAD
+
+    evaluate(merged, ["USAGE_WEIGHTED_LOAD", "LEAGUE_RANK"])
+
+The formulas reproduce ``compute_kobe_quotient``'s original pandas
+arithmetic operation for operation, so the values are bit-identical. That
+includes its zero handling: a zero team-possession denominator gives a usage
+of 0, and an infinite assist-to-usage ratio becomes 0.
+"""
+from __future__ import annotations
+
+import inspect
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Mapping, Tuple
+
+from nba_data.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+
+@dataclass(frozen=True)
+class Metric:
+    name: str
+    inputs: Tuple[str, ...]
+    func: Callable[..., "np.ndarray"]
+
+
+METRICS: Dict[str, Metric] = {}
+
+# What compute_kobe_quotient adds to the merged frame by default, in order
+DEFAULT_METRICS: List[str] = [
+    "PLAYER_POSSESSIONS",
+    "TEAM_POSSESSIONS",
+    "USG_PCT",
+    "SELF_CREATION_INDEX",
+    "AST_TO_USG_RATIO",
+    "SHOT_CREATION_LOAD",
+    "SELFISHNESS_SCORE",
+    "KOBE_QUOTIENT",
+    "TEAM_RANK",
+    "LEAGUE_RANK",
+]
+
+# SELFISHNESS_SCORE weights on its usage, low-assist and shot-heavy components
+SELFISHNESS_WEIGHTS: Tuple[float, float, float] = (0.4, 0.4, 0.2)
+
+
+def metric(name: str) -> Callable[[Callable[..., "np.ndarray"]], Callable[..., "np.ndarray"]]:
+    """Register ``func`` as ``name``; its parameter names are its inputs."""
+    def register(func: Callable[..., "np.ndarray"]) -> Callable[..., "np.ndarray"]:
+        METRICS[name] = Metric(name, tuple(inspect.signature(func).parameters), func)
+        return func
+    return register
+
+
+def plan(targets: Iterable[str]) -> List[Metric]:
+    """Dependency-ordered metrics needed for ``targets``, each listed once."""
+    ordered: List[Metric] = []
+    state: Dict[str, str] = {}
+
+    def visit(name: str) -> None:
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"Metric dependency cycle through {name}")
+        state[name] = "visiting"
+        for dependency in METRICS[name].inputs:
+            if dependency in METRICS:
+                visit(dependency)
+        state[name] = "done"
+        ordered.append(METRICS[name])
+
+    for name in targets:
+        if name not in METRICS:
+            raise KeyError(f"Unknown metric {name!r}; registered: {', '.join(sorted(METRICS))}")
+        visit(name)
+    return ordered
+
+
+def source_columns(targets: Iterable[str]) -> List[str]:
+    """Frame columns that the metrics needed for ``targets`` read."""
+    columns: List[str] = []
+    for node in plan(targets):
+        columns += [name for name in node.inputs if name not in METRICS and name not in columns]
+    return columns
+
+
+def evaluate(frame: "pd.DataFrame", targets: Iterable[str]) -> Dict[str, "np.ndarray"]:
+    """Compute ``targets`` (and only what they depend on) as NumPy arrays."""
+    targets = list(targets)
+    values: Dict[str, "np.ndarray"] = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for node in plan(targets):
+            args = []
+            for name in node.inputs:
+                if name not in values:
+                    values[name] = frame[name].to_numpy()
+                args.append(values[name])
+            values[node.name] = node.func(*args)
+    return {name: values[name] for name in targets}
+
+
+def _fill_nan(values: "np.ndarray", fill: float = 0.0) -> "np.ndarray":
+    values[np.isnan(values)] = fill
+    return values
+
+
+def _possessions(fga: "np.ndarray", fta: "np.ndarray", tov: "np.ndarray") -> "np.ndarray":
+    """FGA + 0.44 * FTA + TOV in one output buffer."""
+    out = np.multiply(fta, 0.44, dtype="float64")
+    np.add(fga, out, out=out)
+    np.add(out, tov, out=out)
+    return out
+
+
+def _group_codes(*keys: "np.ndarray") -> "np.ndarray":
+    """One integer per distinct combination of ``keys``."""
+    codes = np.zeros(len(keys[0]), dtype="int64")
+    for key in keys:
+        key_codes, uniques = pd.factorize(key)
+        codes = codes * max(len(uniques), 1) + key_codes
+    return codes
+
+
+def descending_rank(values: "np.ndarray", groups: "np.ndarray", method: str) -> "np.ndarray":
+    """Rank within each group, highest value first, with ``min`` or ``dense`` ties.
+
+    Matches ``groupby(...).rank(ascending=False, method=...)`` using one
+    lexsort instead of a per-group pandas pass.
+    """
+    n = len(values)
+    order = np.lexsort((-values, groups))
+    ordered_values, ordered_groups = values[order], groups[order]
+    new_group = np.ones(n, dtype=bool)
+    new_group[1:] = ordered_groups[1:] != ordered_groups[:-1]
+    new_value = new_group.copy()
+    new_value[1:] |= ordered_values[1:] != ordered_values[:-1]
+    position = np.arange(n)
+    group_start = np.maximum.accumulate(np.where(new_group, position, 0))
+    if method == "min":
+        ranked = np.maximum.accumulate(np.where(new_value, position, 0)) - group_start + 1
+    elif method == "dense":
+        distinct = np.cumsum(new_value)
+        ranked = distinct - distinct[group_start] + 1
+    else:
+        raise ValueError(f"Unsupported rank method {method!r}")
+    ranks = np.empty(n, dtype="int64")
+    ranks[order] = ranked
+    return ranks
+
+
+@metric("PLAYER_POSSESSIONS")
+def player_possessions(FGA, FTA, TOV):
+    return _possessions(FGA, FTA, TOV)
+
+
+@metric("TEAM_POSSESSIONS")
+def team_possessions(FGA_TEAM, FTA_TEAM, TOV_TEAM):
+    # A team with no possessions cannot be a usage denominator
+    possessions = _possessions(FGA_TEAM, FTA_TEAM, TOV_TEAM)
+    possessions[possessions == 0] = np.nan
+    return possessions
+
+
+@metric("USG_PCT")
+def usage_pct(PLAYER_POSSESSIONS, TEAM_POSSESSIONS):
+    """Standard Usage Rate (% of team possessions used)."""
+    return _fill_nan(PLAYER_POSSESSIONS / TEAM_POSSESSIONS)
+
+
+@metric("SELF_CREATION_INDEX")
+def self_creation_index(USG_PCT, AST_PCT):
+    """Usage adjusted down by assist percentage; high usage with low playmaking is selfish."""
+    out = np.divide(AST_PCT, 100.0, dtype="float64")
+    np.subtract(1, out, out=out)
+    return np.multiply(USG_PCT, out, out=out)
+
+
+@metric("AST_TO_USG_RATIO")
+def assist_to_usage_ratio(USG_PCT, AST_PCT):
+    """Playmaking relative to usage; a lower ratio is more selfish."""
+    out = np.divide(AST_PCT, 100.0, dtype="float64")
+    np.divide(out, USG_PCT, out=out)
+    out[~np.isfinite(out)] = 0.0
+    return out
+
+
+@metric("SHOT_CREATION_LOAD")
+def shot_creation_load(FGA, PLAYER_POSSESSIONS):
+    """Share of the player's possessions that end in a shot rather than a turnover."""
+    return _fill_nan(np.divide(FGA, PLAYER_POSSESSIONS, dtype="float64"))
+
+
+def selfishness_components(USG_PCT, AST_PCT, SHOT_CREATION_LOAD) -> "np.ndarray":
+    """The three 0-100 terms SELFISHNESS_SCORE weights, as an ``(n, 3)`` matrix."""
+    components = np.empty((len(USG_PCT), 3))
+    np.multiply(USG_PCT, 100, out=components[:, 0])
+    np.divide(AST_PCT, 100.0, out=components[:, 1])
+    np.subtract(1, components[:, 1], out=components[:, 1])
+    np.multiply(components[:, 1], 100, out=components[:, 1])
+    np.multiply(SHOT_CREATION_LOAD, 100, out=components[:, 2])
+    return components
+
+
+@metric("SELFISHNESS_SCORE")
+def selfishness_score(USG_PCT, AST_PCT, SHOT_CREATION_LOAD):
+    """Composite 0-100 score: 40% usage, 40% low assists, 20% shot-heavy play."""
+    usage_weight, assist_weight, shot_weight = SELFISHNESS_WEIGHTS
+    out = np.multiply(USG_PCT, 100)
+    np.multiply(out, usage_weight, out=out)
+    low_assists = np.divide(AST_PCT, 100.0, dtype="float64")
+    np.subtract(1, low_assists, out=low_assists)
+    np.multiply(low_assists, 100, out=low_assists)
+    np.multiply(low_assists, assist_weight, out=low_assists)
+    np.add(out, low_assists, out=out)
+    shot_heavy = np.multiply(SHOT_CREATION_LOAD, 100, out=low_assists)
+    np.multiply(shot_heavy, shot_weight, out=shot_heavy)
+    return np.add(out, shot_heavy, out=out)
+
+
+@metric("KOBE_QUOTIENT")
+def kobe_quotient(SELF_CREATION_INDEX):
+    """Kept for backwards compatibility; the Self-Creation Index under its original name."""
+    return SELF_CREATION_INDEX
+
+
+@metric("TEAM_RANK")
+def team_rank(SELFISHNESS_SCORE, SEASON, TEAM_ID):
+    return descending_rank(SELFISHNESS_SCORE, _group_codes(SEASON, TEAM_ID), "dense")
+
+
+@metric("LEAGUE_RANK")
+def league_rank(SELFISHNESS_SCORE, SEASON):
+    return descending_rank(SELFISHNESS_SCORE, _group_codes(SEASON), "min")
+
+
+def assign(frame: "pd.DataFrame", values: Mapping[str, "np.ndarray"]) -> "pd.DataFrame":
+    """Attach evaluated metrics to ``frame`` as new columns in one concat."""
+    return pd.concat([frame, pd.DataFrame(dict(values), index=frame.index)], axis=1)
@@ -0,0 +1,242 @@
+"""
+Rolling per-game selfishness metrics from player and team game logs.
+
+``compute_kobe_quotient`` scores a player-season from season totals. This
+module computes the same metric family (USG_PCT, AST_PCT, SELF_CREATION_INDEX,
+AST_TO_USG_RATIO, SHOT_CREATION_LOAD, SELFISHNESS_SCORE) over each player's
+trailing N games, so you can see how they move across a season.
+
+Every window metric is a ratio of summed counts. For example, usage is the
+player's possessions over the team's possessions in the same games. The
+window sums come from one cumulative sum per component: the window ending at
+game i is ``csum[i] - csum[i - N]``. That is O(rows) per window size, and no
+window is ever re-aggregated.
+
+Team denominators are joined per game on ``(GAME_ID, TEAM_ID)``, so a player
+traded mid-season is measured against whichever team they played for that
+night. The window rolls straight across the trade unless ``by_team`` is set,
+in which case each stint starts a fresh window.
+
+Run with:
+    uv run python3 ballhog/rolling_metrics.py --seasons 2023-24 --windows 5 10 20
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import metric_graph  # noqa: E402
+import nba_data  # noqa: E402
+from nba_data.lazy import lazy_import  # noqa: E402
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+DEFAULT_SEASONS: List[str] = ["2020-21", "2021-22", "2022-23", "2023-24", "2024-25"]
+DEFAULT_WINDOWS: List[int] = [5, 10, 20]
+
+PLAYER_LOG_COLUMNS = [
+    "SEASON_YEAR", "PLAYER_ID", "PLAYER_NAME", "TEAM_ID", "TEAM_ABBREVIATION",
+    "GAME_ID", "GAME_DATE", "MIN", "FGM", "FGA", "FTA", "TOV", "AST",
+]
+TEAM_LOG_COLUMNS = ["TEAM_ID", "GAME_ID", "FGM", "FGA", "FTA", "TOV"]
+
+# Per-game quantities that are summed over each window
+COMPONENTS = [
+    "FGA", "FTA", "TOV", "AST", "AST_CHANCES",
+    "FGA_TEAM", "FTA_TEAM", "TOV_TEAM",
+]
+
+METRIC_COLUMNS = [
+    "USG_PCT",
+    "AST_PCT",
+    "SELF_CREATION_INDEX",
+    "AST_TO_USG_RATIO",
+    "SHOT_CREATION_LOAD",
+    "SELFISHNESS_SCORE",
+]
+
+
+def prepare_game_rows(player_logs: pd.DataFrame, team_logs: pd.DataFrame) -> pd.DataFrame:
+    """Attach per-game team totals and sort each player's games chronologically.
+
+    ``AST_CHANCES`` is the denominator of Basketball-Reference's AST%: the
+    team's field goals made while the player was on the floor, less the
+    player's own. Team minutes are the summed player minutes for that
+    team-game, so overtime is handled correctly.
+    """
+    players = player_logs[PLAYER_LOG_COLUMNS].rename(columns={"SEASON_YEAR": "SEASON"})
+    teams = team_logs[TEAM_LOG_COLUMNS]
+    games = players.merge(teams, on=["GAME_ID", "TEAM_ID"], suffixes=("", "_TEAM"), how="left")
+
+    team_minutes = games.groupby(["GAME_ID", "TEAM_ID"], sort=False)["MIN"].transform("sum")
+    on_floor_share = (games["MIN"] / (team_minutes / 5.0)).fillna(0)
+    games["AST_CHANCES"] = (on_floor_share * games["FGM_TEAM"] - games["FGM"]).clip(lower=0)
+
+    games["GAME_DATE"] = pd.to_datetime(games["GAME_DATE"])
+    return games.sort_values(["SEASON", "PLAYER_ID", "GAME_DATE", "GAME_ID"], kind="stable", ignore_index=True)
+
+
+def _group_starts(games: pd.DataFrame, by_team: bool) -> np.ndarray:
+    """Row index at which each row's window group (player-season or stint) begins."""
+    keys = games[["SEASON", "PLAYER_ID"]]
+    new_group = (keys != keys.shift()).any(axis=1).to_numpy()
+    if by_team:
+        new_group |= (games["TEAM_ID"] != games["TEAM_ID"].shift()).to_numpy()
+    new_group[0] = True
+    starts = np.where(new_group, np.arange(len(games)), 0)
+    return np.maximum.accumulate(starts)
+
+
+def window_sums(values: np.ndarray, group_start: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Trailing ``window``-row sums of each column, never crossing a group start.
+
+    Returns ``(sums, games)`` where ``games`` counts the rows actually summed
+    (fewer than ``window`` near the start of a group).
+    """
+    csum = np.zeros((len(values) + 1, values.shape[1]))
+    np.cumsum(values, axis=0, out=csum[1:])
+    end = np.arange(1, len(values) + 1)
+    begin = np.maximum(end - window, group_start)
+    return csum[end] - csum[begin], end - begin
+
+
+def selfishness_metrics(sums: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """The compute_kobe_quotient formulas applied to summed window components.
+
+    Every metric except AST_PCT comes from the metric_graph function the
+    season leaderboard uses, so window and season values cannot drift
+    apart. AST_PCT is a 0-1 fraction, the scale LeagueDashPlayerStats
+    (Advanced) reports and the season leaderboard feeds those formulas.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        player_poss = metric_graph.player_possessions(sums["FGA"], sums["FTA"], sums["TOV"])
+        team_poss = metric_graph.team_possessions(sums["FGA_TEAM"], sums["FTA_TEAM"], sums["TOV_TEAM"])
+        usg_pct = metric_graph.usage_pct(player_poss, team_poss)
+        ast_pct = np.where(sums["AST_CHANCES"] > 0, sums["AST"] / sums["AST_CHANCES"], 0.0)
+        shot_load = metric_graph.shot_creation_load(sums["FGA"], player_poss)
+        ast_to_usg = metric_graph.assist_to_usage_ratio(usg_pct, ast_pct)
+    return {
+        "USG_PCT": usg_pct,
+        "AST_PCT": ast_pct,
+        "SELF_CREATION_INDEX": metric_graph.self_creation_index(usg_pct, ast_pct),
+        "AST_TO_USG_RATIO": ast_to_usg,
+        "SHOT_CREATION_LOAD": shot_load,
+        "SELFISHNESS_SCORE": metric_graph.selfishness_score(usg_pct, ast_pct, shot_load),
+    }
+
+
+def rolling_selfishness(
+    games: pd.DataFrame,
+    windows: Iterable[int] = DEFAULT_WINDOWS,
+    by_team: bool = False,
+    min_games: Optional[int] = None,
+) -> pd.DataFrame:
+    """Long time series of window metrics, one row per player-game per window.
+
+    ``games`` comes from ``prepare_game_rows``. Windows never span two seasons.
+    A window with fewer than ``min_games`` games (the default is the full
+    window, as in pandas' ``rolling``) is left out.
+    """
+    group_start = _group_starts(games, by_team)
+    values = games[COMPONENTS].to_numpy(dtype="float64")
+    identity = pd.DataFrame({
+        "SEASON": games["SEASON"].astype("category"),
+        "PLAYER_ID": games["PLAYER_ID"].astype("int32"),
+        "PLAYER_NAME": games["PLAYER_NAME"].astype("category"),
+        "TEAM_ID": games["TEAM_ID"].astype("category"),
+        "GAME_ID": games["GAME_ID"],
+        "GAME_DATE": games["GAME_DATE"],
+    })
+
+    frames = []
+    for window in windows:
+        sums, counts = window_sums(values, group_start, window)
+        keep = counts >= (min_games if min_games is not None else window)
+        metrics = selfishness_metrics({name: sums[keep, i] for i, name in enumerate(COMPONENTS)})
+        frame = identity[keep].reset_index(drop=True)
+        frame["WINDOW"] = np.int16(window)
+        frame["GAMES"] = counts[keep].astype("int16")
+        for name in METRIC_COLUMNS:
+            frame[name] = metrics[name].astype("float32")
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def build_rolling(
+    seasons: List[str],
+    season_type: str,
+    windows: List[int],
+    by_team: bool = False,
+) -> pd.DataFrame:
+    """Fetch game logs for each season and compute every window's time series."""
+    player_logs, team_logs = [], []
+    for season in seasons:
+        player_logs.append(nba_data.fetch_player_game_logs(season, season_type))
+        team_logs.append(nba_data.fetch_team_game_logs(season, season_type))
+    games = prepare_game_rows(pd.concat(player_logs, ignore_index=True), pd.concat(team_logs, ignore_index=True))
+
+    started = time.perf_counter()
+    rolling = rolling_selfishness(games, windows, by_team=by_team)
+    print(f"Computed {len(rolling)} window rows from {len(games)} player-games in {time.perf_counter() - started:.2f}s")
+    return rolling
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """CLI argument parsing."""
+    parser = argparse.ArgumentParser(
+        description="Compute rolling N-game selfishness metrics from game logs."
+    )
+    parser.add_argument(
+        "--seasons",
+        nargs="+",
+        default=DEFAULT_SEASONS,
+        help="List of NBA seasons (e.g., 2023-24).",
+    )
+    parser.add_argument(
+        "--season-type",
+        default="Regular Season",
+        choices=["Regular Season", "Playoffs"],
+        help="NBA season type to query.",
+    )
+    parser.add_argument(
+        "--windows",
+        nargs="+",
+        type=int,
+        default=DEFAULT_WINDOWS,
+        help="Trailing window sizes in games.",
+    )
+    parser.add_argument(
+        "--by-team",
+        action="store_true",
+        help="Restart windows when a player changes teams.",
+    )
+    parser.add_argument(
+        "--output",
+        default="ballhog/rolling_metrics.parquet",
+        help="Output path: a season-partitioned Parquet directory, or a .csv file.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    """Script entrypoint."""
+    args = parse_args(argv)
+    rolling = build_rolling(args.seasons, args.season_type, args.windows, args.by_team)
+    output_path = Path(args.output)
+    if output_path.suffix == ".csv":
+        rolling.to_csv(output_path, index=False)
+    else:
+        from nba_data.storage import write_partitioned
+
+        write_partitioned(rolling, output_path, "rolling_selfishness")
+    print(f"Saved rolling metrics to {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,265 @@
+"""
+Sensitivity of the selfishness rankings to SELFISHNESS_SCORE's weights.
+
+SELFISHNESS_SCORE weights three 0-100 components 0.4 / 0.4 / 0.2: usage, low
+assist rate and shot-heavy play. This script scores every player-season
+under thousands of alternative weightings at once and reports how stable
+each player's ranking is.
+
+For each weight chunk the steps are:
+
+* **Score:** the ``(chunk, 3)`` weight matrix times each season's
+  ``(3, players)`` component matrix gives every score in one matrix product.
+* **Rank:** one batched ``argsort`` over the player axis ranks the season
+  under every weighting at once. Exact ties share the lowest rank, as in
+  the leaderboard. Within each team-season only the top player is needed,
+  so ``argmax`` is enough.
+* **Accumulate:** running per-player counts and sums are updated, so memory
+  is bounded by one season times one chunk, not by the number of weightings.
+
+The per-player output holds:
+
+* the share of weightings that put the player in the league top-k
+* the share that make them their team's most selfish player
+* mean, spread, best and worst league rank
+* the baseline (0.4 / 0.4 / 0.2) rank
+
+The per-weighting output holds each vector's Spearman correlation with the
+baseline ranking and its top-k overlap with the baseline top-k.
+
+Run with:
+    uv run python3 ballhog/weight_sweep.py --weights 10000 --top-k 10
+    uv run python3 ballhog/weight_sweep.py --grid-step 0.05 --min-gp 20 --output ballhog/weight_sweep.csv
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from metric_graph import SELFISHNESS_WEIGHTS, selfishness_components  # noqa: E402
+from nba_data.lazy import lazy_import  # noqa: E402
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+DEFAULT_INPUT = Path(__file__).resolve().parent / "ballhog_metrics.csv"
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "weight_sweep.csv"
+DEFAULT_WEIGHTS = 10_000
+DEFAULT_MAX_MEMORY_MB = 256
+COMPONENT_NAMES = ["USAGE", "LOW_ASSIST", "SHOT_LOAD"]
+
+
+def sample_weights(count: int, seed: int = 0) -> np.ndarray:
+    """``count`` weight vectors: the baseline first, then uniform draws from the simplex."""
+    rng = np.random.default_rng(seed)
+    weights = rng.dirichlet(np.ones(len(COMPONENT_NAMES)), size=max(count - 1, 0))
+    return np.vstack([np.asarray(SELFISHNESS_WEIGHTS), weights])
+
+
+def grid_weights(step: float) -> np.ndarray:
+    """Every weight vector on a simplex grid with spacing ``step``, baseline first."""
+    steps = int(round(1 / step))
+    grid = [
+        (usage / steps, assist / steps, (steps - usage - assist) / steps)
+        for usage in range(steps + 1)
+        for assist in range(steps + 1 - usage)
+    ]
+    return np.vstack([np.asarray(SELFISHNESS_WEIGHTS), np.asarray(grid)])
+
+
+def descending_ranks(scores: np.ndarray, method: str = "min") -> np.ndarray:
+    """1-based rank of every column within each row, highest score first.
+
+    Rows are weightings and columns are players, so each row's sort runs
+    over contiguous memory. Exact ties share a rank, ``min`` or ``dense`` as
+    in ``metric_graph.descending_rank``, so the baseline row reproduces the
+    leaderboard's LEAGUE_RANK and TEAM_RANK. Tied columns get the same
+    rank whatever order the sort leaves them in, so the sort need not be
+    stable.
+    """
+    order = np.argsort(-scores, axis=1)
+    ordered = np.take_along_axis(scores, order, axis=1)
+    new_value = np.ones(scores.shape, dtype=bool)
+    np.not_equal(ordered[:, 1:], ordered[:, :-1], out=new_value[:, 1:])
+    if method == "min":
+        positions = np.arange(1, scores.shape[1] + 1, dtype=np.int32)
+        tied = np.maximum.accumulate(np.where(new_value, positions, 0), axis=1).astype(np.int32)
+    elif method == "dense":
+        tied = np.cumsum(new_value, axis=1, dtype=np.int32)
+    else:
+        raise ValueError(f"Unsupported rank method {method!r}")
+    ranks = np.empty(scores.shape, dtype=np.int32)
+    np.put_along_axis(ranks, order, tied, axis=1)
+    return ranks
+
+
+def _slices(codes: np.ndarray) -> List[slice]:
+    """Contiguous runs of equal codes in an already sorted array."""
+    bounds = np.flatnonzero(np.diff(codes)) + 1
+    edges = np.concatenate([[0], bounds, [len(codes)]])
+    return [slice(start, stop) for start, stop in zip(edges[:-1], edges[1:])]
+
+
+def weight_chunks(weights: np.ndarray, rows: int, chunk_size: Optional[int], max_memory_mb: float) -> Iterator[slice]:
+    """Column slices of ``weights`` sized so one season's work fits the memory budget.
+
+    Scores, the argsort order, the sorted scores, the ranks and the rank
+    differences cost about 40 bytes per player-weighting cell.
+    """
+    if chunk_size is None:
+        chunk_size = int(max_memory_mb * 2**20 // (40 * max(rows, 1)))
+    chunk_size = max(1, min(chunk_size, len(weights)))
+    for start in range(0, len(weights), chunk_size):
+        yield slice(start, min(start + chunk_size, len(weights)))
+
+
+def sweep(
+    leaderboard: pd.DataFrame,
+    weights: np.ndarray,
+    top_k: int = 10,
+    chunk_size: Optional[int] = None,
+    max_memory_mb: float = DEFAULT_MAX_MEMORY_MB,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Rank every player-season under every weighting; return per-player and per-weight stats.
+
+    ``weights`` is ``(n_weights, 3)``, and row 0 is treated as the baseline
+    the other rows are compared against.
+    """
+    players = leaderboard.sort_values(["SEASON", "TEAM_ID"], kind="stable", ignore_index=True)
+    components = selfishness_components(
+        players["USG_PCT"].to_numpy(dtype="float64"),
+        players["AST_PCT"].to_numpy(dtype="float64"),
+        players["SHOT_CREATION_LOAD"].to_numpy(dtype="float64"),
+    )
+    season_codes = pd.factorize(players["SEASON"])[0]
+    team_codes = players.groupby(["SEASON", "TEAM_ID"], sort=False, observed=True).ngroup().to_numpy()
+    seasons, teams = _slices(season_codes), _slices(team_codes)
+
+    rows, n_weights = len(players), len(weights)
+    top_count = np.zeros(rows, dtype=np.int64)
+    team_top_count = np.zeros(rows, dtype=np.int64)
+    rank_sum = np.zeros(rows)
+    rank_sq_sum = np.zeros(rows)
+    best = np.full(rows, np.iinfo(np.int32).max, dtype=np.int64)
+    worst = np.zeros(rows, dtype=np.int64)
+    baseline_rank = np.zeros(rows, dtype=np.int64)
+    baseline_team_rank = np.zeros(rows, dtype=np.int64)
+    d_squared = np.zeros(n_weights)
+    spearman_norm = 0.0
+    overlap = np.zeros(n_weights)
+    overlap_norm = 0
+
+    # Baseline ranks first, so every chunk can be compared against them
+    baseline = weights[:1]
+    for group in seasons:
+        baseline_rank[group] = descending_ranks(baseline @ components[group].T)[0]
+        n = group.stop - group.start
+        spearman_norm += n * (n * n - 1) / 6.0
+        overlap_norm += min(top_k, n)
+    for group in teams:
+        baseline_team_rank[group] = descending_ranks(baseline @ components[group].T, "dense")[0]
+
+    largest = max(group.stop - group.start for group in seasons)
+    for chunk in weight_chunks(weights, largest, chunk_size, max_memory_mb):
+        for group in seasons:
+            ranks = descending_ranks(weights[chunk] @ components[group].T)
+            in_top = ranks <= top_k
+            top_count[group] += in_top.sum(axis=0)
+            rank_sum[group] += ranks.sum(axis=0)
+            rank_sq_sum[group] += np.square(ranks, dtype=np.float64).sum(axis=0)
+            np.minimum(best[group], ranks.min(axis=0), out=best[group])
+            np.maximum(worst[group], ranks.max(axis=0), out=worst[group])
+            diff = ranks - baseline_rank[group]
+            d_squared[chunk] += np.square(diff, dtype=np.float64).sum(axis=1)
+            overlap[chunk] += in_top[:, baseline_rank[group] <= top_k].sum(axis=1)
+        for group in teams:
+            # Only the team's most selfish player matters, so argmax replaces a sort
+            leaders = np.argmax(weights[chunk] @ components[group].T, axis=1)
+            team_top_count[group] += np.bincount(leaders, minlength=group.stop - group.start)
+
+    mean_rank = rank_sum / n_weights
+    per_player = players[["SEASON", "PLAYER_ID", "PLAYER_NAME", "TEAM_ABBREVIATION", "GP", "MIN"]].copy()
+    per_player["BASELINE_LEAGUE_RANK"] = baseline_rank
+    per_player["BASELINE_TEAM_RANK"] = baseline_team_rank
+    per_player[f"TOP{top_k}_SHARE"] = top_count / n_weights
+    per_player["TEAM_TOP_SHARE"] = team_top_count / n_weights
+    per_player["MEAN_LEAGUE_RANK"] = mean_rank
+    per_player["STD_LEAGUE_RANK"] = np.sqrt(np.maximum(rank_sq_sum / n_weights - mean_rank ** 2, 0))
+    per_player["BEST_LEAGUE_RANK"] = best
+    per_player["WORST_LEAGUE_RANK"] = worst
+    per_player = per_player.sort_values(
+        ["SEASON", f"TOP{top_k}_SHARE", "MEAN_LEAGUE_RANK"], ascending=[True, False, True], ignore_index=True
+    )
+
+    per_weight = pd.DataFrame(weights, columns=[f"W_{name}" for name in COMPONENT_NAMES])
+    # Spearman's rho pooled over seasons: 1 - sum(d^2) / sum(n(n^2 - 1) / 6)
+    per_weight["SPEARMAN_VS_BASELINE"] = 1 - d_squared / spearman_norm
+    per_weight[f"TOP{top_k}_OVERLAP"] = overlap / overlap_norm
+    return per_player, per_weight
+
+
+def print_summary(per_player: pd.DataFrame, per_weight: pd.DataFrame, top_k: int, elapsed: float) -> None:
+    share = f"TOP{top_k}_SHARE"
+    print(f"\nSwept {len(per_weight):,} weightings over {len(per_player):,} player-seasons in {elapsed:.2f}s")
+    rho = per_weight["SPEARMAN_VS_BASELINE"]
+    print(
+        f"Spearman vs baseline: median {rho.median():.3f}, 5th percentile {rho.quantile(0.05):.3f}; "
+        f"median top-{top_k} overlap {per_weight[f'TOP{top_k}_OVERLAP'].median():.1%}"
+    )
+    for season, group in per_player.groupby("SEASON", sort=True):
+        print(f"\n{season}: most robust top-{top_k} members")
+        for row in group.head(5).itertuples():
+            print(
+                f"  {row.PLAYER_NAME:<24} {getattr(row, share):>6.1%} of weightings "
+                f"(baseline #{row.BASELINE_LEAGUE_RANK}, ranks {row.BEST_LEAGUE_RANK}-{row.WORST_LEAGUE_RANK})"
+            )
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """CLI argument parsing."""
+    parser = argparse.ArgumentParser(description="Sweep SELFISHNESS_SCORE weightings and measure rank stability.")
+    parser.add_argument("--input", type=Path, default=DEFAULT_INPUT, help="Leaderboard CSV or Parquet directory.")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Per-player stability CSV.")
+    parser.add_argument("--weights-output", type=Path, help="Also write per-weighting stats here.")
+    parser.add_argument("--seasons", nargs="+", help="Only these seasons (default: all).")
+    parser.add_argument("--weights", type=int, default=DEFAULT_WEIGHTS, help="Random weightings, baseline included.")
+    parser.add_argument("--grid-step", type=float, help="Use a simplex grid with this spacing instead of random draws.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the random weightings.")
+    parser.add_argument("--top-k", type=int, default=10, help="League top-k used for the stability share.")
+    parser.add_argument("--min-gp", type=int, default=0, help="Only rank players with at least this many games.")
+    parser.add_argument("--chunk-size", type=int, help="Weightings per chunk (default: sized from --max-memory-mb).")
+    parser.add_argument("--max-memory-mb", type=float, default=DEFAULT_MAX_MEMORY_MB, help="Working-set budget per chunk.")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    """Script entrypoint."""
+    args = parse_args(argv)
+    from nba_data.storage import load_leaderboard
+
+    leaderboard = load_leaderboard(args.input, args.seasons)
+    if args.min_gp:
+        leaderboard = leaderboard[leaderboard["GP"] >= args.min_gp]
+    if leaderboard.empty:
+        print("No player-seasons to rank.")
+        return 1
+    weights = grid_weights(args.grid_step) if args.grid_step else sample_weights(args.weights, args.seed)
+
+    started = time.perf_counter()
+    per_player, per_weight = sweep(leaderboard, weights, args.top_k, args.chunk_size, args.max_memory_mb)
+    print_summary(per_player, per_weight, args.top_k, time.perf_counter() - started)
+
+    per_player.to_csv(args.output, index=False)
+    print(f"\nSaved per-player stability to {args.output}")
+    if args.weights_output:
+        per_weight.to_csv(args.weights_output, index=False)
+        print(f"Saved per-weighting stats to {args.weights_output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,456 @@
+"""
+Synthetic, seeded NBA stats fixtures at season scale.
+
+Every generator is deterministic for a given seed and mirrors the shape of
+the real endpoint it stands in for (column names, dtypes, row counts), so
+the pipeline code under benchmark runs unmodified:
+
+* ``league_dash_player_stats`` / ``league_dash_team_stats`` – the frames
+  ``build_leaderboard.py`` gets from LeagueDashPlayerStats (Base and
+  Advanced) and LeagueDashTeamStats, ~540 players and 30 teams per season.
+* ``player_game_logs`` / ``team_game_logs`` – PlayerGameLogs and
+  TeamGameLogs for a full 82-game schedule, including mid-season trades.
+* ``flagrant_games`` – wide one-row-per-game data like
+  ``nba_flagrant_fouls.csv``, up to ~30k games over 25 seasons.
+* ``play_by_play_payload`` / ``box_score_payload`` – raw PlayByPlayV3 and
+  BoxScoreTraditionalV3 JSON, consistent with the game's row in
+  ``flagrant_games``; ``seed_response_cache`` stores them under the keys
+  ``nba_data.fetch`` looks up, so ``extract_game_data`` runs offline.
+* ``box_score_game_logs`` – PlayerGameLogs rows for the players who played
+  in those box scores; ``seed_game_logs`` caches them per season, so the
+  game-log covariate path runs offline too.
+* ``pbp_events`` – the stored event table ``pbp_store.game_features``
+  consumes, generated column-wise for tens of millions of rows.
+"""
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+TEAMS_PER_SEASON = 30
+PLAYERS_PER_SEASON = 540
+GAMES_PER_SEASON = 1230
+ACTIONS_PER_GAME = 460
+ROSTER_SIZE = 15
+TRADE_RATE = 0.1  # share of roster spots that change hands mid-season
+FLAGRANT_RATE = 0.05  # per team-game, close to the 2023-24 sample
+
+TEAM_IDS = np.arange(1610612737, 1610612737 + TEAMS_PER_SEASON)
+TEAM_TRICODES = [
+    "ATL", "BOS", "CLE", "NOP", "CHI", "DAL", "DEN", "GSW", "HOU", "LAC",
+    "LAL", "MIA", "MIL", "MIN", "BKN", "NYK", "ORL", "IND", "PHI", "PHX",
+    "POR", "SAC", "SAS", "OKC", "TOR", "UTA", "MEM", "WAS", "DET", "CHA",
+]
+
+
+def seasons(count: int, last_start_year: int = 2024) -> List[str]:
+    """``count`` consecutive season strings ending with ``last_start_year``."""
+    starts = range(last_start_year - count + 1, last_start_year + 1)
+    return [f"{start}-{(start + 1) % 100:02d}" for start in starts]
+
+
+def _rng(seed: int, *salt: object) -> np.random.Generator:
+    # crc32 rather than hash(): str hashes are salted per process
+    return np.random.default_rng([seed] + [zlib.crc32(str(s).encode("utf-8")) for s in salt])
+
+
+def league_dash_player_stats(season: str, measure_type: str = "Base", seed: int = 0) -> pd.DataFrame:
+    """One season of LeagueDashPlayerStats totals (Base or Advanced columns)."""
+    rng = _rng(seed, "players", season)
+    n = PLAYERS_PER_SEASON
+    player_ids = 1_600_000 + np.arange(n) * 7 + int(season[:4])
+    team_idx = rng.integers(0, TEAMS_PER_SEASON, n)
+    gp = rng.integers(1, 83, n)
+    minutes = np.round(gp * rng.uniform(4, 38, n), 1)
+    usage = rng.beta(2, 8, n)
+    fga = np.round(minutes * usage * 0.9).astype(int)
+    fgm = np.round(fga * rng.uniform(0.38, 0.6, n)).astype(int)
+    fta = np.round(fga * rng.uniform(0.1, 0.45, n)).astype(int)
+    ftm = np.round(fta * rng.uniform(0.55, 0.92, n)).astype(int)
+    tov = np.round(minutes * usage * rng.uniform(0.08, 0.18, n)).astype(int)
+    ast = np.round(minutes * rng.uniform(0.02, 0.3, n)).astype(int)
+    identity = pd.DataFrame({
+        "PLAYER_ID": player_ids,
+        "PLAYER_NAME": [f"Player {pid}" for pid in player_ids],
+        "TEAM_ID": TEAM_IDS[team_idx],
+        "TEAM_ABBREVIATION": np.array(TEAM_TRICODES)[team_idx],
+        "AGE": rng.integers(19, 40, n).astype(float),
+        "GP": gp,
+    })
+    if measure_type == "Advanced":
+        # A 0-1 fraction, as the real endpoint reports it
+        ast_pct = np.round(rng.beta(2, 6, n), 3)
+        return identity.assign(
+            MIN=minutes,
+            OFF_RATING=np.round(rng.normal(112, 8, n), 1),
+            DEF_RATING=np.round(rng.normal(112, 6, n), 1),
+            AST_PCT=ast_pct,
+            AST_TO=np.round(ast / np.maximum(tov, 1), 2),
+            REB_PCT=np.round(rng.uniform(0.02, 0.25, n), 3),
+            TS_PCT=np.round(rng.uniform(0.45, 0.68, n), 3),
+            USG_PCT=np.round(usage, 3),
+            PACE=np.round(rng.normal(99, 2.5, n), 2),
+            PIE=np.round(rng.normal(0.09, 0.04, n), 3),
+        )
+    pts = 2 * fgm + ftm
+    return identity.assign(
+        W=np.round(gp * rng.uniform(0.2, 0.8, n)).astype(int),
+        MIN=minutes,
+        FGM=fgm,
+        FGA=fga,
+        FG_PCT=np.round(fgm / np.maximum(fga, 1), 3),
+        FTM=ftm,
+        FTA=fta,
+        FT_PCT=np.round(ftm / np.maximum(fta, 1), 3),
+        OREB=rng.poisson(minutes * 0.03),
+        DREB=rng.poisson(minutes * 0.12),
+        AST=ast,
+        TOV=tov,
+        STL=rng.poisson(minutes * 0.03),
+        BLK=rng.poisson(minutes * 0.02),
+        PF=rng.poisson(minutes * 0.08),
+        PTS=pts,
+        PLUS_MINUS=rng.integers(-300, 300, n),
+    )
+
+
+def league_dash_team_stats(season: str, players: pd.DataFrame) -> pd.DataFrame:
+    """LeagueDashTeamStats totals consistent with a Base player frame."""
+    totals = players.groupby("TEAM_ID")[["FGM", "FGA", "FTM", "FTA", "TOV", "AST", "PTS"]].sum()
+    totals = totals.reindex(TEAM_IDS, fill_value=0).reset_index()
+    totals.insert(1, "TEAM_NAME", [f"{code} Team" for code in TEAM_TRICODES])
+    totals.insert(2, "GP", 82)
+    totals["SEASON"] = season
+    return totals
+
+
+def player_game_logs(season: str, seed: int = 0, trade_rate: float = TRADE_RATE) -> pd.DataFrame:
+    """One season of PlayerGameLogs rows (~30k player-games, 82 games per team).
+
+    Each team has ``ROSTER_SIZE`` roster spots. A ``trade_rate`` share of them
+    are swapped between two teams on a random mid-season day, so those
+    players log games for two teams.
+    """
+    rng = _rng(seed, "gamelogs", season)
+    start = int(season[:4])
+    game = np.arange(GAMES_PER_SEASON)
+    home = game % TEAMS_PER_SEASON
+    # Each 30-game round pairs every team once at home with a fixed offset
+    away = (home + 1 + (game // TEAMS_PER_SEASON) % (TEAMS_PER_SEASON - 1)) % TEAMS_PER_SEASON
+    day = game // 8
+    game_ids = np.array([f"002{start % 100:02d}{k + 1:05d}" for k in game])
+
+    # Team-game rows crossed with roster spots, then sparsified by playing time
+    team_game = np.concatenate([home, away])
+    game_of = np.concatenate([game, game])
+    slot = np.tile(np.arange(ROSTER_SIZE), len(team_game))
+    team = np.repeat(team_game, ROSTER_SIZE)
+    game_of = np.repeat(game_of, ROSTER_SIZE)
+    plays = rng.random(len(slot)) < np.linspace(0.97, 0.35, ROSTER_SIZE)[slot]
+    slot, team, game_of = slot[plays], team[plays], game_of[plays]
+
+    spot = team * ROSTER_SIZE + slot
+    owner = 1_600_000 + np.arange(TEAMS_PER_SEASON * ROSTER_SIZE) * 7 + start
+    player_id = owner[spot]
+    spots = rng.permutation(TEAMS_PER_SEASON * ROSTER_SIZE)
+    n_trades = int(len(spots) * trade_rate) // 2
+    for a, b, trade_day in zip(spots[:n_trades], spots[n_trades:2 * n_trades], rng.integers(30, 120, n_trades)):
+        after = day[game_of] >= trade_day
+        player_id[(spot == a) & after] = owner[b]
+        player_id[(spot == b) & after] = owner[a]
+
+    n = len(player_id)
+    usage = _rng(seed, "usage", season).lognormal(0, 0.35, len(owner))[(player_id - 1_600_000 - start) // 7]
+    minutes = np.clip(rng.normal(np.linspace(34, 8, ROSTER_SIZE)[slot], 5), 1, 48).round(1)
+    fga = rng.poisson(minutes * 0.38 * usage)
+    fta = rng.poisson(minutes * 0.1 * usage)
+    ftm = rng.binomial(fta, 0.78)
+    fgm = rng.binomial(fga, 0.47)
+    dates = pd.Timestamp(f"{start}-10-22") + pd.to_timedelta(day[game_of], unit="D")
+    return pd.DataFrame({
+        "SEASON_YEAR": season,
+        "PLAYER_ID": player_id,
+        "PLAYER_NAME": [f"Player {pid}" for pid in player_id],
+        "TEAM_ID": TEAM_IDS[team],
+        "TEAM_ABBREVIATION": np.array(TEAM_TRICODES)[team],
+        "GAME_ID": game_ids[game_of],
+        "GAME_DATE": dates.strftime("%Y-%m-%dT00:00:00"),
+        "MIN": minutes,
+        "FGM": fgm,
+        "FGA": fga,
+        "FTM": ftm,
+        "FTA": fta,
+        "AST": rng.poisson(minutes * rng.uniform(0.02, 0.25, n)),
+        "TOV": rng.poisson(minutes * 0.05 * usage),
+        "PTS": 2 * fgm + ftm,
+    })
+
+
+def team_game_logs(player_logs: pd.DataFrame, seed: int = 0) -> pd.DataFrame:
+    """TeamGameLogs rows consistent with ``player_game_logs`` (plus team turnovers)."""
+    keys = ["SEASON_YEAR", "TEAM_ID", "TEAM_ABBREVIATION", "GAME_ID", "GAME_DATE"]
+    teams = player_logs.groupby(keys, as_index=False, sort=False)[["FGM", "FGA", "FTM", "FTA", "TOV", "AST", "PTS"]].sum()
+    teams["TOV"] += _rng(seed, "team-tov", len(teams)).poisson(1, len(teams))
+    teams.insert(5, "MIN", 48.0)
+    return teams
+
+
+def flagrant_games(n_games: int, seed: int = 0) -> pd.DataFrame:
+    """Wide per-game rows matching nba_flagrant_fouls.csv, spread over seasons."""
+    rng = _rng(seed, "games", n_games)
+    season_count = max(1, -(-n_games // GAMES_PER_SEASON))
+    starts = np.array([int(s[:4]) for s in seasons(season_count)])
+    season_idx = np.arange(n_games) // GAMES_PER_SEASON
+    game_number = np.arange(n_games) % GAMES_PER_SEASON + 1
+    game_ids = [f"002{start % 100:02d}{num:05d}" for start, num in zip(starts[season_idx], game_number)]
+
+    home = rng.integers(0, TEAMS_PER_SEASON, n_games)
+    away = (home + rng.integers(1, TEAMS_PER_SEASON, n_games)) % TEAMS_PER_SEASON
+    df = pd.DataFrame({"game_id": game_ids, "home_team": TEAM_IDS[home], "away_team": TEAM_IDS[away]})
+    for side in ("home", "away"):
+        df[f"{side}_flagrants"] = rng.poisson(FLAGRANT_RATE, n_games)
+    for side, edge in (("home", 2.5), ("away", 0.0)):
+        df[f"{side}_score"] = np.round(rng.normal(112 + edge, 12, n_games)).astype(int)
+    for stat, mean in (("rebounds", 44), ("assists", 26), ("turnovers", 13), ("ftm", 17)):
+        for side in ("home", "away"):
+            df[f"{side}_{stat}"] = rng.poisson(mean, n_games)
+    for side in ("home", "away"):
+        df[f"{side}_fta"] = df[f"{side}_ftm"] + rng.poisson(5, n_games)
+        df[f"{side}_inactive_players"] = rng.integers(0, 6, n_games)
+    columns = ["game_id", "home_team", "away_team", "home_flagrants", "away_flagrants",
+               "home_score", "away_score", "home_rebounds", "away_rebounds",
+               "home_assists", "away_assists", "home_turnovers", "away_turnovers",
+               "home_ftm", "away_ftm", "home_fta", "away_fta",
+               "home_inactive_players", "away_inactive_players"]
+    return df[columns]
+
+
+def _clock(rng: np.random.Generator, count: int) -> List[str]:
+    seconds = rng.uniform(0, 720, count)
+    return [f"PT{int(s // 60):02d}M{s % 60:05.2f}S" for s in seconds]
+
+
+def play_by_play_payload(game: pd.Series, seed: int = 0) -> Dict:
+    """Raw PlayByPlayV3 JSON for one ``flagrant_games`` row."""
+    rng = _rng(seed, "pbp", game["game_id"])
+    n = ACTIONS_PER_GAME
+    sides = rng.integers(0, 2, n)
+    flagrants = [("h", int(game["home_flagrants"])), ("v", int(game["away_flagrants"]))]
+    team_ids = {"h": int(game["home_team"]), "v": int(game["away_team"])}
+    tricodes = {side: TEAM_TRICODES[int(team_ids[side] - TEAM_IDS[0])] for side in team_ids}
+    clocks = _clock(rng, n)
+    actions = []
+    for i in range(n):
+        side = "h" if sides[i] else "v"
+        made = rng.random() < 0.46
+        actions.append({
+            "actionNumber": i + 2,
+            "clock": clocks[i],
+            "period": 1 + i * 4 // n,
+            "teamId": team_ids[side],
+            "teamTricode": tricodes[side],
+            "personId": 1_600_000 + int(rng.integers(0, 4000)),
+            "playerName": "Player",
+            "playerNameI": "P. Player",
+            "xLegacy": int(rng.integers(-250, 250)),
+            "yLegacy": int(rng.integers(-50, 400)),
+            "shotDistance": int(rng.integers(0, 30)),
+            "shotResult": "Made" if made else "Missed",
+            "isFieldGoal": 1,
+            "scoreHome": "",
+            "scoreAway": "",
+            "pointsTotal": 0,
+            "location": side,
+            "description": "Jump Shot",
+            "actionType": "Made Shot" if made else "Missed Shot",
+            "subType": "Jump Shot",
+            "videoAvailable": 1,
+            "shotValue": 2,
+            "actionId": i + 2,
+        })
+    for side, count in flagrants:
+        for k in range(count):
+            position = int(rng.integers(0, len(actions)))
+            actions.insert(position, dict(actions[position], location=side, teamId=team_ids[side],
+                                          teamTricode=tricodes[side], actionType="Foul",
+                                          subType="Flagrant Type 1", isFieldGoal=0,
+                                          description="Flagrant Foul Type 1"))
+    final = {key: None for key in actions[0]}
+    final.update({
+        "actionNumber": len(actions) + 2, "clock": "PT00M00.00S", "period": 4, "teamId": 0,
+        "teamTricode": "", "personId": 0, "playerName": "", "playerNameI": "", "shotResult": "",
+        "isFieldGoal": 0, "scoreHome": str(int(game["home_score"])), "scoreAway": str(int(game["away_score"])),
+        "pointsTotal": int(game["home_score"] + game["away_score"]), "location": "",
+        "description": "Game End", "actionType": "game", "subType": "end", "videoAvailable": 0,
+        "shotValue": 0, "actionId": len(actions) + 2,
+    })
+    actions.append(final)
+    return {"meta": {"version": 1}, "game": {"gameId": game["game_id"], "videoAvailable": 1, "actions": actions}}
+
+
+def _split(total: int, parts: int, rng: np.random.Generator) -> np.ndarray:
+    return rng.multinomial(int(total), np.full(parts, 1.0 / parts))
+
+
+def box_score_payload(game: pd.Series, seed: int = 0, roster: int = 13) -> Dict:
+    """Raw BoxScoreTraditionalV3 JSON whose team sums match the game row."""
+    rng = _rng(seed, "box", game["game_id"])
+    box = {"gameId": game["game_id"], "homeTeamId": int(game["home_team"]), "awayTeamId": int(game["away_team"])}
+    stat_columns = {
+        "reboundsTotal": "rebounds", "assists": "assists", "turnovers": "turnovers",
+        "freeThrowsMade": "ftm", "freeThrowsAttempted": "fta",
+    }
+    for key, side in (("homeTeam", "home"), ("awayTeam", "away")):
+        inactive = int(game[f"{side}_inactive_players"])
+        active = roster - inactive
+        split = {stat: _split(game[f"{side}_{column}"], active, rng) for stat, column in stat_columns.items()}
+        players = []
+        for i in range(roster):
+            stats = {stat: int(split[stat][i]) if i < active else 0 for stat in stat_columns}
+            stats.update({
+                "minutes": f"{int(rng.integers(5, 40))}:{int(rng.integers(0, 60)):02d}" if i < active else "",
+                "fieldGoalsMade": int(rng.integers(0, 12)), "fieldGoalsAttempted": int(rng.integers(0, 22)),
+                "fieldGoalsPercentage": 0.45, "threePointersMade": int(rng.integers(0, 5)),
+                "threePointersAttempted": int(rng.integers(0, 10)), "threePointersPercentage": 0.35,
+                "freeThrowsPercentage": 0.78, "reboundsOffensive": 0, "reboundsDefensive": 0,
+                "steals": int(rng.integers(0, 3)), "blocks": int(rng.integers(0, 3)),
+                "foulsPersonal": int(rng.integers(0, 6)), "points": int(rng.integers(0, 35)),
+                "plusMinusPoints": float(rng.integers(-20, 20)),
+            })
+            players.append({
+                "personId": 1_600_000 + i, "firstName": "First", "familyName": f"Player{i}",
+                "nameI": f"F. Player{i}", "playerSlug": f"player-{i}", "position": "G" if i < 5 else "",
+                "comment": "" if i < active else "DNP - Coach's Decision", "jerseyNum": str(i),
+                "statistics": stats,
+            })
+        team_id = int(game[f"{side}_team"])
+        code = TEAM_TRICODES[team_id - int(TEAM_IDS[0])]
+        box[key] = {
+            "teamId": team_id, "teamCity": code, "teamName": f"{code} Team", "teamTricode": code,
+            "teamSlug": code.lower(), "players": players, "statistics": {}, "starters": {}, "bench": {},
+        }
+    return {"meta": {"version": 1}, "boxScoreTraditional": box}
+
+
+def seed_response_cache(cache, games: pd.DataFrame, seed: int = 0) -> None:
+    """Store PBP and box score payloads for ``games`` where ``fetch`` will find them."""
+    from nba_api.stats.endpoints.boxscoretraditionalv3 import BoxScoreTraditionalV3
+    from nba_api.stats.endpoints.playbyplayv3 import PlayByPlayV3
+
+    for _, game in games.iterrows():
+        for endpoint_cls, payload in (
+            (PlayByPlayV3, play_by_play_payload(game, seed)),
+            (BoxScoreTraditionalV3, box_score_payload(game, seed)),
+        ):
+            request = endpoint_cls(game_id=game["game_id"], get_request=False)
+            cache.put(request.endpoint, request.parameters, json.dumps(payload), ttl=None)
+
+
+def box_score_game_logs(games: pd.DataFrame, seed: int = 0) -> pd.DataFrame:
+    """PlayerGameLogs rows consistent with ``box_score_payload`` for ``games``.
+
+    Only players with minutes are listed, as in the real endpoint, so the
+    zero-minute players of the box score have no rows.
+    """
+    columns = {
+        "reboundsTotal": "REB", "assists": "AST", "turnovers": "TOV",
+        "freeThrowsMade": "FTM", "freeThrowsAttempted": "FTA",
+    }
+    rows = []
+    for _, game in games.iterrows():
+        box = box_score_payload(game, seed)["boxScoreTraditional"]
+        start = int(game["game_id"][3:5]) + 2000
+        for key in ("homeTeam", "awayTeam"):
+            team = box[key]
+            for player in team["players"]:
+                stats = player["statistics"]
+                if not stats["minutes"]:
+                    continue
+                minutes, seconds = stats["minutes"].split(":")
+                row = {
+                    "SEASON_YEAR": f"{start}-{(start + 1) % 100:02d}",
+                    "PLAYER_ID": player["personId"],
+                    "TEAM_ID": team["teamId"],
+                    "TEAM_ABBREVIATION": team["teamTricode"],
+                    "GAME_ID": game["game_id"],
+                    "MIN": round(int(minutes) + int(seconds) / 60, 1),
+                }
+                row.update({log: stats[stat] for stat, log in columns.items()})
+                rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def seed_game_logs(cache, games: pd.DataFrame, seed: int = 0) -> None:
+    """Store ``box_score_game_logs`` as one Regular Season PlayerGameLogs payload per season."""
+    from nba_api.stats.endpoints.playergamelogs import PlayerGameLogs
+
+    logs = box_score_game_logs(games, seed)
+    for season, season_logs in logs.groupby("SEASON_YEAR"):
+        payload = {
+            "resource": "playergamelogs",
+            "parameters": {},
+            "resultSets": [{
+                "name": "PlayerGameLogs",
+                "headers": list(season_logs.columns),
+                "rowSet": season_logs.to_numpy().tolist(),
+            }],
+        }
+        request = PlayerGameLogs(season_nullable=season, season_type_nullable="Regular Season", get_request=False)
+        cache.put(request.endpoint, request.parameters, json.dumps(payload, default=int), ttl=None)
+
+
+def pbp_events(games: pd.DataFrame, seed: int = 0, actions_per_game: int = ACTIONS_PER_GAME) -> pd.DataFrame:
+    """Stored-event columns for ``pbp_store.game_features``, built without per-game loops.
+
+    Matches what ``pbp_store.load_events`` returns for those columns:
+    string gameId, categorical location/actionType/subType, nullable int16
+    scores. Each game ends with a row carrying the final score, as in the
+    API order.
+    """
+    rng = _rng(seed, "events", len(games))
+    n_games = len(games)
+    per_game = actions_per_game + 1
+    game_idx = np.repeat(np.arange(n_games), per_game)
+    is_final = np.tile(np.arange(per_game) == actions_per_game, n_games)
+
+    side = rng.integers(0, 2, len(game_idx))
+    team_id = np.where(side == 1, games["home_team"].to_numpy()[game_idx], games["away_team"].to_numpy()[game_idx])
+    location = np.where(side == 1, "h", "v").astype(object)
+    sub_type = np.where(rng.random(len(game_idx)) < 0.5, "Jump Shot", "Driving Layup").astype(object)
+    action_type = np.where(rng.random(len(game_idx)) < 0.46, "Made Shot", "Missed Shot").astype(object)
+    period = (1 + np.tile(np.arange(per_game), n_games) * 4 // per_game).clip(max=4)
+    person_id = 1_600_000 + rng.integers(0, 4000, len(game_idx))
+
+    # Place each game's flagrants on its first non-final rows for that side
+    for column, loc in (("home_flagrants", "h"), ("away_flagrants", "v")):
+        counts = games[column].to_numpy()
+        for k in range(int(counts.max()) if n_games else 0):
+            rows = np.flatnonzero(counts > k) * per_game + (2 * k + (0 if loc == "h" else 1))
+            location[rows] = loc
+            team_id[rows] = games["home_team" if loc == "h" else "away_team"].to_numpy()[rows // per_game]
+            sub_type[rows] = "Flagrant Type 1"
+            action_type[rows] = "Foul"
+
+    team_id[is_final] = 0
+    person_id[is_final] = 0
+    location[is_final] = ""
+    action_type[is_final] = "game"
+    sub_type[is_final] = "end"
+    score_home = np.where(is_final, games["home_score"].to_numpy()[game_idx], 0)
+    score_away = np.where(is_final, games["away_score"].to_numpy()[game_idx], 0)
+    return pd.DataFrame({
+        "gameId": games["game_id"].to_numpy()[game_idx],
+        "period": period.astype("int8"),
+        "teamId": team_id.astype("int32"),
+        "personId": person_id.astype("int32"),
+        "location": pd.Categorical(location),
+        "actionType": pd.Categorical(action_type),
+        "subType": pd.Categorical(sub_type),
+        "scoreHome": pd.array(score_home, dtype="Int16"),
+        "scoreAway": pd.array(score_away, dtype="Int16"),
+    })
+
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the analysis scripts and shared modules.
+
+Each target runs in a fresh interpreter, so nothing is already imported.
+There are two kinds of target: a CLI invoked with ``--help``, and a plain
+``import`` of a module. The median wall time over ``--repeat`` runs is
+reported, together with the heavy dependencies the target loaded. Any heavy
+module showing up in that column means a lazy import regressed:
+
+    uv run python3 benchmarks/import_time.py --repeat 7
+    uv run python3 benchmarks/import_time.py --profile flagrant_fouls/extract_sample_data.py
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+HEAVY_MODULES = ["pandas", "numpy", "scipy", "statsmodels", "pyarrow", "nba_api", "requests", "matplotlib"]
+
+# (label, working directory, python argv)
+TARGETS: List[Tuple[str, str, List[str]]] = [
+    ("python -c pass", ".", ["-c", "pass"]),
+    ("extract_sample_data.py --help", "flagrant_fouls", ["extract_sample_data.py", "--help"]),
+    ("run_multivariate_analysis.py --help", "flagrant_fouls", ["run_multivariate_analysis.py", "--help"]),
+    ("build_leaderboard.py --help", ".", ["ballhog/build_leaderboard.py", "--help"]),
+    ("import extract_sample_data", "flagrant_fouls", ["-c", "import extract_sample_data"]),
+    ("import run_multivariate_analysis", "flagrant_fouls", ["-c", "import run_multivariate_analysis"]),
+    ("import nba_data", ".", ["-c", "import nba_data"]),
+]
+
+_REPORT_HEAVY = (
+    "import atexit, sys\n"
+    f"atexit.register(lambda: sys.stderr.write('HEAVY=' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules) + '\\n'))\n"
+)
+
+
+def _run_once(cwd: str, argv: List[str]) -> Tuple[float, List[str]]:
+    """Time one fresh interpreter and report which heavy modules it imported."""
+    if argv[0] == "-c":
+        command = [sys.executable, "-c", _REPORT_HEAVY + argv[1]]
+    else:
+        script = argv[0]
+        runner = (
+            _REPORT_HEAVY
+            + f"import runpy; sys.argv = {argv!r}; sys.path.insert(0, '.')\n"
+            + f"runpy.run_path({script!r}, run_name='__main__')"
+        )
+        command = [sys.executable, "-c", runner]
+    started = time.perf_counter()
+    result = subprocess.run(command, cwd=REPO_ROOT / cwd, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    heavy = []
+    for line in result.stderr.splitlines():
+        if line.startswith("HEAVY="):
+            heavy = [name for name in line[len("HEAVY="):].split(",") if name]
+    return elapsed, heavy
+
+
+def measure(repeat: int) -> List[Dict[str, object]]:
+    rows = []
+    for label, cwd, argv in TARGETS:
+        timings, heavy = [], []
+        for _ in range(repeat):
+            elapsed, heavy = _run_once(cwd, argv)
+            timings.append(elapsed)
+        rows.append({
+            "target": label,
+            "median_ms": round(statistics.median(timings) * 1000, 1),
+            "min_ms": round(min(timings) * 1000, 1),
+            "heavy_imports": heavy,
+        })
+    return rows
+
+
+def profile(script: str, top: int) -> None:
+    """Print the slowest cumulative imports for ``script --help`` via -X importtime."""
+    path = REPO_ROOT / script
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", path.name, "--help"],
+        cwd=path.parent,
+        capture_output=True,
+        text=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:  self_us | cumulative_us | name"
+        _, cumulative_us, name = line.split(":", 1)[1].split("|")
+        entries.append((int(cumulative_us), name.strip()))
+    for cumulative_us, name in sorted(entries, reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:9.1f} ms  {name}")
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Measure CLI and import cold-start time.")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per target.")
+    parser.add_argument("--json", type=Path, help="Also write the results to this JSON file.")
+    parser.add_argument("--profile", metavar="SCRIPT", help="Show the slowest imports of SCRIPT --help instead.")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        profile(args.profile, args.top)
+        return 0
+
+    rows = measure(args.repeat)
+    width = max(len(row["target"]) for row in rows)
+    print(f"{'target':<{width}}  {'median':>9}  {'min':>9}  heavy imports")
+    for row in rows:
+        heavy = ", ".join(row["heavy_imports"]) or "-"
+        print(f"{row['target']:<{width}}  {row['median_ms']:>7.1f}ms  {row['min_ms']:>7.1f}ms  {heavy}")
+    if args.json:
+        args.json.write_text(json.dumps({"python": sys.version.split()[0], "results": rows}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
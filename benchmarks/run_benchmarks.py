@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the leaderboard and flagrant-foul pipelines.
+
+Each stage runs real pipeline code on seeded synthetic fixtures (see
+``fixtures.py``) at one of three scales, from a single season up to 25
+seasons / ~30k games. Wall time is the best of ``--repeat`` runs; peak
+memory is the tracemalloc high-water mark of one extra run. Fixture
+generation happens in each stage's setup, and one untimed warm-up run
+absorbs lazy imports and other first-call costs, so neither is timed.
+
+Results are compared against ``benchmarks/baselines.json``. Any stage that
+is slower than its baseline by more than ``--tolerance``, or that uses more
+memory by the same margin, is flagged as a regression:
+
+    uv run python3 benchmarks/run_benchmarks.py                      # 1-season scale
+    uv run python3 benchmarks/run_benchmarks.py --scale 25-season --stages long_reshape ols_fit
+    uv run python3 benchmarks/run_benchmarks.py --scale 1-season 5-season --save-baseline
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+for path in (REPO_ROOT, REPO_ROOT / "ballhog", REPO_ROOT / "flagrant_fouls", REPO_ROOT / "benchmarks"):
+    sys.path.insert(0, str(path))
+
+import fixtures  # noqa: E402
+
+BASELINE_FILE = REPO_ROOT / "benchmarks" / "baselines.json"
+DEFAULT_TOLERANCE = 0.25
+NOISE_FLOOR_SECONDS = 0.005  # ignore slowdowns smaller than timer jitter
+
+SCALES: Dict[str, Dict[str, int]] = {
+    "1-season": {"seasons": 1, "games": 1230, "extract_games": 100},
+    "5-season": {"seasons": 5, "games": 6150, "extract_games": 250},
+    "25-season": {"seasons": 25, "games": 30000, "extract_games": 1000},
+}
+
+Stage = Callable[[Dict[str, int], Path], Callable[[], Any]]
+STAGES: Dict[str, Stage] = {}
+
+
+def stage(name: str) -> Callable[[Stage], Stage]:
+    """Register a stage: ``setup(scale, workdir)`` returns the callable to time."""
+    def register(setup: Stage) -> Stage:
+        STAGES[name] = setup
+        return setup
+    return register
+
+
+@stage("kobe_quotient")
+def _kobe_quotient(scale: Dict[str, int], workdir: Path) -> Callable[[], Any]:
+    """merge_player_frames + compute_kobe_quotient for every season."""
+    from build_leaderboard import compute_kobe_quotient, merge_player_frames
+
+    inputs = []
+    for season in fixtures.seasons(scale["seasons"]):
+        base = fixtures.league_dash_player_stats(season, "Base")
+        advanced = fixtures.league_dash_player_stats(season, "Advanced")
+        inputs.append((season, base, advanced, fixtures.league_dash_team_stats(season, base)))
+
+    def run():
+        return [
+            compute_kobe_quotient(merge_player_frames(base, advanced, season), teams)
+            for season, base, advanced, teams in inputs
+        ]
+    return run
+
+
+@stage("rolling_selfishness")
+def _rolling_selfishness(scale: Dict[str, int], workdir: Path) -> Callable[[], Any]:
+    """Game-log join plus 5/10/20-game window metrics for every player-game."""
+    import pandas as pd
+    from rolling_metrics import prepare_game_rows, rolling_selfishness
+
+    player_logs = [fixtures.player_game_logs(season) for season in fixtures.seasons(scale["seasons"])]
+    team_logs = pd.concat([fixtures.team_game_logs(logs) for logs in player_logs], ignore_index=True)
+    player_logs = pd.concat(player_logs, ignore_index=True)
+    return lambda: rolling_selfishness(prepare_game_rows(player_logs, team_logs))
+
+
+@stage("long_reshape")
+def _long_reshape(scale: Dict[str, int], workdir: Path) -> Callable[[], Any]:
+    """Wide game rows to team-game rows (run_multivariate_analysis.to_long_format)."""
+    from run_multivariate_analysis import to_long_format
+
+    games = fixtures.flagrant_games(scale["games"])
+    return lambda: to_long_format(games)
+
+
+@stage("ols_fit")
+def _ols_fit(scale: Dict[str, int], workdir: Path) -> Callable[[], Any]:
+    """Design matrix, Gram factorization, both models, VIFs and correlations."""
+    from run_multivariate_analysis import CORR_VARS, PRED_VARS, fit_models, to_long_format
+
+    df = to_long_format(fixtures.flagrant_games(scale["games"]))
+
+    def run():
+        gram, _, simple, multi = fit_models(df)
+        return gram.vif(PRED_VARS, centered=False), gram.corr(CORR_VARS), simple, multi
+    return run
+
+
+@stage("fixed_effects")
+def _fixed_effects(scale: Dict[str, int], workdir: Path) -> Callable[[], Any]:
+    """Team/opponent/season fixed-effects OLS and the win logit, both game-clustered."""
+    from run_multivariate_analysis import fit_fixed_effects, to_long_format
+
+    df = to_long_format(fixtures.flagrant_games(scale["games"]))
+    return lambda: fit_fixed_effects(df)
+
+
+@stage("extract_game_data")
+def _extract_game_data(scale: Dict[str, int], workdir: Path) -> Callable[[], Any]:
+    """Per-game PBP + box score parsing, served from a seeded response cache."""
+    import nba_data
+    from extract_sample_data import extract_game_data
+
+    nba_data.configure_cache(cache_dir=workdir / "cache")
+    games = fixtures.flagrant_games(scale["extract_games"])
+    fixtures.seed_response_cache(nba_data.get_cache(), games)
+    game_ids = games["game_id"].tolist()
+
+    def run():
+        rows = [extract_game_data(game_id)[0] for game_id in game_ids]
+        if any(row is None for row in rows):
+            raise RuntimeError("extract_game_data failed on a fixture game")
+        return rows
+    return run
+
+
+@stage("extract_game_logs")
+def _extract_game_logs(scale: Dict[str, int], workdir: Path) -> Callable[[], Any]:
+    """Per-game PBP with covariates from cached season game logs, checked against box scores."""
+    import nba_data
+    from box_covariates import GameLogIndex
+    from extract_sample_data import INACTIVE_COLUMNS, extract_game_data
+
+    nba_data.configure_cache(cache_dir=workdir / "cache")
+    games = fixtures.flagrant_games(scale["extract_games"])
+    fixtures.seed_response_cache(nba_data.get_cache(), games)
+    fixtures.seed_game_logs(nba_data.get_cache(), games)
+    game_ids = games["game_id"].tolist()
+    expected = [extract_game_data(game_id)[0] for game_id in game_ids]
+    for row in expected:
+        row.update(dict.fromkeys(INACTIVE_COLUMNS))
+
+    def run():
+        covariates = GameLogIndex()
+        rows = [extract_game_data(game_id, covariates=covariates)[0] for game_id in game_ids]
+        if rows != expected:
+            raise RuntimeError("game-log covariates differ from the box score aggregation")
+        return rows
+    return run
+
+
+@stage("pbp_features")
+def _pbp_features(scale: Dict[str, int], workdir: Path) -> Callable[[], Any]:
+    """pbp_store.game_features over every game's stored events."""
+    from pbp_rules import DEFAULT_RULES
+    from pbp_store import game_features
+
+    games = fixtures.flagrant_games(scale["games"])
+    events = fixtures.pbp_events(games)
+    # Events of games left out of game_ids must not land on any listed game
+    listed = games["game_id"].iloc[::2]
+    subset = DEFAULT_RULES.evaluate(events, listed)
+    if not subset.equals(DEFAULT_RULES.evaluate(events).loc[listed]):
+        raise RuntimeError("RuleSet.evaluate counted events of games outside game_ids")
+    return lambda: game_features(events)
+
+
+@stage("parquet_roundtrip")
+def _parquet_roundtrip(scale: Dict[str, int], workdir: Path) -> Callable[[], Any]:
+    """Write flagrant games as season partitions and read one season back."""
+    from nba_data.storage import load_flagrant_games, write_partitioned
+
+    games = fixtures.flagrant_games(scale["games"])
+    root = workdir / "games.parquet"
+    last_season = fixtures.seasons(scale["seasons"])[-1]
+
+    def run():
+        write_partitioned(games, root, "flagrant_games")
+        return load_flagrant_games(root, seasons=[last_season])
+    return run
+
+
+def measure(run: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Best-of-``repeat`` wall time after a warm-up run, then one traced run for peak memory."""
+    # Lazy imports and first-call setup would otherwise land in the first
+    # timed run, and with --repeat 1 in the reported time
+    run()
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": round(min(timings), 5), "peak_mb": round(peak / 2**20, 2)}
+
+
+def run_suite(scales: List[str], stages: List[str], repeat: int) -> Dict[str, Dict[str, Dict[str, float]]]:
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for scale_name in scales:
+        results[scale_name] = {}
+        for stage_name in stages:
+            with tempfile.TemporaryDirectory() as workdir:
+                run = STAGES[stage_name](SCALES[scale_name], Path(workdir))
+                results[scale_name][stage_name] = measure(run, repeat)
+            result = results[scale_name][stage_name]
+            print(f"  {scale_name:<10} {stage_name:<18} {result['seconds']:>9.4f}s  {result['peak_mb']:>9.2f} MB")
+    return results
+
+
+def load_baselines(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def compare(results: Dict[str, Dict[str, Dict[str, float]]], baselines: Dict[str, Any], tolerance: float) -> List[str]:
+    """Print each stage against its baseline; return the regressed stage keys."""
+    regressions = []
+    print(f"\nAgainst baseline (tolerance {tolerance:.0%}):")
+    for scale_name, stages in results.items():
+        for stage_name, result in stages.items():
+            baseline: Optional[Dict[str, float]] = baselines.get(scale_name, {}).get(stage_name)
+            if baseline is None:
+                print(f"  {scale_name:<10} {stage_name:<18} no baseline")
+                continue
+            time_ratio = result["seconds"] / baseline["seconds"] if baseline["seconds"] else float("inf")
+            memory_ratio = result["peak_mb"] / baseline["peak_mb"] if baseline["peak_mb"] else 1.0
+            slower = (
+                time_ratio > 1 + tolerance
+                and result["seconds"] - baseline["seconds"] > NOISE_FLOOR_SECONDS
+            )
+            heavier = memory_ratio > 1 + tolerance and result["peak_mb"] - baseline["peak_mb"] > 1.0
+            flag = "REGRESSION" if slower or heavier else "ok"
+            if slower or heavier:
+                regressions.append(f"{scale_name}/{stage_name}")
+            print(
+                f"  {scale_name:<10} {stage_name:<18} time x{time_ratio:5.2f}  memory x{memory_ratio:5.2f}  {flag}"
+            )
+    return regressions
+
+
+def save_baselines(results: Dict[str, Dict[str, Dict[str, float]]], path: Path) -> None:
+    """Merge new results into the baseline file, keeping unmeasured entries."""
+    baselines = load_baselines(path)
+    for scale_name, stages in results.items():
+        baselines.setdefault(scale_name, {}).update(stages)
+    baselines["_meta"] = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "recorded": time.strftime("%Y-%m-%d"),
+    }
+    path.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    print(f"\nSaved baselines to {path}")
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark pipeline stages on synthetic fixtures.")
+    parser.add_argument("--scale", nargs="+", default=["1-season"], choices=sorted(SCALES))
+    parser.add_argument("--stages", nargs="+", default=list(STAGES), choices=list(STAGES))
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage (best is kept).")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--save-baseline", action="store_true", help="Record these results as the new baseline.")
+    parser.add_argument("--output", type=Path, help="Also write raw results to this JSON file.")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 if any stage regressed.")
+    args = parser.parse_args(argv)
+
+    print(f"Running {len(args.stages)} stage(s) at {', '.join(args.scale)} (best of {args.repeat}):")
+    results = run_suite(args.scale, args.stages, args.repeat)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    if args.save_baseline:
+        save_baselines(results, args.baseline)
+        return 0
+    regressions = compare(results, load_baselines(args.baseline), args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
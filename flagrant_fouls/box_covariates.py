@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Box score covariates per team-game, per game or in bulk per season
+
+Extraction needs each team's rebounds, assists, turnovers, FTM and FTA.
+``from_box_score`` sums them from one game's BoxScoreTraditionalV3 player
+rows. That is one request per game, on top of its play-by-play.
+
+``GameLogIndex`` gets the same sums from PlayerGameLogs instead, with one
+request per season and season type. The player rows are summed per
+(game_id, team_id) once and kept in a dict, so looking up a game is a hash
+probe and costs no request:
+
+    covariates = GameLogIndex()
+    if covariates.covers(game_id):                 # loads the game's season on first use
+        stats = covariates.game(game_id, (home_team, away_team))
+
+Player rows are summed rather than read from TeamGameLogs. Team logs count
+team rebounds and team turnovers, but the box score player rows do not, so
+only player sums match the per-game values exactly.
+
+Game logs only list players who played. The zero-minute count
+(``inactive_players``) is therefore not available from them and is None.
+Games missing from the logs, such as games played after the logs were
+cached or season types without logs, are not covered. Callers fall back to
+the per-game box score for those.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import nba_data
+from nba_data.catalog import season_of, season_type_of
+from nba_data.lazy import lazy_import
+
+pd = lazy_import('pandas')
+
+# Covariate -> (BoxScoreTraditionalV3 column, PlayerGameLogs column)
+STATS = {
+    'rebounds': ('reboundsTotal', 'REB'),
+    'assists': ('assists', 'AST'),
+    'turnovers': ('turnovers', 'TOV'),
+    'ftm': ('freeThrowsMade', 'FTM'),
+    'fta': ('freeThrowsAttempted', 'FTA'),
+}
+# Season types whose games PlayerGameLogs lists; other games use box scores
+LOG_SEASON_TYPES = ('Regular Season', 'Playoffs', 'PlayIn')
+
+
+def from_box_score(box_stats, team_ids):
+    """``{team_id: covariates}`` from one game's BoxScoreTraditionalV3 player rows.
+
+    Inactive players are those with no minutes ('0' or empty). A team
+    without rows gets zeros.
+    """
+    columns = {box: name for name, (box, _) in STATS.items()}
+    totals = box_stats.groupby('teamId')[list(columns)].sum().rename(columns=columns).to_dict('index')
+    inactive = box_stats.loc[box_stats['minutes'].isin(['0', '']), 'teamId'].value_counts()
+    return {
+        team_id: {
+            **{name: int(totals.get(team_id, {}).get(name, 0)) for name in STATS},
+            'inactive_players': int(inactive.get(team_id, 0)),
+        }
+        for team_id in team_ids
+    }
+
+
+class GameLogIndex:
+    """Team-game covariates from PlayerGameLogs, hashed by ``(game_id, team_id)``.
+
+    ``fetch_logs(season, season_type)`` defaults to ``nba_data.fetch_player_game_logs``.
+    """
+
+    def __init__(self, fetch_logs=None):
+        self.fetch_logs = fetch_logs or nba_data.fetch_player_game_logs
+        self._totals = {}
+        self._games = set()
+        self._loaded = set()
+
+    def __len__(self):
+        return len(self._totals)
+
+    def add(self, player_logs):
+        """Index a PlayerGameLogs frame; its team-games replace any already indexed."""
+        if player_logs.empty:
+            return
+        log_columns = [log for _, log in STATS.values()]
+        totals = player_logs.groupby(['GAME_ID', 'TEAM_ID'], sort=False)[log_columns].sum()
+        game_ids = totals.index.get_level_values('GAME_ID').astype(str).str.zfill(10)
+        team_ids = totals.index.get_level_values('TEAM_ID').astype('int64')
+        self._totals.update(zip(zip(game_ids, team_ids.tolist()), totals.to_numpy().tolist()))
+        self._games.update(game_ids)
+
+    def load(self, season, season_type):
+        """Fetch and index one season's logs, once per ``(season, season_type)``."""
+        if (season, season_type) not in self._loaded:
+            self.add(self.fetch_logs(season, season_type))
+            self._loaded.add((season, season_type))
+
+    def covers(self, game_id):
+        """Whether the game is in its season's logs, fetching them the first time."""
+        game_id = str(game_id).zfill(10)
+        season_type = season_type_of(game_id)
+        if season_type not in LOG_SEASON_TYPES:
+            return False
+        self.load(season_of(game_id), season_type)
+        return game_id in self._games
+
+    def game(self, game_id, team_ids):
+        """``{team_id: covariates}`` for a covered game, shaped like ``from_box_score``."""
+        game_id = str(game_id).zfill(10)
+        stats = {}
+        for team_id in team_ids:
+            totals = self._totals.get((game_id, int(team_id)))
+            if totals is None:
+                raise KeyError(f'No game log rows for team {team_id} in game {game_id}')
+            stats[team_id] = {
+                **{name: int(value) for name, value in zip(STATS, totals)},
+                'inactive_players': None,
+            }
+        return stats
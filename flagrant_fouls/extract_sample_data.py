@@ -4,131 +4,562 @@ Extract sample of flagrant foul data WITH box score covariates
 Limited to ~250 games to stay under API rate limit (500-600 calls/hour)
 """
 
-import pandas as pd
-import numpy as np
-import time
+import argparse
+import multiprocessing
+import os
+import shutil
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from nba_api.stats.endpoints.leaguegamefinder import LeagueGameFinder
-from nba_api.stats.endpoints.playbyplayv3 import PlayByPlayV3
-from nba_api.stats.endpoints.boxscoretraditionalv3 import BoxScoreTraditionalV3
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import nba_data
+from nba_data.catalog import SEASON_TYPES
+from nba_data.journal import DONE, FAILED, SKIPPED, ExtractionJournal
+from nba_data.lazy import lazy_import
+
+# pandas, nba_api and the Parquet event store load on first use, so
+# importing this module or running --help stays cheap
+pd = lazy_import('pandas')
+box_covariates = lazy_import('box_covariates')
+pbp_rules = lazy_import('pbp_rules')
+pbp_store = lazy_import('pbp_store')
+
 csv_file = Path('nba_flagrant_fouls.csv')
+skipped_file = Path('nba_skipped_games.csv')
+journal_file = Path('extraction_journal.jsonl')
+shard_root = Path('extraction_shards')
+
+MAX_GAMES = 250  # 500 API calls, one hour's budget
+BATCH_SIZE = 25
+MAX_ATTEMPTS = 3
+NO_PBP_REASON = 'No play-by-play data available for this game'
+BOX_SOURCES = ('box-score', 'game-logs')
+INACTIVE_COLUMNS = ['home_inactive_players', 'away_inactive_players']
+
+def summarize_game(game_id, pbp, box_stats):
+    """Reduce one game's play-by-play and box score covariates to an output row.
+
+    ``box_stats`` is the game's BoxScoreTraditionalV3 player frame, or a
+    ``box_covariates.GameLogIndex`` that covers the game. With the index the
+    inactive player counts are unknown and left as None.
+    """
+    if pbp.empty:
+        raise ValueError(NO_PBP_REASON)
+    with nba_data.get_metrics().stage('summarize_game'):
+        return _summarize_game(game_id, pbp, box_stats)
+
+
+def _summarize_game(game_id, pbp, box_stats):
+    # Flagrants, technicals, ejections, foul-outs, ... by team in one pass
+    events = pbp_rules.DEFAULT_RULES.evaluate_game(pbp)
+
+    # Get final score
+    final_row = pbp.iloc[-1]
+    home_score = final_row['scoreHome']
+    away_score = final_row['scoreAway']
+
+    # Get team IDs
+    team_rows = pbp[pbp['teamId'] != 0]
+    home_team = team_rows[team_rows['location'] == 'h']['teamId'].iloc[0]
+    away_team = team_rows[team_rows['location'] == 'v']['teamId'].iloc[0]
+
+    # Team-level statistics and inactive (zero-minute) players
+    if isinstance(box_stats, pd.DataFrame):
+        team_stats = box_covariates.from_box_score(box_stats, (home_team, away_team))
+    else:
+        team_stats = box_stats.game(game_id, (home_team, away_team))
+    home_stats = team_stats[home_team]
+    away_stats = team_stats[away_team]
+
+    game_data = {
+        'game_id': str(game_id),
+        'home_team': int(home_team),
+        'away_team': int(away_team),
+        'home_flagrants': events['home_flagrants'],
+        'away_flagrants': events['away_flagrants'],
+        'home_score': int(home_score),
+        'away_score': int(away_score),
+        'home_rebounds': home_stats['rebounds'],
+        'away_rebounds': away_stats['rebounds'],
+        'home_assists': home_stats['assists'],
+        'away_assists': away_stats['assists'],
+        'home_turnovers': home_stats['turnovers'],
+        'away_turnovers': away_stats['turnovers'],
+        'home_ftm': home_stats['ftm'],
+        'away_ftm': away_stats['ftm'],
+        'home_fta': home_stats['fta'],
+        'away_fta': away_stats['fta'],
+        'home_inactive_players': home_stats['inactive_players'],
+        'away_inactive_players': away_stats['inactive_players']
+    }
+    game_data.update(events)
+    return game_data
+
+
+def _box_source(covariates, game_id):
+    """Where a game's covariates come from: ``covariates``, None for its box score, or an error.
+
+    Asking the index may fetch the game's season logs, and a failure there
+    becomes the game's error.
+    """
+    if covariates is None:
+        return None
+    try:
+        return covariates if covariates.covers(game_id) else None
+    except Exception as e:
+        return e
+
+
+def extract_game_data(game_id, pbp_sink=None, covariates=None):
+    """Extract flagrant fouls, game outcome, and box score statistics.
+
+    If ``pbp_sink`` is a list, the raw play-by-play frame is appended to it
+    so the caller can persist it to the event store with the batch. With a
+    ``box_covariates.GameLogIndex`` as ``covariates``, a game it covers costs
+    one request (play-by-play) instead of two.
+    """
+    from nba_api.stats.endpoints.boxscoretraditionalv3 import BoxScoreTraditionalV3
+    from nba_api.stats.endpoints.playbyplayv3 import PlayByPlayV3
 
-def extract_game_data(game_id):
-    """Extract flagrant fouls, game outcome, and box score statistics."""
     try:
         # Get play-by-play for flagrant fouls
-        pbp_response = PlayByPlayV3(game_id=game_id)
+        pbp_response = nba_data.fetch(PlayByPlayV3, game_id=game_id)
         pbp = pbp_response.play_by_play.get_data_frame()
+        if pbp.empty:
+            raise ValueError(NO_PBP_REASON)
 
-        # Extract flagrants by team
-        flagrants = pbp[pbp['subType'].isin(['Flagrant Type 1', 'Flagrant Type 2'])]
-        home_flagrants = len(flagrants[flagrants['location'] == 'h'])
-        away_flagrants = len(flagrants[flagrants['location'] == 'v'])
-
-        # Get final score
-        final_row = pbp.iloc[-1]
-        home_score = final_row['scoreHome']
-        away_score = final_row['scoreAway']
-
-        # Get team IDs
-        team_rows = pbp[pbp['teamId'] != 0]
-        home_team = team_rows[team_rows['location'] == 'h']['teamId'].iloc[0]
-        away_team = team_rows[team_rows['location'] == 'v']['teamId'].iloc[0]
-
-        # Get box score statistics
-        box_response = BoxScoreTraditionalV3(game_id=game_id)
-        box_stats = box_response.get_data_frames()[0]
-
-        # Aggregate team-level statistics
-        team_stats = box_stats.groupby('teamId').agg({
-            'reboundsTotal': 'sum',
-            'assists': 'sum',
-            'turnovers': 'sum',
-            'freeThrowsMade': 'sum',
-            'freeThrowsAttempted': 'sum'
-        }).to_dict('index')
-
-        home_stats = team_stats.get(home_team, {})
-        away_stats = team_stats.get(away_team, {})
-
-        # Count inactive players (minutes == '0' or empty)
-        home_inactive = len(box_stats[(box_stats['teamId'] == home_team) & ((box_stats['minutes'] == '0') | (box_stats['minutes'] == ''))])
-        away_inactive = len(box_stats[(box_stats['teamId'] == away_team) & ((box_stats['minutes'] == '0') | (box_stats['minutes'] == ''))])
-
-        return {
-            'game_id': str(game_id),
-            'home_team': int(home_team),
-            'away_team': int(away_team),
-            'home_flagrants': int(home_flagrants),
-            'away_flagrants': int(away_flagrants),
-            'home_score': int(home_score),
-            'away_score': int(away_score),
-            'home_rebounds': int(home_stats.get('reboundsTotal', 0)),
-            'away_rebounds': int(away_stats.get('reboundsTotal', 0)),
-            'home_assists': int(home_stats.get('assists', 0)),
-            'away_assists': int(away_stats.get('assists', 0)),
-            'home_turnovers': int(home_stats.get('turnovers', 0)),
-            'away_turnovers': int(away_stats.get('turnovers', 0)),
-            'home_ftm': int(home_stats.get('freeThrowsMade', 0)),
-            'away_ftm': int(away_stats.get('freeThrowsMade', 0)),
-            'home_fta': int(home_stats.get('freeThrowsAttempted', 0)),
-            'away_fta': int(away_stats.get('freeThrowsAttempted', 0)),
-            'home_inactive_players': int(home_inactive),
-            'away_inactive_players': int(away_inactive)
-        }, None
+        # Get box score statistics, from the season logs when they have the game
+        box_stats = _box_source(covariates, game_id)
+        if isinstance(box_stats, Exception):
+            raise box_stats
+        if box_stats is None:
+            box_stats = nba_data.fetch(BoxScoreTraditionalV3, game_id=game_id).get_data_frames()[0]
+        game_data = summarize_game(game_id, pbp, box_stats)
+        if pbp_sink is not None:
+            pbp_sink.append(pbp)
+        return game_data, None
     except Exception as e:
         return None, e
 
-# Get 2023-24 season games
-print("Fetching game IDs for 2023-24 season...")
-gamefinder = LeagueGameFinder(season_nullable='2023-24')
-games_df = gamefinder.get_data_frames()[0]
-game_ids = games_df['GAME_ID'].unique().tolist()
 
-# Limit to 250 games (500 API calls)
-MAX_GAMES = 250
-game_ids = game_ids[:MAX_GAMES]
+def extract_games(game_ids, session, pbp_sink=None, covariates=None):
+    """``extract_game_data`` for many games with every request in flight at once.
 
-print(f"Extracting {len(game_ids)} games (will use ~{len(game_ids)*2} API calls)")
-print(f"Starting extraction at {datetime.now().strftime('%H:%M:%S')}")
-print(f"Estimated completion: {(len(game_ids) * 1.5 / 60):.1f} minutes\n")
+    ``session`` is an ``nba_data.FetchSession``; both endpoints of every game
+    are fetched concurrently over its connection pool, except box scores of
+    games that ``covariates`` covers. Returns one ``(game_data, error)`` pair
+    per game, in order, and appends play-by-play to ``pbp_sink`` exactly as
+    repeated ``extract_game_data`` calls would.
+    """
+    from nba_api.stats.endpoints.boxscoretraditionalv3 import BoxScoreTraditionalV3
+    from nba_api.stats.endpoints.playbyplayv3 import PlayByPlayV3
 
-successful_count = 0
-failed_count = 0
-all_games = []
+    sources = [_box_source(covariates, game_id) for game_id in game_ids]
+    calls = []
+    for game_id, source in zip(game_ids, sources):
+        calls.append((PlayByPlayV3, {'game_id': game_id}))
+        if source is None:
+            calls.append((BoxScoreTraditionalV3, {'game_id': game_id}))
+    responses = iter(session.fetch_all(calls))
 
-for i, game_id in enumerate(game_ids):
-    if (i + 1) % 25 == 0:
-        print(f"Progress: {i+1}/{len(game_ids)} | Success: {successful_count} | Errors: {failed_count}")
+    results = []
+    for game_id, source in zip(game_ids, sources):
+        pbp_response = next(responses)
+        box_response = next(responses) if source is None else source
+        try:
+            if isinstance(pbp_response, Exception):
+                raise pbp_response
+            pbp = pbp_response.play_by_play.get_data_frame()
+            if pbp.empty:
+                raise ValueError(NO_PBP_REASON)
+            if isinstance(box_response, Exception):
+                raise box_response
+            box_stats = box_response if source is not None else box_response.get_data_frames()[0]
+            game_data = summarize_game(game_id, pbp, box_stats)
+        except Exception as e:
+            results.append((None, e))
+            continue
+        if pbp_sink is not None:
+            pbp_sink.append(pbp)
+        results.append((game_data, None))
+    return results
 
-    game_data, error = extract_game_data(game_id)
 
-    if game_data:
-        all_games.append(game_data)
-        successful_count += 1
-    else:
-        print(f"  Error on game {game_id}: {error}")
-        failed_count += 1
+def get_game_ids(catalog, seasons, season_types=None, max_games=MAX_GAMES, exclude=frozenset()):
+    """Game IDs from the local catalog, oldest first, capped per season.
+
+    Each season is refreshed first, which asks LeagueGameFinder only for dates
+    after the last catalogued one (and nothing once a season is over). Games
+    in ``exclude`` are dropped before the cap, so a capped resumed run moves on
+    to new games instead of re-selecting finished ones.
+    """
+    game_ids = []
+    for season in seasons:
+        added = catalog.refresh(season)
+        print(f"Game catalog {season}: {added} new game(s), through {catalog.last_date(season)}")
+        game_ids += catalog.select([season], season_types, exclude=exclude, limit=max_games or None)
+    return list(dict.fromkeys(game_ids))
+
+
+def finished_games(journal):
+    """Games that never need to be requested again: done, in the CSV, or skipped."""
+    finished = journal.completed | journal.skipped
+    if csv_file.exists():
+        finished |= set(read_game_csv(csv_file)['game_id'])
+    return finished
+
+
+def atomic_write_csv(df, path):
+    """Write to a temp file and rename so a crash never leaves a torn CSV."""
+    tmp_path = path.with_name(path.name + '.tmp')
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def read_game_csv(path):
+    if not path.exists():
+        return pd.DataFrame()
+    return pd.read_csv(path, dtype={**_nullable_dtypes(), 'game_id': str})
+
+
+def _nullable_dtypes():
+    # Rule features are blank for rows extracted before they existed, and
+    # inactive counts for rows whose covariates came from game logs
+    return dict.fromkeys(pbp_rules.DEFAULT_RULES.columns + INACTIVE_COLUMNS, 'Int64')
+
+
+def flush_batch(rows, skipped, journal, pbp_frames=None):
+    """Persist a batch of results, then journal them as done/skipped.
+
+    Raw play-by-play goes to the event store first, so a game journaled as
+    done always has its events stored too.
+    """
+    with nba_data.get_metrics().stage('flush_batch'):
+        _flush_batch(rows, skipped, journal, pbp_frames)
+
+
+def _flush_batch(rows, skipped, journal, pbp_frames):
+    if pbp_frames:
+        pbp_store.append_games(pbp_frames)
+    if rows:
+        new_df = pd.DataFrame(rows).astype(_nullable_dtypes())
+        combined = pd.concat([read_game_csv(csv_file), new_df], ignore_index=True)
+        atomic_write_csv(combined.drop_duplicates('game_id', keep='last'), csv_file)
+    if skipped:
+        new_df = pd.DataFrame(skipped, columns=['game_id', 'reason', 'timestamp'])
+        combined = pd.concat([read_game_csv(skipped_file), new_df], ignore_index=True)
+        atomic_write_csv(combined.drop_duplicates('game_id', keep='last'), skipped_file)
+    journal.record_many(
+        [(row['game_id'], DONE, None) for row in rows]
+        + [(game_id, SKIPPED, reason) for game_id, reason, _ in skipped]
+    )
+
+
+def _extracted(queue, session, chunk_size, covariates=None):
+    """Yield ``(game_id, game_data, error, pbp)`` for each queued game, in order.
+
+    Without a session games are fetched one at a time; with one, ``chunk_size``
+    games are fetched concurrently before their results are yielded.
+    """
+    if session is None:
+        for game_id in queue:
+            sink = []
+            game_data, error = extract_game_data(game_id, sink, covariates)
+            yield game_id, game_data, error, sink[0] if sink else None
+        return
+    for start in range(0, len(queue), chunk_size):
+        chunk = queue[start:start + chunk_size]
+        sink = []
+        results = extract_games(chunk, session, sink, covariates)
+        frames = iter(sink)
+        for game_id, (game_data, error) in zip(chunk, results):
+            yield game_id, game_data, error, next(frames) if game_data else None
+
+
+def run_extraction(game_ids, journal, batch_size=BATCH_SIZE, max_attempts=MAX_ATTEMPTS, store_events=True,
+                   concurrency=1, box_source='box-score'):
+    """Extract every pending game, flushing in batches and retrying transient errors.
 
-    # 1.5 second throttle
-    time.sleep(1.5)
+    Games already journaled as done (or present in the output CSV) and games
+    skipped for permanent errors are never requested again. Transient
+    failures are journaled and re-queued after the main pass until they have
+    failed ``max_attempts`` times across all runs. With ``concurrency`` above
+    1, each batch's requests go out together over a pooled async client.
+    With ``box_source`` 'game-logs', covariates come from season-wide
+    PlayerGameLogs where they cover the game, so most games cost one request.
+    """
+    finished = finished_games(journal)
+    pending = [
+        game_id for game_id in game_ids
+        if game_id not in finished and journal.failures[game_id] < max_attempts
+    ]
+    print(f"Pending: {len(pending)} | Finished or given up: {len(game_ids) - len(pending)}")
 
-# Save all data
-if all_games:
-    df = pd.DataFrame(all_games)
-    df.to_csv(csv_file, index=False)
+    session = nba_data.FetchSession(concurrency) if concurrency > 1 else None
+    covariates = box_covariates.GameLogIndex() if box_source == 'game-logs' else None
+    try:
+        successful_count, skipped_count = _drain(
+            pending, journal, session, batch_size, max_attempts, store_events, covariates
+        )
+    finally:
+        if session is not None:
+            session.close()
+    return successful_count, skipped_count
+
+
+def _drain(pending, journal, session, batch_size, max_attempts, store_events, covariates=None):
+    """The extraction loop proper: journal, flush and re-queue until done."""
+    successful_count = 0
+    skipped_count = 0
+    rows, skipped = [], []
+    pbp_frames = [] if store_events else None
+    queue = pending
+    while queue:
+        retry_queue = []
+        for i, (game_id, game_data, error, pbp) in enumerate(_extracted(queue, session, batch_size, covariates)):
+            if (i + 1) % 25 == 0:
+                print(f"Progress: {i+1}/{len(queue)} | Success: {successful_count} | Skipped: {skipped_count} | Retry queue: {len(retry_queue)}")
+
+            if game_data:
+                rows.append(game_data)
+                if pbp_frames is not None:
+                    pbp_frames.append(pbp)
+                successful_count += 1
+            elif isinstance(error, nba_data.TRANSIENT_ERRORS):
+                print(f"  Transient error on game {game_id}: {error}")
+                journal.record(game_id, FAILED, str(error))
+                if journal.failures[game_id] < max_attempts:
+                    retry_queue.append(game_id)
+            else:
+                print(f"  Skipping game {game_id}: {error}")
+                skipped.append((game_id, str(error), datetime.now().isoformat()))
+                skipped_count += 1
+
+            if len(rows) + len(skipped) >= batch_size:
+                flush_batch(rows, skipped, journal, pbp_frames)
+                rows, skipped = [], []
+                pbp_frames = [] if store_events else None
+
+        flush_batch(rows, skipped, journal, pbp_frames)
+        rows, skipped = [], []
+        pbp_frames = [] if store_events else None
+        if retry_queue:
+            print(f"Retrying {len(retry_queue)} game(s) with transient errors...")
+        queue = retry_queue
+
+    return successful_count, skipped_count
+
+
+def shard_of(game_id, shards, by='hash'):
+    """Stable shard index for a game: by season start year, or by CRC32 of the ID.
+
+    Both are pure functions of the ID (unlike ``hash()``), so every process
+    and every resumed run agrees on the assignment.
+    """
+    game_id = str(game_id).zfill(10)
+    if by == 'season':
+        return int(game_id[3:5]) % shards
+    return zlib.crc32(game_id.encode()) % shards
+
+
+def shard_dirs(shards):
+    """One working directory per shard, named for the layout so layouts never mix."""
+    return [shard_root / f'shard-{i:02d}-of-{shards:02d}' for i in range(shards)]
+
+
+def _run_shard(directory, game_ids, args):
+    """Worker process: extract one shard into its own CSV, skip log and journal."""
+    global csv_file, skipped_file, journal_file
+    if args.stats_server:
+        nba_data.configure_stats_server(args.stats_server)
+    if args.events_dir:
+        pbp_store.events_dir = args.events_dir
+    metrics_dir = args.metrics_dir / directory.name if args.metrics_dir else None
+    metrics = nba_data.configure_metrics(metrics_dir / 'events.jsonl' if metrics_dir else None)
+
+    directory.mkdir(parents=True, exist_ok=True)
+    csv_file = directory / csv_file.name
+    skipped_file = directory / skipped_file.name
+    journal_file = directory / journal_file.name
+    journal = ExtractionJournal(journal_file)
+    try:
+        successful_count, skipped_count = run_extraction(
+            game_ids, journal, args.batch_size, args.max_attempts, not args.no_events, args.concurrency,
+            args.box_source
+        )
+    finally:
+        if metrics_dir is not None:
+            metrics.write(metrics_dir)
+        metrics.close()
+    gave_up = sorted(set(game_ids) & journal.failed)
+    return successful_count, skipped_count, gave_up, dict(nba_data.fetch_counts)
+
+
+def run_sharded(game_ids, args, journal):
+    """Extract ``game_ids`` in ``args.shards`` worker processes, then merge.
+
+    Every worker draws from the same file-locked rate-limiter bucket and
+    response cache, so the shards share one API budget; the play-by-play
+    event store takes uniquely named files from each of them. Returns the
+    same totals as ``run_extraction`` plus the games given up on and the
+    summed fetch counters.
+    """
+    finished = set(read_game_csv(csv_file)['game_id']) if csv_file.exists() else set()
+    assignments = [[] for _ in range(args.shards)]
+    for game_id in game_ids:
+        if game_id not in finished:
+            assignments[shard_of(game_id, args.shards, args.shard_by)].append(game_id)
+    directories = shard_dirs(args.shards)
+    print(f"Sharding {sum(map(len, assignments))} game(s) by {args.shard_by}: {[len(a) for a in assignments]}")
+
+    totals = {'successful': 0, 'skipped': 0, 'gave_up': [], 'counts': dict(nba_data.fetch_counts)}
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=args.shards, mp_context=context) as pool:
+        futures = [
+            pool.submit(_run_shard, directory, shard_ids, args)
+            for directory, shard_ids in zip(directories, assignments)
+            if shard_ids
+        ]
+        for future in futures:
+            successful_count, skipped_count, gave_up, counts = future.result()
+            totals['successful'] += successful_count
+            totals['skipped'] += skipped_count
+            totals['gave_up'] += gave_up
+            for name, value in counts.items():
+                totals['counts'][name] += value
+
+    with nba_data.get_metrics().stage('merge_shards'):
+        merge_shards(directories, journal)
+    return totals
+
+
+def merge_shards(directories, journal):
+    """Fold shard outputs into ``csv_file``/``skipped_file`` deterministically.
+
+    Existing rows come first and shards follow in index order; each game
+    keeps its last row and the result is sorted by game_id, so the merged
+    files depend only on which games were extracted, never on shard timing.
+    Merged games are journaled as done or skipped in the main journal.
+    """
+    games = pd.concat(
+        [read_game_csv(csv_file)] + [read_game_csv(d / csv_file.name) for d in directories],
+        ignore_index=True,
+    )
+    skipped = pd.concat(
+        [read_game_csv(skipped_file)] + [read_game_csv(d / skipped_file.name) for d in directories],
+        ignore_index=True,
+    )
+    done_ids = []
+    if not games.empty:
+        games = games.drop_duplicates('game_id', keep='last').sort_values('game_id', kind='stable')
+        atomic_write_csv(games, csv_file)
+        done_ids = games['game_id'].tolist()
+    skipped_records = []
+    if not skipped.empty:
+        skipped = skipped[~skipped['game_id'].isin(done_ids)]
+        skipped = skipped.drop_duplicates('game_id', keep='last').sort_values('game_id', kind='stable')
+        atomic_write_csv(skipped, skipped_file)
+        skipped_records = list(zip(skipped['game_id'], skipped['reason']))
+    journal.record_many(
+        [(game_id, DONE, None) for game_id in done_ids if journal.status.get(game_id) != DONE]
+        + [(game_id, SKIPPED, reason) for game_id, reason in skipped_records if journal.status.get(game_id) != SKIPPED]
+    )
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Extract flagrant foul data with box score covariates.')
+    parser.add_argument('--season', nargs='+', default=['2023-24'], help='Season(s) to pull games from.')
+    parser.add_argument('--season-type', nargs='+', choices=sorted(SEASON_TYPES.values()), help='Only these season types (default: all).')
+    parser.add_argument('--max-games', type=int, default=MAX_GAMES, help='Cap on new games per season (0 for full seasons).')
+    parser.add_argument('--catalog', type=Path, help='Game catalog database (default: .nba_cache/game_catalog.sqlite).')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Games per atomic flush.')
+    parser.add_argument('--max-attempts', type=int, default=MAX_ATTEMPTS, help='Transient failures allowed per game.')
+    parser.add_argument('--resume', action='store_true', help='Continue from the journal instead of starting over.')
+    parser.add_argument('--events-dir', type=Path, help='Raw play-by-play event store (default: pbp_events).')
+    parser.add_argument('--no-events', action='store_true', help='Do not keep raw play-by-play.')
+    parser.add_argument('--concurrency', type=int, default=1, help='Requests in flight at once (async, pooled); 1 keeps the blocking path.')
+    parser.add_argument('--box-source', default='box-score', choices=BOX_SOURCES,
+                        help='Covariates from each game\'s box score, or from one PlayerGameLogs call per season. '
+                             'game-logs has no inactive counts, so run_multivariate_analysis.py then fits its models without inactive_diff.')
+    parser.add_argument('--shards', type=int, default=1, help='Worker processes; each writes its own shard files under extraction_shards/.')
+    parser.add_argument('--shard-by', default='hash', choices=['hash', 'season'], help='How game IDs are split across shards.')
+    parser.add_argument('--metrics-dir', type=Path, help='Write events.jsonl, metrics.prom and summary.json here.')
+    parser.add_argument('--stats-server', help='Stats API base URL, e.g. a local nba_data.standin server (default: $NBA_STATS_SERVER).')
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    args = parse_args(argv)
+    metrics = nba_data.configure_metrics(args.metrics_dir / 'events.jsonl' if args.metrics_dir else None)
+    try:
+        return run(args)
+    finally:
+        metrics.finish(args.metrics_dir)
+
+
+def run(args):
+    if args.stats_server:
+        nba_data.configure_stats_server(args.stats_server)
+    if args.events_dir:
+        pbp_store.events_dir = args.events_dir
+
+    if not args.resume:
+        # Fresh run: forget previous progress but keep the old output as a backup
+        if journal_file.exists():
+            journal_file.unlink()
+        if csv_file.exists():
+            os.replace(csv_file, csv_file.with_name(csv_file.name + '.bak'))
+        for directory in shard_dirs(args.shards):
+            shutil.rmtree(directory, ignore_errors=True)
+    journal = ExtractionJournal(journal_file)
+
+    catalog = nba_data.GameCatalog(args.catalog)
+    try:
+        game_ids = get_game_ids(
+            catalog, list(dict.fromkeys(args.season)), args.season_type, args.max_games, finished_games(journal)
+        )
+    finally:
+        catalog.close()
+
+    calls_per_game = 1 if args.box_source == 'game-logs' else 2
+    print(f"Extracting {len(game_ids)} games (will use ~{len(game_ids)*calls_per_game} API calls)")
+    print(f"Starting extraction at {datetime.now().strftime('%H:%M:%S')}")
+    print(f"Estimated throttling: {nba_data.get_rate_limiter().estimate_wait(len(game_ids) * calls_per_game) / 60:.1f} minutes (before cache hits)\n")
+
+    if args.shards > 1:
+        totals = run_sharded(game_ids, args, journal)
+        successful_count, skipped_count = totals['successful'], totals['skipped']
+        gave_up, counts = totals['gave_up'], totals['counts']
+    else:
+        successful_count, skipped_count = run_extraction(
+            game_ids, journal, args.batch_size, args.max_attempts, not args.no_events, args.concurrency,
+            args.box_source
+        )
+        gave_up = sorted(set(game_ids) & journal.failed)
+        counts = nba_data.fetch_counts
+
+    df = read_game_csv(csv_file)
     print(f"\n{'='*70}")
     print(f"EXTRACTION COMPLETE")
     print(f"{'='*70}")
-    print(f"Successfully extracted: {successful_count} games")
-    print(f"Errors: {failed_count} games")
-    print(f"Saved to: {csv_file}")
+    print(f"Extracted this run: {successful_count} games")
+    print(f"Skipped (permanent errors): {skipped_count} games, logged to {skipped_file}")
+    print(f"Gave up after {args.max_attempts} transient failures: {len(gave_up)} games")
+    print(f"API calls: {counts['misses']} | Cache hits: {counts['hits']} | Retries: {counts['retries']}")
+    if df.empty:
+        print("No data extracted!")
+        return 1
+    print(f"Saved {len(df)} games to: {csv_file}")
     print(f"Columns: {df.columns.tolist()}")
     print(f"\nSample data:")
     print(df.head())
-else:
-    print("No data extracted!")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main(sys.argv[1:]))
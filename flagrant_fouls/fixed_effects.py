@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+High-dimensional fixed effects and a win/loss logit for team-game tables
+
+Formula dummies such as ``C(team_id) + C(opp_id) + C(season)`` make the
+design matrix dense in every level. This module keeps the work proportional
+to the rows times the handful of reported regressors instead.
+
+* ``fit_absorbed`` removes team, opponent and season effects from the
+  outcome and regressors by alternating projections. Each sweep subtracts
+  one factor's group means, computed with ``np.bincount``. The demeaned
+  columns then go through ``gram_ols.GramOLS``, so the coefficients match
+  the dummy-variable regression exactly (Frisch-Waugh-Lovell). Standard
+  errors are charged the absorbed degrees of freedom. Memory is one float
+  copy of the regressors and outcome.
+* ``fit_logit`` models winning with Newton-Raphson on a sparse design: the
+  reported regressors are dense columns and each fixed-effect level is a
+  one-nonzero-per-row sparse column. Each iteration forms a p x p Hessian,
+  where p is the regressors plus the levels (about 100 for 30 teams over 25
+  seasons).
+
+Both take ``cluster=`` for game-clustered standard errors, since each game
+contributes a mirrored home row and away row. 50k team-game rows fit in well
+under a second.
+
+    fe = fit_absorbed(df, 'point_differential', PRED_VARS, ['team_id', 'opp_id', 'season'],
+                      categorical={'location': 'away'}, cluster='game_id')
+    win = fit_logit(df, 'win', PRED_VARS, absorb=['team_id', 'opp_id', 'season'],
+                    categorical={'location': 'away'}, cluster='game_id')
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from nba_data.lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+sparse = lazy_import('scipy.sparse')
+csgraph = lazy_import('scipy.sparse.csgraph')
+special = lazy_import('scipy.special')
+stats = lazy_import('scipy.stats')
+gram_ols = lazy_import('gram_ols')
+
+DEMEAN_TOL = 1e-10
+DEMEAN_MAX_ITER = 1000
+
+
+def _complete_rows(df, columns):
+    return df[list(dict.fromkeys(columns))].dropna()
+
+
+def _codes(data, absorb):
+    return [pd.factorize(data[column])[0] for column in absorb]
+
+
+def absorbed_dof(codes):
+    """Parameters swept out by ``codes``, the constant included.
+
+    Counts every level, then drops one redundant level per connected
+    component of the first two factors (a playoff series whose teams met
+    nobody else is its own component) and one per further factor. That is
+    exact for two factors and conservative beyond them.
+    """
+    levels = [int(c.max()) + 1 for c in codes]
+    if len(codes) < 2:
+        return sum(levels)
+    nodes = levels[0] + levels[1]
+    edges = sparse.coo_matrix((np.ones(len(codes[0])), (codes[0], levels[0] + codes[1])), shape=(nodes, nodes))
+    components, _ = csgraph.connected_components(edges, directed=False)
+    return sum(levels) - components - (len(codes) - 2)
+
+
+def demean(values, codes, tol=DEMEAN_TOL, max_iter=DEMEAN_MAX_ITER):
+    """Residualize the columns of ``values`` on several factors at once.
+
+    Alternating projections: subtract each factor's group means in turn until
+    no group mean is larger than ``tol`` times the column's spread. Returns
+    ``(demeaned, sweeps)``.
+    """
+    out = np.array(values, dtype=float, order='F')
+    if out.ndim == 1:
+        out = out[:, None]
+    counts = [np.bincount(c).astype(float) for c in codes]
+    scale = np.maximum(out.std(axis=0), 1.0)
+    for sweep in range(1, max_iter + 1):
+        largest = 0.0
+        for c, n in zip(codes, counts):
+            for j in range(out.shape[1]):
+                means = np.bincount(c, weights=out[:, j], minlength=len(n)) / n
+                out[:, j] -= means[c]
+                largest = max(largest, np.abs(means).max() / scale[j])
+            if len(codes) == 1:
+                # One projection is exact
+                return out, sweep
+        if largest < tol:
+            return out, sweep
+    raise RuntimeError(f'Fixed effects did not converge in {max_iter} sweeps')
+
+
+def _cluster_meat(scores, clusters):
+    """Sum of per-cluster score outer products, and the cluster count."""
+    codes, uniques = pd.factorize(clusters)
+    if sparse.issparse(scores):
+        members = sparse.csr_matrix((np.ones(len(codes)), (codes, np.arange(len(codes)))),
+                                    shape=(len(uniques), len(codes)))
+        totals = members @ scores
+        return (totals.T @ totals).toarray(), len(uniques)
+    totals = np.zeros((len(uniques), scores.shape[1]))
+    np.add.at(totals, codes, scores)
+    return totals.T @ totals, len(uniques)
+
+
+def fit_absorbed(df, outcome, regressors, absorb, categorical=None, cluster=None,
+                 tol=DEMEAN_TOL, max_iter=DEMEAN_MAX_ITER):
+    """OLS of ``outcome`` on ``regressors`` with the ``absorb`` factors swept out.
+
+    Returns a ``gram_ols.OLSFit``; its R-squared is the within R-squared.
+    With ``cluster`` the covariance is the cluster-robust sandwich with the
+    small-sample factor ``G/(G-1) * (n-1)/(n-k)``, tested on ``G - 1``
+    degrees of freedom.
+    """
+    needed = [outcome] + list(regressors) + list(absorb) + list(categorical or {})
+    data = _complete_rows(df, needed + ([cluster] if cluster else []))
+    design = gram_ols.design_matrix(data, regressors, intercept=False, categorical=categorical)
+    codes = _codes(data, absorb)
+    z, _ = demean(np.column_stack([design.to_numpy(dtype=float), data[outcome].to_numpy(dtype=float)]), codes, tol, max_iter)
+
+    within = pd.DataFrame(z[:, :-1], index=data.index, columns=design.columns)
+    gram = gram_ols.GramOLS(within, pd.Series(z[:, -1], index=data.index, name=outcome), absorbed_dof(codes))
+    fit = gram.fit()
+    if cluster:
+        x = z[:, :-1]
+        resid = z[:, -1] - x @ fit.params.to_numpy()
+        meat, groups = _cluster_meat(x * resid[:, None], data[cluster])
+        bread = fit.cov_params.to_numpy() / fit.scale
+        n, k = fit.nobs, fit.nobs - fit.df_resid
+        correction = groups / (groups - 1) * (n - 1) / (n - k)
+        fit.use_cov(correction * bread @ meat @ bread, groups - 1, 'cluster')
+    return fit
+
+
+def _separated(data, outcome, absorb):
+    """Rows in a fixed-effect level whose outcome never varies.
+
+    A team that won every game it played (a swept series in playoff-only
+    data) has an infinite level coefficient, and its rows say nothing about
+    the other coefficients. They are dropped repeatedly until every level
+    has both outcomes, as fixest does.
+    """
+    keep = np.ones(len(data), dtype=bool)
+    y = data[outcome].to_numpy(dtype=float)
+    codes = _codes(data, absorb)
+    changed = True
+    while changed:
+        changed = False
+        for c in codes:
+            rows = np.bincount(c, weights=keep)
+            wins = np.bincount(c, weights=y * keep)
+            drop = keep & ((wins == 0) | (wins == rows))[c]
+            if drop.any():
+                keep &= ~drop
+                changed = True
+    return ~keep
+
+
+def _dummies(data, absorb):
+    """Treatment-coded sparse columns for each factor, first level dropped."""
+    blocks, names = [], []
+    for column in absorb:
+        codes, levels = pd.factorize(data[column])
+        keep = codes > 0
+        rows = np.flatnonzero(keep)
+        blocks.append(sparse.csr_matrix((np.ones(len(rows)), (rows, codes[keep] - 1)),
+                                        shape=(len(data), len(levels) - 1)))
+        names += [f'C({column})[T.{level}]' for level in levels[1:]]
+    return blocks, names
+
+
+class LogitFit:
+    """Maximum-likelihood logit estimates, named like statsmodels' results.
+
+    Fixed-effect levels are estimated but left out of ``summary()``.
+    """
+
+    def __init__(self, names, level_names, params, cov, llf, llnull, nobs, fitted, rank, iterations, cov_type,
+                 dropped=0):
+        self.names = names
+        self.nobs = nobs
+        self.dropped = dropped
+        self.df_absorbed = rank - len(names)
+        self.df_model = rank - 1
+        self.df_resid = nobs - rank
+        self.iterations = iterations
+        self.cov_type = cov_type
+        self.fitted = fitted
+
+        self.all_params = pd.Series(params, index=names + level_names)
+        self.params = self.all_params[names]
+        self.cov_params = pd.DataFrame(cov[:len(names), :len(names)], index=names, columns=names)
+        self.bse = pd.Series(np.sqrt(np.diag(self.cov_params.values)), index=names)
+        self.tvalues = self.params / self.bse
+        self.pvalues = pd.Series(2 * stats.norm.sf(np.abs(self.tvalues)), index=names)
+
+        self.llf = llf
+        self.llnull = llnull
+        self.prsquared = 1 - llf / llnull
+        self.llr = 2 * (llf - llnull)
+        self.llr_pvalue = stats.chi2.sf(self.llr, self.df_model)
+        self.aic = -2 * llf + 2 * rank
+        self.bic = -2 * llf + np.log(nobs) * rank
+
+    def conf_int(self, alpha=0.05):
+        q = stats.norm.ppf(1 - alpha / 2)
+        return pd.DataFrame({0: self.params - q * self.bse, 1: self.params + q * self.bse})
+
+    def odds_ratios(self):
+        ci = self.conf_int()
+        return pd.DataFrame({'odds_ratio': np.exp(self.params), '[0.025': np.exp(ci[0]), '0.975]': np.exp(ci[1])})
+
+    def marginal_effects(self):
+        """Average marginal effect on win probability: mean of p(1-p) times each coefficient."""
+        weight = np.mean(self.fitted * (1 - self.fitted))
+        return (weight * self.params).drop('Intercept', errors='ignore')
+
+    def summary(self, title='Logit Regression Results'):
+        ci = self.conf_int()
+        table = pd.DataFrame({
+            'coef': self.params,
+            'std err': self.bse,
+            'z': self.tvalues,
+            'P>|z|': self.pvalues,
+            '[0.025': ci[0],
+            '0.975]': ci[1],
+        })
+        lines = [
+            title,
+            '=' * 78,
+            f'No. Observations: {self.nobs:>8d}    Pseudo R-squ.:  {self.prsquared:>10.4f}',
+            f'Df Residuals:     {self.df_resid:>8d}    Log-Likelihood: {self.llf:>10.2f}',
+            f'Df Model:         {self.df_model:>8d}    LL-Null:        {self.llnull:>10.2f}',
+            f'Iterations:       {self.iterations:>8d}    LLR p-value:    {self.llr_pvalue:>10.3g}',
+            f'AIC:            {self.aic:>10.1f}    BIC:            {self.bic:>10.1f}',
+            f'Covariance:     {self.cov_type:>10}    Absorbed df:    {self.df_absorbed:>10d}',
+            f'Dropped (outcome constant within a level): {self.dropped:>6d}',
+            '-' * 78,
+            table.to_string(float_format=lambda v: f'{v:.4f}'),
+            '=' * 78,
+        ]
+        return '\n'.join(lines)
+
+
+def fit_logit(df, outcome, regressors, absorb=(), categorical=None, cluster=None, tol=1e-8, max_iter=50):
+    """Logit of a 0/1 ``outcome`` with optional fixed effects as sparse dummies.
+
+    The intercept and ``regressors`` are reported; ``absorb`` levels are
+    estimated alongside them, after dropping levels that always win or
+    always lose. With ``cluster`` the covariance is the cluster-robust
+    sandwich with statsmodels' small-sample factor.
+    """
+    needed = [outcome] + list(regressors) + list(absorb) + list(categorical or {})
+    data = _complete_rows(df, needed + ([cluster] if cluster else []))
+    separated = _separated(data, outcome, absorb)
+    data = data[~separated]
+    design = gram_ols.design_matrix(data, regressors, intercept=True, categorical=categorical)
+    blocks, level_names = _dummies(data, absorb)
+    x = sparse.hstack([sparse.csr_matrix(design.to_numpy(dtype=float))] + blocks, format='csr')
+    y = data[outcome].to_numpy(dtype=float)
+    n, p = x.shape
+
+    params = np.zeros(p)
+    eta = np.zeros(n)
+    llf = -n * np.log(2)
+    for iteration in range(1, max_iter + 1):
+        fitted = special.expit(eta)
+        weights = fitted * (1 - fitted)
+        hessian = (x.T @ x.multiply(weights[:, None])).toarray()
+        # Least squares tolerates levels that are collinear with each other
+        params += np.linalg.lstsq(hessian, x.T @ (y - fitted), rcond=None)[0]
+        eta = x @ params
+        previous, llf = llf, np.sum(y * eta - np.logaddexp(0, eta))
+        # glm's deviance criterion; unlike a step-size test it also settles
+        # when a quasi-separated level drifts towards infinity
+        if abs(llf - previous) < tol * (abs(llf) + 0.1):
+            break
+    else:
+        raise RuntimeError(f'Logit did not converge in {max_iter} iterations')
+
+    fitted = special.expit(eta)
+    weights = fitted * (1 - fitted)
+    hessian = (x.T @ x.multiply(weights[:, None])).toarray()
+    inverse = np.linalg.pinv(hessian, hermitian=True)
+    rank = np.linalg.matrix_rank(hessian, hermitian=True)
+    cov_type = 'nonrobust'
+    if cluster:
+        meat, groups = _cluster_meat(x.multiply((y - fitted)[:, None]).tocsr(), data[cluster])
+        correction = groups / (groups - 1) * (n - 1) / (n - rank)
+        inverse = correction * inverse @ meat @ inverse
+        cov_type = 'cluster'
+
+    mean = y.mean()
+    llnull = n * (mean * np.log(mean) + (1 - mean) * np.log(1 - mean))
+    return LogitFit(list(design.columns), level_names, params, inverse, llf, llnull, n, fitted,
+                    rank, iteration, cov_type, int(separated.sum()))
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Ordinary least squares from one shared cross-product matrix
+
+The design matrix X and outcome y are stacked once and reduced to the Gram
+matrix Z'Z of Z = [X y]. A single Cholesky factorization of that matrix
+yields every model whose regressors are a leading block of X: coefficients,
+standard errors, confidence intervals, fit statistics and the nested-model
+F-test. The same Gram matrix also gives VIFs and the correlation matrix
+without another pass over the data. Results match statsmodels' OLS to
+floating point tolerance.
+
+    design = design_matrix(df, ['committed_flagrant', 'rebound_diff'], intercept=True)
+    gram = GramOLS(design, df['point_differential'])
+    simple = gram.fit(2)   # Intercept + committed_flagrant
+    full = gram.fit()
+    f_stat, p_value = gram.f_test(simple, full)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from nba_data.lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+stats = lazy_import('scipy.stats')
+
+
+def design_matrix(df, columns, intercept=True, categorical=None):
+    """Build a float design matrix with statsmodels-style column names.
+
+    ``categorical`` maps a column to its reference level; the remaining
+    levels become ``C(col)[T.level]`` treatment dummies, as in a formula.
+    """
+    design = pd.DataFrame(index=df.index)
+    if intercept:
+        design['Intercept'] = 1.0
+    for column in columns:
+        design[column] = df[column].astype(float)
+    for column, reference in (categorical or {}).items():
+        for level in sorted(df[column].dropna().unique()):
+            if level != reference:
+                design[f'C({column})[T.{level}]'] = (df[column] == level).astype(float)
+    return design
+
+
+class OLSFit:
+    """Estimates for one model, named like the statsmodels results attributes."""
+
+    def __init__(self, names, params, cov_unscaled, ssr, centered_tss, nobs, has_constant, df_absorbed=0):
+        self.nobs = nobs
+        self.k_constant = int(has_constant)
+        self.df_absorbed = df_absorbed
+        self.df_model = len(names) - self.k_constant
+        self.df_resid = nobs - len(names) - df_absorbed
+        self.df_inference = self.df_resid
+        self.cov_type = 'nonrobust'
+        self.ssr = ssr
+        self.centered_tss = centered_tss
+        self.ess = centered_tss - ssr
+        self.scale = ssr / self.df_resid
+
+        self.params = pd.Series(params, index=names)
+        self.cov_params = pd.DataFrame(cov_unscaled * self.scale, index=names, columns=names)
+        self.bse = pd.Series(np.sqrt(np.diag(self.cov_params.values)), index=names)
+        self.tvalues = self.params / self.bse
+        self.pvalues = pd.Series(2 * stats.t.sf(np.abs(self.tvalues), self.df_resid), index=names)
+
+        self.rsquared = 1 - ssr / centered_tss
+        self.rsquared_adj = 1 - (nobs - self.k_constant - df_absorbed) / self.df_resid * (1 - self.rsquared)
+        self.fvalue = (self.ess / self.df_model) / self.scale if self.df_model else np.nan
+        self.f_pvalue = stats.f.sf(self.fvalue, self.df_model, self.df_resid) if self.df_model else np.nan
+        self.llf = -nobs / 2 * (np.log(2 * np.pi) + np.log(ssr / nobs) + 1)
+        k = self.df_model + self.k_constant + df_absorbed
+        self.aic = -2 * self.llf + 2 * k
+        self.bic = -2 * self.llf + np.log(nobs) * k
+
+    def use_cov(self, cov, df, cov_type):
+        """Replace the covariance (e.g. cluster-robust); t-tests then use ``df`` degrees of freedom."""
+        names = self.params.index
+        self.cov_type = cov_type
+        self.df_inference = df
+        self.cov_params = pd.DataFrame(cov, index=names, columns=names)
+        self.bse = pd.Series(np.sqrt(np.diag(cov)), index=names)
+        self.tvalues = self.params / self.bse
+        self.pvalues = pd.Series(2 * stats.t.sf(np.abs(self.tvalues), df), index=names)
+        return self
+
+    def conf_int(self, alpha=0.05):
+        q = stats.t.ppf(1 - alpha / 2, self.df_inference)
+        return pd.DataFrame({0: self.params - q * self.bse, 1: self.params + q * self.bse})
+
+    def summary(self, title='OLS Regression Results'):
+        """Compact text summary: fit statistics and the coefficient table."""
+        ci = self.conf_int()
+        table = pd.DataFrame({
+            'coef': self.params,
+            'std err': self.bse,
+            't': self.tvalues,
+            'P>|t|': self.pvalues,
+            '[0.025': ci[0],
+            '0.975]': ci[1],
+        })
+        lines = [
+            title,
+            '=' * 78,
+            f'No. Observations: {self.nobs:>8d}    R-squared:      {self.rsquared:>10.3f}',
+            f'Df Residuals:     {self.df_resid:>8d}    Adj. R-squared: {self.rsquared_adj:>10.3f}',
+            f'Df Model:         {self.df_model:>8d}    F-statistic:    {self.fvalue:>10.2f}',
+            f'Log-Likelihood: {self.llf:>10.2f}    Prob (F-stat):  {self.f_pvalue:>10.3g}',
+            f'AIC:            {self.aic:>10.1f}    BIC:            {self.bic:>10.1f}',
+        ]
+        if self.df_absorbed or self.cov_type != 'nonrobust':
+            lines.append(f'Covariance:     {self.cov_type:>10}    Absorbed df:    {self.df_absorbed:>10d}')
+        lines += [
+            '-' * 78,
+            table.to_string(float_format=lambda v: f'{v:.4f}'),
+            '=' * 78,
+        ]
+        return '\n'.join(lines)
+
+
+class GramOLS:
+    """One Gram matrix and Cholesky factor shared by nested models and diagnostics."""
+
+    def __init__(self, design, outcome, df_absorbed=0):
+        data = pd.concat([design, outcome.rename('__outcome__')], axis=1).dropna()
+        z = data.to_numpy(dtype=float)
+        self.names = list(design.columns)
+        self.outcome_name = outcome.name
+        self.nobs = len(z)
+        # Parameters already swept out of a demeaned design (fixed_effects.py)
+        self.df_absorbed = df_absorbed
+        self.has_constant = 'Intercept' in self.names
+        self.sums = z.sum(axis=0)
+        self.gram = z.T @ z
+        # Upper factor of [X y]'[X y]: R11 factors X'X, r12 = R11^-T X'y and
+        # the trailing diagonal entry squared is the residual sum of squares
+        self.chol = np.linalg.cholesky(self.gram).T
+
+    def _centered_tss(self):
+        y_sum = self.sums[-1]
+        yy = self.gram[-1, -1]
+        return yy - y_sum ** 2 / self.nobs if self.has_constant else yy
+
+    def fit(self, k=None):
+        """Fit the model on the first ``k`` design columns (all of them by default)."""
+        p = len(self.names)
+        k = p if k is None else k
+        r11 = self.chol[:k, :k]
+        r12 = self.chol[:k, p]
+        params = np.linalg.solve(r11, r12) if k else np.empty(0)
+        r11_inv = np.linalg.solve(r11, np.eye(k))
+        ssr = self.gram[-1, -1] - r12 @ r12
+        return OLSFit(
+            self.names[:k],
+            params,
+            r11_inv @ r11_inv.T,
+            ssr,
+            self._centered_tss(),
+            self.nobs,
+            self.has_constant and 'Intercept' in self.names[:k],
+            self.df_absorbed,
+        )
+
+    @staticmethod
+    def f_test(restricted, full):
+        """F-test that the extra regressors in ``full`` are jointly zero."""
+        df_num = full.df_model - restricted.df_model
+        f_stat = ((restricted.ssr - full.ssr) / df_num) / (full.ssr / full.df_resid)
+        return f_stat, stats.f.sf(f_stat, df_num, full.df_resid)
+
+    def _index(self, columns):
+        names = self.names + [self.outcome_name]
+        return [names.index(column) for column in columns]
+
+    def corr(self, columns):
+        """Pearson correlations of design columns and/or the outcome."""
+        idx = self._index(columns)
+        sums = self.sums[idx]
+        cov = self.gram[np.ix_(idx, idx)] - np.outer(sums, sums) / self.nobs
+        scale = np.sqrt(np.diag(cov))
+        return pd.DataFrame(cov / np.outer(scale, scale), index=columns, columns=columns)
+
+    def vif(self, columns, centered=True):
+        """Variance inflation factors for ``columns`` without auxiliary regressions.
+
+        The default is the textbook VIF, the diagonal of the inverse
+        correlation matrix (statsmodels' ``variance_inflation_factor`` with
+        ``standardize=True``). ``centered=False`` regresses raw columns on
+        each other with no constant, as ``standardize=False`` does.
+        """
+        if centered:
+            inverse = np.linalg.inv(self.corr(columns).values)
+            return pd.Series(np.diag(inverse), index=columns)
+        idx = self._index(columns)
+        sub = self.gram[np.ix_(idx, idx)]
+        return pd.Series(np.diag(sub) * np.diag(np.linalg.inv(sub)), index=columns)
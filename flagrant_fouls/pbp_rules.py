@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Declarative per-game features from PlayByPlayV3 events
+
+A feature is a ``Rule``: which events it reads (regexes on actionType and
+subType) and how it reduces them for each side. There are three reductions:
+
+* ``count``: number of matching events.
+* ``first_period``: period of the first matching event, 0 if there is none.
+* ``players_reaching``: players with at least ``threshold`` matching events
+  (six personal fouls is a foul-out).
+
+A ``RuleSet`` compiles its rules once and evaluates them all in a single
+vectorized pass. Per event, the only work is a table lookup on actionType,
+one on subType and an AND. Each distinct value is tested against every
+filter once and cached, so each lookup gives a bitmask of the filters it
+passes. The few matching rows (fouls, ejections) become a small
+events x filters matrix, and every rule reduces that matrix with one
+``np.add.at``/``np.minimum.at`` per reduction kind. A rule added to the set
+costs a column, not another scan of the frame.
+
+    features = DEFAULT_RULES.evaluate_game(pbp)   # {'home_flagrants': 1, 'away_foul_outs': 0, ...}
+    per_game = DEFAULT_RULES.evaluate(events)      # stored events for many games, one row per gameId
+
+Adding a feature is one entry in ``RULES``:
+
+    Rule('shooting_fouls', Events('Foul', 'Shooting'))
+"""
+
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from nba_data.lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+SIDES = {'h': 'home', 'v': 'away'}
+REDUCTIONS = ('count', 'first_period', 'players_reaching')
+MAX_FILTERS = 64  # one bit each in the per-pair mask
+
+
+@dataclass(frozen=True)
+class Events:
+    """Rows whose actionType and subType fully match these regexes."""
+    action_type: str
+    sub_type: str = '.*'
+    exclude_sub_type: str = ''
+
+    def matches_action(self, action_type):
+        return re.fullmatch(self.action_type, action_type) is not None
+
+    def matches_sub_type(self, sub_type):
+        return (re.fullmatch(self.sub_type, sub_type) is not None
+                and not (self.exclude_sub_type and re.fullmatch(self.exclude_sub_type, sub_type)))
+
+
+@dataclass(frozen=True)
+class Rule:
+    """One feature, emitted per side as ``home_<name>`` and ``away_<name>``."""
+    name: str
+    events: Events
+    reduce: str = 'count'
+    threshold: int = 1
+
+
+# Any action type, as the original subType filter was, so flagrant counts
+# match rows extracted before the rule engine
+FLAGRANT = Events('.*', 'Flagrant Type [12]')
+# Technicals, including defensive three seconds, are not personal fouls
+TECHNICAL = Events('Foul', '.*Technical.*|Defensive 3 Second')
+PERSONAL_FOUL = Events('Foul', exclude_sub_type=TECHNICAL.sub_type)
+EJECTION = Events('Ejection')
+
+RULES = [
+    Rule('flagrants', FLAGRANT),
+    Rule('technicals', TECHNICAL),
+    Rule('ejections', EJECTION),
+    Rule('foul_outs', PERSONAL_FOUL, 'players_reaching', threshold=6),
+    Rule('first_flagrant_period', FLAGRANT, 'first_period'),
+]
+
+
+class RuleSet:
+    """Rules compiled to one filter table and evaluated in one pass."""
+
+    def __init__(self, rules):
+        self.rules = tuple(rules)
+        names = [rule.name for rule in self.rules]
+        if len(set(names)) != len(names):
+            raise ValueError(f'Duplicate rule names: {names}')
+        for rule in self.rules:
+            if rule.reduce not in REDUCTIONS:
+                raise ValueError(f'Rule {rule.name!r}: unknown reduction {rule.reduce!r}')
+        self.filters = list(dict.fromkeys(rule.events for rule in self.rules))
+        if len(self.filters) > MAX_FILTERS:
+            raise ValueError(f'At most {MAX_FILTERS} distinct event filters, got {len(self.filters)}')
+        self.columns = [f'{side}_{rule.name}' for rule in self.rules for side in SIDES.values()]
+        # Reduction -> (output positions, filter columns, thresholds) of its rules
+        self._plan = {}
+        for kind in REDUCTIONS:
+            positions = [i for i, rule in enumerate(self.rules) if rule.reduce == kind]
+            if positions:
+                self._plan[kind] = (
+                    positions,
+                    [self.filters.index(self.rules[i].events) for i in positions],
+                    [self.rules[i].threshold for i in positions],
+                )
+        # Column -> value -> bitmask of filters that accept it, shared by every game
+        self._masks = {'actionType': {}, 'subType': {}}
+
+    def _column_masks(self, series):
+        """Per-row bitmask of the filters whose test on this column passes.
+
+        Every filter is a test on actionType AND a test on subType, so the
+        row mask is the AND of the two column masks. Each distinct value is
+        tested once; categorical columns need no hashing at all.
+        """
+        cache = self._masks[series.name]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes, values = series.cat.codes.to_numpy(), series.cat.categories
+        else:
+            codes, values = pd.factorize(series)
+        table = np.empty(len(values) + 1, dtype=np.uint64)
+        # Missing values have code -1, which reads the trailing '' entry
+        for i, value in enumerate(list(values) + ['']):
+            mask = cache.get(value)
+            if mask is None:
+                mask = 0
+                for bit, events in enumerate(self.filters):
+                    test = events.matches_action if series.name == 'actionType' else events.matches_sub_type
+                    if test(value):
+                        mask |= 1 << bit
+                cache[value] = mask
+            table[i] = mask
+        return table[codes]
+
+    def _matched(self, events):
+        """Row positions that match any filter, and their rows x filters boolean matrix."""
+        masks = self._column_masks(events['actionType'])
+        masks &= self._column_masks(events['subType'])
+        rows = np.flatnonzero(masks)
+        bits = np.arange(len(self.filters), dtype=np.uint64)
+        return rows, ((masks[rows, None] >> bits) & np.uint64(1)).astype(bool)
+
+    def evaluate(self, events, game_ids=None):
+        """Features for every game in ``events``, indexed by ``game_id``.
+
+        ``events`` needs actionType, subType, location and, for the rules
+        that use them, period and personId. Without a gameId column it is
+        treated as one game. ``game_ids`` (default: every gameId in order of
+        appearance) fixes the output rows; games without matching events get
+        zeros, and events of games not in ``game_ids`` are ignored.
+        """
+        rows, matched = self._matched(events)
+        location = np.asarray(events['location'].take(rows), dtype=object)
+        side = np.select([location == 'h', location == 'v'], [0, 1], -1)
+        if 'gameId' in events.columns:
+            game_ids = pd.Index(pd.unique(events['gameId']) if game_ids is None else game_ids)
+            # Only matched rows need a game code, so only they are looked up
+            game_codes = game_ids.get_indexer(events['gameId'].take(rows))
+        else:
+            game_ids, game_codes = pd.Index([None]), np.zeros(len(rows), dtype=np.int64)
+        # Rows without a side, or of games not in game_ids (code -1), count nowhere
+        keep = (side >= 0) & (game_codes >= 0)
+        rows, matched = rows[keep], matched[keep]
+        groups = game_codes[keep] * 2 + side[keep]
+        n_groups = len(game_ids) * 2
+        values = np.empty((n_groups, len(self.rules)), dtype=np.int64)
+
+        if 'count' in self._plan:
+            positions, columns, _ = self._plan['count']
+            counts = np.zeros((n_groups, len(self.filters)), dtype=np.int64)
+            np.add.at(counts, groups, matched)
+            values[:, positions] = counts[:, columns]
+
+        if 'first_period' in self._plan:
+            positions, columns, _ = self._plan['first_period']
+            never = np.iinfo(np.int64).max
+            period = events['period'].to_numpy()[rows].astype(np.int64)
+            first = np.full((n_groups, len(self.filters)), never)
+            np.minimum.at(first, groups, np.where(matched, period[:, None], never))
+            first[first == never] = 0
+            values[:, positions] = first[:, columns]
+
+        if 'players_reaching' in self._plan:
+            positions, columns, thresholds = self._plan['players_reaching']
+            person = events['personId'].to_numpy()[rows].astype(np.int64)
+            named = person != 0
+            # One key per (game, side, player); the high bits keep the group
+            player_codes, player_keys = pd.factorize(groups[named] * (1 << 32) + person[named])
+            per_player = np.zeros((len(player_keys), len(self.filters)), dtype=np.int64)
+            np.add.at(per_player, player_codes, matched[named])
+            players = np.zeros((n_groups, len(positions)), dtype=np.int64)
+            np.add.at(players, np.asarray(player_keys) >> 32, per_player[:, columns] >= np.array(thresholds))
+            values[:, positions] = players
+
+        # Group rows alternate home/away; put both sides of a game on one row
+        values = values.reshape(len(game_ids), 2, -1).transpose(0, 2, 1).reshape(len(game_ids), -1)
+        return pd.DataFrame(values, index=game_ids.rename('game_id'), columns=self.columns)
+
+    def evaluate_game(self, pbp):
+        """Features for one game's PlayByPlayV3 frame, as plain ints."""
+        features = self.evaluate(pbp).iloc[0]
+        return {column: int(value) for column, value in features.items()}
+
+
+DEFAULT_RULES = RuleSet(RULES)
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Compact columnar store for raw PlayByPlayV3 events
+
+Every extracted game's play-by-play is appended to a season-partitioned
+Parquet dataset (pbp_events/season=2023-24/*.parquet) with categorical
+subType/actionType/location and int32 IDs, so new per-game features can be
+computed over thousands of stored games without touching the API:
+
+    python pbp_store.py backfill --from-csv nba_flagrant_fouls.csv
+    python pbp_store.py features --output pbp_features.csv
+"""
+
+import argparse
+import sys
+import uuid
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from nba_api.stats.endpoints.playbyplayv3 import PlayByPlayV3
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from nba_data import fetch
+from nba_data.storage import CATEGORY, season_from_game_id
+import pbp_rules
+
+events_dir = Path('pbp_events')
+
+# Columns game_features reads
+FEATURE_COLUMNS = ['gameId', 'period', 'teamId', 'personId', 'location', 'actionType', 'subType',
+                   'scoreHome', 'scoreAway']
+
+PBP_SCHEMA = pa.schema([
+    ('season', pa.string()),
+    ('gameId', pa.string()),
+    ('actionNumber', pa.int32()),
+    ('clock', pa.string()),
+    ('period', pa.int8()),
+    ('teamId', pa.int32()),
+    ('teamTricode', CATEGORY),
+    ('personId', pa.int32()),
+    ('playerName', CATEGORY),
+    ('playerNameI', CATEGORY),
+    ('xLegacy', pa.int16()),
+    ('yLegacy', pa.int16()),
+    ('shotDistance', pa.float32()),
+    ('shotResult', CATEGORY),
+    ('isFieldGoal', pa.int8()),
+    ('scoreHome', pa.int16()),
+    ('scoreAway', pa.int16()),
+    ('pointsTotal', pa.int16()),
+    ('location', CATEGORY),
+    ('description', pa.string()),
+    ('actionType', CATEGORY),
+    ('subType', CATEGORY),
+    ('videoAvailable', pa.int8()),
+    ('shotValue', pa.int8()),
+    ('actionId', pa.int32()),
+])
+
+_PARTITIONING = ds.partitioning(pa.schema([('season', pa.string())]), flavor='hive')
+
+
+def conform_pbp(pbp):
+    """Cast one or more raw PlayByPlayV3 frames to the compact schema.
+
+    Row order is preserved, so the last row of each game is still the final
+    score row that extract_game_data reads.
+    """
+    df = pbp.copy()
+    df['gameId'] = df['gameId'].astype(str).str.zfill(10)
+    df['season'] = df['gameId'].map(season_from_game_id)
+    for field in PBP_SCHEMA:
+        if field.name not in df.columns:
+            df[field.name] = None
+        elif pa.types.is_integer(field.type) or pa.types.is_floating(field.type):
+            # Scores arrive as strings and may be '' before the first basket
+            df[field.name] = pd.to_numeric(df[field.name], errors='coerce')
+            if pa.types.is_integer(field.type):
+                df[field.name] = df[field.name].astype('Int64')
+        elif field.type == CATEGORY:
+            df[field.name] = df[field.name].astype('string')
+    return pa.Table.from_pandas(df[PBP_SCHEMA.names], schema=PBP_SCHEMA, preserve_index=False)
+
+
+def append_games(frames, root=None):
+    """Append a batch of per-game PBP frames as new files in their season partitions.
+
+    Games already in the store (or repeated in the batch) are skipped, so a
+    fresh run over the same games, or a resumed run after a crash between
+    this write and the journal, never stores a game's events twice. Returns
+    the number of games written.
+    """
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return 0
+    root = Path(root or events_dir)
+    game_ids = [str(frame['gameId'].iloc[0]).zfill(10) for frame in frames]
+    seen = stored_game_ids(root, game_ids)
+    new_frames = []
+    for game_id, frame in zip(game_ids, frames):
+        if game_id not in seen:
+            seen.add(game_id)
+            new_frames.append(frame)
+    if not new_frames:
+        return 0
+    table = conform_pbp(pd.concat(new_frames, ignore_index=True))
+    ds.write_dataset(
+        table,
+        str(root),
+        format='parquet',
+        partitioning=_PARTITIONING,
+        existing_data_behavior='overwrite_or_ignore',
+        basename_template=f'part-{uuid.uuid4().hex}-{{i}}.parquet',
+    )
+    return len(new_frames)
+
+
+def load_events(root=None, seasons=None, columns=None, game_ids=None):
+    """Load stored events, pruning season partitions and optionally filtering games."""
+    root = Path(root or events_dir)
+    if not root.exists():
+        return PBP_SCHEMA.empty_table().to_pandas()
+    dataset = ds.dataset(str(root), format='parquet', schema=PBP_SCHEMA, partitioning=_PARTITIONING)
+    row_filter = None
+    if seasons is not None:
+        row_filter = ds.field('season').isin(list(seasons))
+    if game_ids is not None:
+        game_filter = ds.field('gameId').isin([str(g) for g in game_ids])
+        row_filter = game_filter if row_filter is None else row_filter & game_filter
+    return dataset.to_table(columns=columns, filter=row_filter).to_pandas()
+
+
+def stored_game_ids(root=None, game_ids=None):
+    """Game IDs already in the store (reads only the gameId column).
+
+    With ``game_ids``, only those games' season partitions are read and the
+    result is the subset of them that is stored.
+    """
+    seasons = None
+    if game_ids is not None:
+        game_ids = [str(g).zfill(10) for g in game_ids]
+        seasons = {season_from_game_id(g) for g in game_ids}
+    return set(load_events(root, seasons=seasons, columns=['gameId'], game_ids=game_ids)['gameId'].unique())
+
+
+def game_features(events, rules=None):
+    """Per-game team IDs, final score and rule features for every stored game at once.
+
+    Produces the same values extract_game_data derives from a single game's
+    play-by-play: the ``pbp_rules`` features (``DEFAULT_RULES`` unless
+    ``rules`` is given) come from one pass over all games' events.
+    """
+    # Final score: the last event of each game in API order
+    final = events.drop_duplicates('gameId', keep='last').set_index('gameId')
+
+    # Team IDs: first row with a team for each side
+    team_rows = events[events['teamId'] != 0]
+    teams = (
+        team_rows.drop_duplicates(['gameId', 'location'])
+        .pivot(index='gameId', columns='location', values='teamId')
+    )
+
+    features = pd.DataFrame(index=final.index)
+    features['home_team'] = teams.get('h')
+    features['away_team'] = teams.get('v')
+    features['home_score'] = final['scoreHome']
+    features['away_score'] = final['scoreAway']
+    features.index.name = 'game_id'
+    features = features.join((rules or pbp_rules.DEFAULT_RULES).evaluate(events, features.index))
+    return features.reset_index()
+
+
+def backfill(game_ids, root=None, batch_size=100):
+    """Store PBP for games not yet in the store (served from the response cache when warm)."""
+    stored = stored_game_ids(root)
+    missing = [g for g in game_ids if g not in stored]
+    print(f"Backfilling {len(missing)} game(s) into {root or events_dir}")
+    batch = []
+    for i, game_id in enumerate(missing):
+        try:
+            batch.append(fetch(PlayByPlayV3, game_id=game_id).play_by_play.get_data_frame())
+        except Exception as e:
+            print(f"  Error on game {game_id}: {e}")
+        if len(batch) >= batch_size or i == len(missing) - 1:
+            append_games(batch, root)
+            batch = []
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Maintain and query the raw play-by-play event store.')
+    parser.add_argument('command', choices=['backfill', 'features'])
+    parser.add_argument('--events-dir', type=Path, default=events_dir)
+    parser.add_argument('--from-csv', type=Path, default=Path('nba_flagrant_fouls.csv'),
+                        help='Game list for backfill (any CSV with a game_id column).')
+    parser.add_argument('--seasons', nargs='+', help='Restrict features to these seasons.')
+    parser.add_argument('--output', type=Path, help='Write features to this CSV.')
+    args = parser.parse_args(argv)
+
+    if args.command == 'backfill':
+        game_ids = pd.read_csv(args.from_csv, dtype={'game_id': str})['game_id'].tolist()
+        backfill(game_ids, args.events_dir)
+        return 0
+
+    events = load_events(args.events_dir, seasons=args.seasons, columns=FEATURE_COLUMNS)
+    features = game_features(events)
+    print(f"Computed features for {len(features)} games from {len(events)} events")
+    if args.output:
+        features.to_csv(args.output, index=False)
+        print(f"Saved to: {args.output}")
+    else:
+        print(features.head())
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main(sys.argv[1:]))
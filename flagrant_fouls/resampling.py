@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Cluster bootstrap and permutation inference for OLS coefficients
+
+Both procedures turn every replicate into a small Gram matrix and solve
+whole batches of replicates with one vectorized ``np.linalg.solve`` call;
+no per-replicate model objects are built.
+
+* Cluster bootstrap: each game contributes a home and an away row, so games
+  are resampled with replacement. The Gram matrix of a resampled dataset is
+  a count-weighted sum of per-game Gram blocks, so a batch of replicates is
+  a single (replicates x games) @ (games x (p+1)^2) product.
+* Permutation test: the tested column is shuffled across rows. Only its
+  row/column of the Gram matrix changes, so each replicate costs one
+  length-n dot product per design column.
+
+Batches are spread across a process pool. Each batch draws from its own
+child of ``np.random.SeedSequence(seed)``, so a given seed yields identical
+replicates whatever the number of workers.
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from nba_data.lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+REPLICATES_PER_TASK = 250
+
+# Per-process inputs, set once by the pool initializer (or inline)
+_shared = {}
+
+
+def _init_worker(arrays):
+    _shared.clear()
+    _shared.update(arrays)
+
+
+def _solve_batch(grams, p, extra=None):
+    """Coefficients (and optionally ``(X'X)^-1 e_extra``) for a stack of Gram matrices."""
+    xtx = grams[:, :p, :p]
+    rhs = grams[:, :p, p:p + 1]
+    if extra is not None:
+        unit = np.zeros((len(grams), p, 1))
+        unit[:, extra, 0] = 1.0
+        rhs = np.concatenate([rhs, unit], axis=2)
+    return np.linalg.solve(xtx, rhs)
+
+
+def _t_statistics(grams, column, nobs):
+    """t-statistic of one coefficient for each Gram matrix in a stack."""
+    p = grams.shape[1] - 1
+    solved = _solve_batch(grams, p, extra=column)
+    params, inverse = solved[:, :, 0], solved[:, column, 1]
+    ssr = grams[:, p, p] - np.einsum('bi,bi->b', grams[:, :p, p], params)
+    return params[:, column] / np.sqrt(ssr / (nobs - p) * inverse)
+
+
+def _bootstrap_task(seed_seq, replicates):
+    rng = np.random.default_rng(seed_seq)
+    blocks = _shared['blocks']
+    n_clusters, size = blocks.shape[0], int(np.sqrt(blocks.shape[1]))
+    # Draw clusters with replacement and count them per replicate in one bincount
+    draws = rng.integers(0, n_clusters, size=(replicates, n_clusters))
+    draws += np.arange(replicates)[:, None] * n_clusters
+    counts = np.bincount(draws.ravel(), minlength=replicates * n_clusters)
+    counts = counts.reshape(replicates, n_clusters).astype(float)
+    grams = (counts @ blocks).reshape(replicates, size, size)
+    return _solve_batch(grams, size - 1)[:, :, 0]
+
+
+def _permutation_task(seed_seq, replicates):
+    rng = np.random.default_rng(seed_seq)
+    z, gram, column = _shared['z'], _shared['gram'], _shared['column']
+    shuffled = rng.permuted(np.tile(z[:, column], (replicates, 1)), axis=1)
+    cross = shuffled @ z
+    # x'x is permutation invariant; every other entry in the row/column moves
+    cross[:, column] = gram[column, column]
+    grams = np.repeat(gram[None], replicates, axis=0)
+    grams[:, column, :] = cross
+    grams[:, :, column] = cross
+    return _t_statistics(grams, column, len(z))
+
+
+def _run(task, arrays, replicates, seed, workers):
+    """Split ``replicates`` into fixed-size seeded batches and gather the results."""
+    sizes = [REPLICATES_PER_TASK] * (replicates // REPLICATES_PER_TASK)
+    if replicates % REPLICATES_PER_TASK:
+        sizes.append(replicates % REPLICATES_PER_TASK)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    workers = min(workers or os.cpu_count() or 1, len(sizes))
+
+    if workers <= 1:
+        _init_worker(arrays)
+        return np.concatenate([task(s, n) for s, n in zip(seeds, sizes)])
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(arrays,)) as pool:
+        return np.concatenate(list(pool.map(task, seeds, sizes)))
+
+
+def _aligned(design, outcome, clusters=None):
+    columns = [design, outcome.rename('__outcome__')]
+    if clusters is not None:
+        columns.append(clusters.rename('__cluster__'))
+    data = pd.concat(columns, axis=1).dropna()
+    z = data[list(design.columns) + ['__outcome__']].to_numpy(dtype=float)
+    return data, z
+
+
+def cluster_bootstrap(design, outcome, clusters, replicates=10000, seed=0, workers=None):
+    """Resample whole clusters (e.g. games) and refit; returns one row of coefficients per replicate."""
+    data, z = _aligned(design, outcome, clusters)
+    codes, _ = pd.factorize(data['__cluster__'])
+    # Per-cluster Gram blocks: sum of z z' over each cluster's rows
+    outer = np.einsum('ni,nj->nij', z, z).reshape(len(z), -1)
+    blocks = np.zeros((codes.max() + 1, outer.shape[1]))
+    np.add.at(blocks, codes, outer)
+    draws = _run(_bootstrap_task, {'blocks': blocks}, replicates, seed, workers)
+    return pd.DataFrame(draws, columns=design.columns)
+
+
+def permutation_test(design, outcome, column, replicates=10000, seed=0, workers=None):
+    """Permutation test of one coefficient using its t-statistic.
+
+    Returns ``(observed_t, null_t, p_value)``; the two-sided p-value is
+    ``(1 + #{|t*| >= |t|}) / (replicates + 1)``.
+    """
+    _, z = _aligned(design, outcome)
+    index = list(design.columns).index(column)
+    gram = z.T @ z
+    arrays = {'z': z, 'gram': gram, 'column': index}
+    null = _run(_permutation_task, arrays, replicates, seed, workers)
+    observed = _t_statistics(gram[None], index, len(z))[0]
+    p_value = (1 + np.sum(np.abs(null) >= abs(observed))) / (replicates + 1)
+    return observed, null, p_value
+
+
+def bootstrap_summary(draws, observed, alpha=0.05):
+    """Bootstrap standard errors and percentile intervals next to the point estimates."""
+    return pd.DataFrame({
+        'coef': observed,
+        'boot_se': draws.std(ddof=1),
+        f'[{alpha / 2:g}': draws.quantile(alpha / 2),
+        f'{1 - alpha / 2:g}]': draws.quantile(1 - alpha / 2),
+    })
@@ -1,233 +1,404 @@
 #!/usr/bin/env python3
 """
 Multivariate Regression Analysis: Flagrant Fouls with Covariates
+
+Importable: load_games() and to_long_format() give the team-game frame the
+models use, fit_models() fits both models from one Gram matrix,
+fit_fixed_effects() absorbs team/opponent/season effects and fits the win
+logit, and main() prints the full report:
+
+    python run_multivariate_analysis.py [--data nba_flagrant_fouls.csv] [--replicates 10000]
+    python run_multivariate_analysis.py --absorb team opponent season
 """
 
-import pandas as pd
-import numpy as np
+import argparse
+import sys
 from pathlib import Path
-from statsmodels.formula.api import ols
-import statsmodels.api as sm
-from statsmodels.stats.outliers_influence import variance_inflation_factor
 import warnings
 warnings.filterwarnings('ignore')
 
-print("="*80)
-print("FLAGRANT FOULS MULTIVARIATE REGRESSION ANALYSIS")
-print("="*80)
-
-# Load data
-csv_file = Path('nba_flagrant_fouls.csv')
-games_with_data = pd.read_csv(csv_file)
-
-print(f"\nLoaded {len(games_with_data)} games from CSV")
-print(f"Columns: {games_with_data.columns.tolist()}")
-
-# Create long-format dataset
-# Home team observations
-home_cols = ['game_id', 'home_team', 'home_flagrants', 'home_score', 'away_score',
-             'home_rebounds', 'away_rebounds', 'home_assists', 'away_assists',
-             'home_turnovers', 'away_turnovers', 'home_ftm', 'away_ftm',
-             'home_inactive_players', 'away_inactive_players']
-home_data = games_with_data[home_cols].copy()
-home_data.columns = ['game_id', 'team_id', 'committed_flagrant', 'team_score', 'opp_score',
-                     'team_rebounds', 'opp_rebounds', 'team_assists', 'opp_assists',
-                     'team_turnovers', 'opp_turnovers', 'team_ftm', 'opp_ftm',
-                     'team_inactive', 'opp_inactive']
-home_data['location'] = 'home'
-
-# Away team observations
-away_cols = ['game_id', 'away_team', 'away_flagrants', 'away_score', 'home_score',
-             'away_rebounds', 'home_rebounds', 'away_assists', 'home_assists',
-             'away_turnovers', 'home_turnovers', 'away_ftm', 'home_ftm',
-             'away_inactive_players', 'home_inactive_players']
-away_data = games_with_data[away_cols].copy()
-away_data.columns = ['game_id', 'team_id', 'committed_flagrant', 'team_score', 'opp_score',
-                     'team_rebounds', 'opp_rebounds', 'team_assists', 'opp_assists',
-                     'team_turnovers', 'opp_turnovers', 'team_ftm', 'opp_ftm',
-                     'team_inactive', 'opp_inactive']
-away_data['location'] = 'away'
-
-# Combine
-df = pd.concat([home_data, away_data], ignore_index=True)
-
-# Create outcome variable
-df['point_differential'] = df['team_score'] - df['opp_score']
-
-# Create predictor variables
-df['committed_flagrant'] = (df['committed_flagrant'] > 0).astype(int)
-df['rebound_diff'] = df['team_rebounds'] - df['opp_rebounds']
-df['assist_diff'] = df['team_assists'] - df['opp_assists']
-df['turnover_diff'] = df['opp_turnovers'] - df['team_turnovers']  # Higher is better
-df['ft_diff'] = df['team_ftm'] - df['opp_ftm']
-df['inactive_diff'] = df['opp_inactive'] - df['team_inactive']  # Higher is better
-
-print(f"\nDataset shape: {df.shape}")
-print(f"Total team-game observations: {len(df)}")
-
-# Descriptive statistics
-print("\n" + "="*80)
-print("DESCRIPTIVE STATISTICS")
-print("="*80)
-
-print("\nOutcome variable:")
-print(df['point_differential'].describe())
-
-print("\nPredictor variables:")
-pred_vars = ['committed_flagrant', 'rebound_diff', 'assist_diff', 'turnover_diff', 'ft_diff', 'inactive_diff']
-print(df[pred_vars].describe())
-
-print("\nFlagrant foul distribution:")
-print(df['committed_flagrant'].value_counts())
-
-# Run regressions
-print("\n" + "="*80)
-print("REGRESSION MODELS")
-print("="*80)
-
-# Model 1: Simple (flagrant only)
-simple_model = ols('point_differential ~ committed_flagrant', data=df).fit()
-
-# Model 2: Multivariate (with all covariates)
-multi_model = ols('point_differential ~ committed_flagrant + rebound_diff + assist_diff + turnover_diff + ft_diff + inactive_diff + C(location)', data=df).fit()
-
-print("\n" + "-"*80)
-print("MODEL 1: SIMPLE (FLAGRANT ONLY)")
-print("-"*80)
-print(simple_model.summary())
-
-print("\n" + "-"*80)
-print("MODEL 2: MULTIVARIATE (WITH COVARIATES)")
-print("-"*80)
-print(multi_model.summary())
-
-# Model comparison
-print("\n" + "="*80)
-print("MODEL COMPARISON")
-print("="*80)
-
-print(f"\nSimple Model (flagrant only):")
-print(f"  R²: {simple_model.rsquared:.4f}")
-print(f"  Adj. R²: {simple_model.rsquared_adj:.4f}")
-print(f"  AIC: {simple_model.aic:.2f}")
-print(f"  BIC: {simple_model.bic:.2f}")
-
-print(f"\nMultivariate Model (with covariates):")
-print(f"  R²: {multi_model.rsquared:.4f}")
-print(f"  Adj. R²: {multi_model.rsquared_adj:.4f}")
-print(f"  AIC: {multi_model.aic:.2f}")
-print(f"  BIC: {multi_model.bic:.2f}")
-
-print(f"\nImprovement:")
-print(f"  ΔR²: +{multi_model.rsquared - simple_model.rsquared:.4f} ({((multi_model.rsquared - simple_model.rsquared)/simple_model.rsquared*100):.1f}% increase)")
-print(f"  ΔAIC: {simple_model.aic - multi_model.aic:.2f} (negative is better)")
-
-# F-test for model comparison
-from scipy.stats import f as f_dist
-f_stat = ((simple_model.ssr - multi_model.ssr) / (multi_model.df_model - simple_model.df_model)) / (multi_model.ssr / multi_model.df_resid)
-p_value = 1 - f_dist.cdf(f_stat, multi_model.df_model - simple_model.df_model, multi_model.df_resid)
-print(f"\nF-test (nested model comparison):")
-print(f"  F-statistic: {f_stat:.4f}")
-print(f"  P-value: {p_value:.4e}")
-print(f"  Result: Covariates {'significantly' if p_value < 0.05 else 'do not'} improve model (α = 0.05)")
-
-# Key findings
-print("\n" + "="*80)
-print("KEY FINDINGS")
-print("="*80)
-
-flagrant_coef_simple = simple_model.params['committed_flagrant']
-flagrant_pval_simple = simple_model.pvalues['committed_flagrant']
-flagrant_coef_multi = multi_model.params['committed_flagrant']
-flagrant_pval_multi = multi_model.pvalues['committed_flagrant']
-
-print(f"\n1. FLAGRANT FOUL EFFECT:")
-print(f"   Simple model:")
-print(f"     Coefficient: {flagrant_coef_simple:.4f} points")
-print(f"     P-value: {flagrant_pval_simple:.4f}")
-print(f"     Significant: {'YES' if flagrant_pval_simple < 0.05 else 'NO'}")
-
-print(f"\n   Multivariate model (controlling for covariates):")
-print(f"     Coefficient: {flagrant_coef_multi:.4f} points")
-print(f"     P-value: {flagrant_pval_multi:.4f}")
-print(f"     Significant: {'YES' if flagrant_pval_multi < 0.05 else 'NO'}")
-
-print(f"\n2. MOST SIGNIFICANT PREDICTORS:")
-sig_vars = [(var, multi_model.params[var], multi_model.pvalues[var])
-            for var in multi_model.params.index
-            if var != 'Intercept' and multi_model.pvalues[var] < 0.05]
-sig_vars.sort(key=lambda x: x[2])
-for var, coef, pval in sig_vars:
-    print(f"   - {var}: {coef:+.4f} points (p = {pval:.4e})")
-
-# Variance Inflation Factor
-print("\n" + "="*80)
-print("MULTICOLLINEARITY DIAGNOSTICS (VIF)")
-print("="*80)
-
-X_vif = df[['committed_flagrant', 'rebound_diff', 'assist_diff', 'turnover_diff', 'ft_diff', 'inactive_diff']].dropna()
-vif_data = pd.DataFrame()
-vif_data["Variable"] = X_vif.columns
-vif_data["VIF"] = [variance_inflation_factor(X_vif.values, i) for i in range(X_vif.shape[1])]
-print("\n" + vif_data.to_string(index=False))
-print("\nInterpretation: VIF > 5 indicates multicollinearity concern, VIF > 10 is serious")
-
-# Correlation matrix
-print("\n" + "="*80)
-print("CORRELATION MATRIX")
-print("="*80)
-corr_vars = ['point_differential', 'committed_flagrant', 'rebound_diff', 'assist_diff', 'turnover_diff', 'ft_diff', 'inactive_diff']
-corr_matrix = df[corr_vars].corr()
-print("\n" + corr_matrix.to_string())
-
-# Results table
-print("\n" + "="*80)
-print("MULTIVARIATE REGRESSION COEFFICIENTS TABLE")
-print("="*80)
-
-results_data = []
-for var in multi_model.params.index:
-    if var == 'Intercept':
-        continue
-    coef = multi_model.params[var]
-    se = multi_model.bse[var]
-    pval = multi_model.pvalues[var]
-    ci = multi_model.conf_int().loc[var]
-
-    results_data.append({
-        'Variable': var,
-        'Coefficient': f"{coef:.4f}",
-        'Std. Error': f"{se:.4f}",
-        '95% CI': f"[{ci[0]:.4f}, {ci[1]:.4f}]",
-        'P-value': f"{pval:.4f}",
-        'Sig': '***' if pval < 0.001 else '**' if pval < 0.01 else '*' if pval < 0.05 else ''
-    })
-
-results_df = pd.DataFrame(results_data)
-print("\n" + results_df.to_string(index=False))
-print("\nSignificance: *** p<0.001, ** p<0.01, * p<0.05")
-
-# Final summary
-print("\n" + "="*80)
-print("SUMMARY")
-print("="*80)
-
-print(f"\nData: {len(games_with_data)} games, {len(df)} team-game observations")
-print(f"Games with flagrants: {df['committed_flagrant'].sum()}")
-print(f"Games without flagrants: {(1-df['committed_flagrant']).sum()}")
-
-print(f"\nMultivariate Model Performance:")
-print(f"  R² = {multi_model.rsquared:.4f} ({multi_model.rsquared*100:.1f}% of variance explained)")
-print(f"  Adjusted R² = {multi_model.rsquared_adj:.4f}")
-print(f"  F-statistic = {multi_model.fvalue:.4f} (p < 0.001)")
-
-print(f"\nFlagrant Foul Impact (controlling for all covariates):")
-print(f"  Effect: {flagrant_coef_multi:.4f} points")
-print(f"  95% CI: [{multi_model.conf_int().loc['committed_flagrant'][0]:.4f}, {multi_model.conf_int().loc['committed_flagrant'][1]:.4f}]")
-print(f"  P-value: {flagrant_pval_multi:.4f}")
-print(f"  Conclusion: Flagrant fouls are {'significantly' if flagrant_pval_multi < 0.05 else 'not significantly'} associated with point differential")
-print(f"              after controlling for rebounds, assists, turnovers, free throws, injuries, and home/away status.")
-
-print("\n" + "="*80)
-print("END OF ANALYSIS")
-print("="*80)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from nba_data.lazy import lazy_import
+
+# Heavy dependencies load on first use, so --help and imports stay cheap
+pd = lazy_import('pandas')
+gram_ols = lazy_import('gram_ols')
+resampling = lazy_import('resampling')
+fixed_effects = lazy_import('fixed_effects')
+
+RESAMPLING_REPLICATES = 10000
+RESAMPLING_SEED = 0
+
+PRED_VARS = ['committed_flagrant', 'rebound_diff', 'assist_diff', 'turnover_diff', 'ft_diff', 'inactive_diff']
+CORR_VARS = ['point_differential'] + PRED_VARS
+
+# --absorb choices -> team-game columns swept out of the fixed-effects models
+ABSORB_COLUMNS = {'team': 'team_id', 'opponent': 'opp_id', 'season': 'season'}
+
+_LONG_COLUMNS = ['game_id', 'season', 'team_id', 'opp_id', 'committed_flagrant', 'team_score', 'opp_score',
+                 'team_rebounds', 'opp_rebounds', 'team_assists', 'opp_assists',
+                 'team_turnovers', 'opp_turnovers', 'team_ftm', 'opp_ftm',
+                 'team_inactive', 'opp_inactive']
+
+
+def default_data_path():
+    """Partitioned Parquet if it has been converted, otherwise the CSV."""
+    parquet_dir = Path('nba_flagrant_fouls.parquet')
+    return parquet_dir if parquet_dir.exists() else Path('nba_flagrant_fouls.csv')
+
+
+def load_games(path=None):
+    from nba_data.storage import load_flagrant_games
+
+    return load_flagrant_games(path or default_data_path())
+
+
+def to_long_format(games_with_data):
+    """One row per team-game with the outcome and predictor columns."""
+    if 'season' not in games_with_data.columns:
+        from nba_data.storage import season_from_game_id
+
+        # The season is in the first five digits; map each distinct prefix once
+        codes, prefixes = pd.factorize(games_with_data['game_id'].str[:5])
+        season_codes, seasons = pd.factorize([season_from_game_id(prefix + '00000') for prefix in prefixes])
+        games_with_data = games_with_data.assign(season=pd.Categorical.from_codes(season_codes[codes], seasons))
+
+    # Home team observations
+    home_cols = ['game_id', 'season', 'home_team', 'away_team', 'home_flagrants', 'home_score', 'away_score',
+                 'home_rebounds', 'away_rebounds', 'home_assists', 'away_assists',
+                 'home_turnovers', 'away_turnovers', 'home_ftm', 'away_ftm',
+                 'home_inactive_players', 'away_inactive_players']
+    home_data = games_with_data[home_cols].copy()
+    home_data.columns = _LONG_COLUMNS
+    home_data['location'] = 'home'
+
+    # Away team observations
+    away_cols = ['game_id', 'season', 'away_team', 'home_team', 'away_flagrants', 'away_score', 'home_score',
+                 'away_rebounds', 'home_rebounds', 'away_assists', 'home_assists',
+                 'away_turnovers', 'home_turnovers', 'away_ftm', 'home_ftm',
+                 'away_inactive_players', 'home_inactive_players']
+    away_data = games_with_data[away_cols].copy()
+    away_data.columns = _LONG_COLUMNS
+    away_data['location'] = 'away'
+
+    # Combine
+    df = pd.concat([home_data, away_data], ignore_index=True)
+
+    # Create outcome variables
+    df['point_differential'] = df['team_score'] - df['opp_score']
+    df['win'] = (df['point_differential'] > 0).astype(int)
+
+    # Create predictor variables
+    df['committed_flagrant'] = (df['committed_flagrant'] > 0).astype(int)
+    df['rebound_diff'] = df['team_rebounds'] - df['opp_rebounds']
+    df['assist_diff'] = df['team_assists'] - df['opp_assists']
+    df['turnover_diff'] = df['opp_turnovers'] - df['team_turnovers']  # Higher is better
+    df['ft_diff'] = df['team_ftm'] - df['opp_ftm']
+    df['inactive_diff'] = df['opp_inactive'] - df['team_inactive']  # Higher is better
+    return df
+
+
+def model_predictors(df):
+    """PRED_VARS, less inactive_diff when no game in ``df`` has inactive counts.
+
+    Games extracted with ``--box-source game-logs`` have none, so a dataset
+    made only of them is modelled without that covariate.
+    """
+    if df['inactive_diff'].isna().all():
+        return [var for var in PRED_VARS if var != 'inactive_diff']
+    return PRED_VARS
+
+
+def fit_models(df, predictors=PRED_VARS):
+    """Fit the simple and multivariate models; returns ``(gram, design, simple, multi)``.
+
+    One design matrix and one factorization serve both models: the simple
+    model's regressors (Intercept, committed_flagrant) are its leading columns.
+    """
+    design = gram_ols.design_matrix(df, predictors, categorical={'location': 'away'})
+    gram = gram_ols.GramOLS(design, df['point_differential'])
+    return gram, design, gram.fit(2), gram.fit()
+
+
+def fit_fixed_effects(df, absorb=tuple(ABSORB_COLUMNS), predictors=PRED_VARS):
+    """Point differential with ``absorb`` effects swept out, and the win logit; returns ``(fe, logit)``.
+
+    Both cluster standard errors by game, whose home and away rows mirror
+    each other.
+    """
+    columns = [ABSORB_COLUMNS[name] for name in absorb]
+    fe = fixed_effects.fit_absorbed(df, 'point_differential', predictors, columns,
+                                    categorical={'location': 'away'}, cluster='game_id') if columns else None
+    logit = fixed_effects.fit_logit(df, 'win', predictors, absorb=columns,
+                                    categorical={'location': 'away'}, cluster='game_id')
+    return fe, logit
+
+
+def print_descriptives(df, predictors=PRED_VARS):
+    print("\n" + "="*80)
+    print("DESCRIPTIVE STATISTICS")
+    print("="*80)
+
+    print("\nOutcome variable:")
+    print(df['point_differential'].describe())
+
+    print("\nPredictor variables:")
+    print(df[predictors].describe())
+
+    print("\nFlagrant foul distribution:")
+    print(df['committed_flagrant'].value_counts())
+
+
+def print_model_comparison(gram, simple_model, multi_model):
+    print("\n" + "="*80)
+    print("MODEL COMPARISON")
+    print("="*80)
+
+    print(f"\nSimple Model (flagrant only):")
+    print(f"  R²: {simple_model.rsquared:.4f}")
+    print(f"  Adj. R²: {simple_model.rsquared_adj:.4f}")
+    print(f"  AIC: {simple_model.aic:.2f}")
+    print(f"  BIC: {simple_model.bic:.2f}")
+
+    print(f"\nMultivariate Model (with covariates):")
+    print(f"  R²: {multi_model.rsquared:.4f}")
+    print(f"  Adj. R²: {multi_model.rsquared_adj:.4f}")
+    print(f"  AIC: {multi_model.aic:.2f}")
+    print(f"  BIC: {multi_model.bic:.2f}")
+
+    print(f"\nImprovement:")
+    print(f"  ΔR²: +{multi_model.rsquared - simple_model.rsquared:.4f} ({((multi_model.rsquared - simple_model.rsquared)/simple_model.rsquared*100):.1f}% increase)")
+    print(f"  ΔAIC: {simple_model.aic - multi_model.aic:.2f} (negative is better)")
+
+    # F-test for model comparison
+    f_stat, p_value = gram.f_test(simple_model, multi_model)
+    print(f"\nF-test (nested model comparison):")
+    print(f"  F-statistic: {f_stat:.4f}")
+    print(f"  P-value: {p_value:.4e}")
+    print(f"  Result: Covariates {'significantly' if p_value < 0.05 else 'do not'} improve model (α = 0.05)")
+
+
+def print_key_findings(simple_model, multi_model):
+    print("\n" + "="*80)
+    print("KEY FINDINGS")
+    print("="*80)
+
+    print(f"\n1. FLAGRANT FOUL EFFECT:")
+    print(f"   Simple model:")
+    print(f"     Coefficient: {simple_model.params['committed_flagrant']:.4f} points")
+    print(f"     P-value: {simple_model.pvalues['committed_flagrant']:.4f}")
+    print(f"     Significant: {'YES' if simple_model.pvalues['committed_flagrant'] < 0.05 else 'NO'}")
+
+    print(f"\n   Multivariate model (controlling for covariates):")
+    print(f"     Coefficient: {multi_model.params['committed_flagrant']:.4f} points")
+    print(f"     P-value: {multi_model.pvalues['committed_flagrant']:.4f}")
+    print(f"     Significant: {'YES' if multi_model.pvalues['committed_flagrant'] < 0.05 else 'NO'}")
+
+    print(f"\n2. MOST SIGNIFICANT PREDICTORS:")
+    sig_vars = [(var, multi_model.params[var], multi_model.pvalues[var])
+                for var in multi_model.params.index
+                if var != 'Intercept' and multi_model.pvalues[var] < 0.05]
+    sig_vars.sort(key=lambda x: x[2])
+    for var, coef, pval in sig_vars:
+        print(f"   - {var}: {coef:+.4f} points (p = {pval:.4e})")
+
+
+def print_diagnostics(gram, predictors=PRED_VARS):
+    # Variance Inflation Factor
+    print("\n" + "="*80)
+    print("MULTICOLLINEARITY DIAGNOSTICS (VIF)")
+    print("="*80)
+
+    vif_data = pd.DataFrame()
+    vif_data["Variable"] = predictors
+    # Uncentered (no constant), as the original statsmodels report computed it
+    vif_data["VIF"] = gram.vif(predictors, centered=False).values
+    print("\n" + vif_data.to_string(index=False))
+    print("\nInterpretation: VIF > 5 indicates multicollinearity concern, VIF > 10 is serious")
+
+    # Correlation matrix
+    print("\n" + "="*80)
+    print("CORRELATION MATRIX")
+    print("="*80)
+    print("\n" + gram.corr(['point_differential'] + predictors).to_string())
+
+
+def coefficient_table(model):
+    """Formatted coefficient rows (excluding the intercept) for the report."""
+    ci = model.conf_int()
+    results_data = []
+    for var in model.params.index:
+        if var == 'Intercept':
+            continue
+        pval = model.pvalues[var]
+        results_data.append({
+            'Variable': var,
+            'Coefficient': f"{model.params[var]:.4f}",
+            'Std. Error': f"{model.bse[var]:.4f}",
+            '95% CI': f"[{ci.loc[var, 0]:.4f}, {ci.loc[var, 1]:.4f}]",
+            'P-value': f"{pval:.4f}",
+            'Sig': '***' if pval < 0.001 else '**' if pval < 0.01 else '*' if pval < 0.05 else ''
+        })
+    return pd.DataFrame(results_data)
+
+
+def print_resampling(df, design, multi_model, replicates, seed, workers=None):
+    # Resampling inference: the OLS p-value treats the home and away rows of a
+    # game as independent, so check it against a game-level cluster bootstrap
+    # and a permutation test of committed_flagrant
+    print("\n" + "="*80)
+    print("RESAMPLING INFERENCE (FLAGRANT EFFECT)")
+    print("="*80)
+
+    outcome = df['point_differential']
+    boot_draws = resampling.cluster_bootstrap(design, outcome, df['game_id'],
+                                              replicates=replicates, seed=seed, workers=workers)
+    boot = resampling.bootstrap_summary(boot_draws, multi_model.params)
+    flagrant_boot = boot.loc['committed_flagrant']
+    t_obs, t_null, perm_pval = resampling.permutation_test(design, outcome, 'committed_flagrant',
+                                                           replicates=replicates, seed=seed, workers=workers)
+
+    print(f"\nCluster bootstrap by game_id ({replicates} replicates, seed {seed}):")
+    print("\n" + boot.to_string(float_format=lambda v: f"{v:.4f}"))
+    print(f"\n  committed_flagrant: OLS SE {multi_model.bse['committed_flagrant']:.4f} vs cluster bootstrap SE {flagrant_boot['boot_se']:.4f}")
+    print(f"  Percentile 95% CI: [{flagrant_boot.iloc[2]:.4f}, {flagrant_boot.iloc[3]:.4f}]")
+    print(f"\nPermutation test of committed_flagrant ({replicates} permutations):")
+    print(f"  Observed t: {t_obs:.4f}")
+    print(f"  Permutation p-value: {perm_pval:.4f} (OLS p-value {multi_model.pvalues['committed_flagrant']:.4f})")
+
+
+def print_fixed_effects(df, multi_model, absorb, predictors=PRED_VARS):
+    fe_model, logit_model = fit_fixed_effects(df, absorb, predictors)
+    absorbed = ', '.join(absorb) or 'none'
+
+    if fe_model is not None:
+        print("\n" + "="*80)
+        print(f"FIXED-EFFECTS MODEL (ABSORBING {absorbed.upper()})")
+        print("="*80)
+        print("\n" + fe_model.summary(title=f'Within OLS, point_differential (absorbed: {absorbed})'))
+        print(f"\n  committed_flagrant: pooled {multi_model.params['committed_flagrant']:+.4f} points "
+              f"vs within {fe_model.params['committed_flagrant']:+.4f} points "
+              f"(cluster SE {fe_model.bse['committed_flagrant']:.4f}, p = {fe_model.pvalues['committed_flagrant']:.4f})")
+
+    print("\n" + "="*80)
+    print("WIN PROBABILITY (LOGIT)")
+    print("="*80)
+    print("\n" + logit_model.summary(title=f'Logit, win (fixed effects: {absorbed})'))
+    odds = logit_model.odds_ratios().loc['committed_flagrant']
+    effect = logit_model.marginal_effects()['committed_flagrant']
+    print(f"\n  committed_flagrant: odds ratio {odds['odds_ratio']:.4f} [{odds['[0.025']:.4f}, {odds['0.975]']:.4f}]")
+    print(f"  Average marginal effect on win probability: {effect:+.4f} ({effect*100:+.1f} percentage points)")
+
+
+def print_summary(games_with_data, df, multi_model):
+    print("\n" + "="*80)
+    print("SUMMARY")
+    print("="*80)
+
+    print(f"\nData: {len(games_with_data)} games, {len(df)} team-game observations")
+    print(f"Games with flagrants: {df['committed_flagrant'].sum()}")
+    print(f"Games without flagrants: {(1-df['committed_flagrant']).sum()}")
+
+    print(f"\nMultivariate Model Performance:")
+    print(f"  R² = {multi_model.rsquared:.4f} ({multi_model.rsquared*100:.1f}% of variance explained)")
+    print(f"  Adjusted R² = {multi_model.rsquared_adj:.4f}")
+    print(f"  F-statistic = {multi_model.fvalue:.4f} (p < 0.001)")
+
+    ci = multi_model.conf_int().loc['committed_flagrant']
+    flagrant_pval_multi = multi_model.pvalues['committed_flagrant']
+    print(f"\nFlagrant Foul Impact (controlling for all covariates):")
+    print(f"  Effect: {multi_model.params['committed_flagrant']:.4f} points")
+    print(f"  95% CI: [{ci[0]:.4f}, {ci[1]:.4f}]")
+    print(f"  P-value: {flagrant_pval_multi:.4f}")
+    print(f"  Conclusion: Flagrant fouls are {'significantly' if flagrant_pval_multi < 0.05 else 'not significantly'} associated with point differential")
+    print(f"              after controlling for rebounds, assists, turnovers, free throws, injuries, and home/away status.")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Multivariate regression of point differential on flagrant fouls.')
+    parser.add_argument('--data', type=Path, help='Games CSV or Parquet directory (default: Parquet if present, else CSV).')
+    parser.add_argument('--replicates', type=int, default=RESAMPLING_REPLICATES, help='Bootstrap/permutation replicates (0 to skip).')
+    parser.add_argument('--seed', type=int, default=RESAMPLING_SEED, help='Resampling seed.')
+    parser.add_argument('--workers', type=int, help='Resampling worker processes (default: CPU count).')
+    parser.add_argument('--absorb', nargs='*', choices=list(ABSORB_COLUMNS), default=list(ABSORB_COLUMNS),
+                        help='Fixed effects for the within and logit models (default: all; none for a pooled logit only).')
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    args = parse_args(argv)
+
+    print("="*80)
+    print("FLAGRANT FOULS MULTIVARIATE REGRESSION ANALYSIS")
+    print("="*80)
+
+    data_path = args.data or default_data_path()
+    games_with_data = load_games(data_path)
+
+    print(f"\nLoaded {len(games_with_data)} games from {data_path}")
+    print(f"Columns: {games_with_data.columns.tolist()}")
+
+    df = to_long_format(games_with_data)
+
+    # Games extracted with --box-source game-logs have no inactive counts
+    predictors = model_predictors(df)
+    if predictors != PRED_VARS:
+        print("\nNo game has inactive player counts (extracted with --box-source game-logs); "
+              "inactive_diff is left out of every model")
+    incomplete = df[predictors].isna().any(axis=1)
+    if incomplete.any():
+        print(f"Dropping {int(incomplete.sum())} team-game rows with missing covariates")
+        df = df[~incomplete].reset_index(drop=True)
+    if len(df) <= len(predictors) + 2:
+        print(f"\nOnly {len(df)} team-game rows have every covariate ({', '.join(predictors)}); "
+              "too few to fit the models.")
+        return 1
+
+    print(f"\nDataset shape: {df.shape}")
+    print(f"Total team-game observations: {len(df)}")
+
+    print_descriptives(df, predictors)
+
+    # Run regressions
+    print("\n" + "="*80)
+    print("REGRESSION MODELS")
+    print("="*80)
+
+    gram, design, simple_model, multi_model = fit_models(df, predictors)
+
+    print("\n" + "-"*80)
+    print("MODEL 1: SIMPLE (FLAGRANT ONLY)")
+    print("-"*80)
+    print(simple_model.summary())
+
+    print("\n" + "-"*80)
+    print("MODEL 2: MULTIVARIATE (WITH COVARIATES)")
+    print("-"*80)
+    print(multi_model.summary())
+
+    print_model_comparison(gram, simple_model, multi_model)
+    print_key_findings(simple_model, multi_model)
+    print_diagnostics(gram, predictors)
+
+    # Results table
+    print("\n" + "="*80)
+    print("MULTIVARIATE REGRESSION COEFFICIENTS TABLE")
+    print("="*80)
+    print("\n" + coefficient_table(multi_model).to_string(index=False))
+    print("\nSignificance: *** p<0.001, ** p<0.01, * p<0.05")
+
+    if args.replicates:
+        print_resampling(df, design, multi_model, args.replicates, args.seed, args.workers)
+
+    print_fixed_effects(df, multi_model, args.absorb, predictors)
+
+    print_summary(games_with_data, df, multi_model)
+
+    print("\n" + "="*80)
+    print("END OF ANALYSIS")
+    print("="*80)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main(sys.argv[1:]))
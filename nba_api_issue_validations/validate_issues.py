@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Re-validate every nba_api issue in this folder with one command.
+
+Each check is registered with ``@issue_check``. It declares the endpoint
+requests it needs and returns a list of ``expect(...)`` assertions. The
+runner:
+
+* discovers checks, both the ones below (ported from the issue notebooks)
+  and any ``test_issue_*.py`` module in this folder that registers its own;
+* merges identical requests across checks, keyed by endpoint plus wire
+  parameters, so each one is sent once;
+* fetches them concurrently over ``nba_data.FetchSession``, from the live
+  API, a stats server, or a recordings directory served by
+  ``nba_data.standin``;
+* runs each check on the shared responses and writes a JSON report.
+
+Usage:
+    uv run python3 nba_api_issue_validations/validate_issues.py --recordings fixtures --record   # capture once
+    uv run python3 nba_api_issue_validations/validate_issues.py --recordings fixtures            # offline
+    uv run python3 nba_api_issue_validations/validate_issues.py --issues 595 602 --report report.json
+
+The exit status is 0 only if every selected check passes.
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import sys
+import time
+import traceback
+import warnings
+from dataclasses import dataclass
+from datetime import datetime
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+import nba_data
+from nba_data.cache import cache_key
+
+DEFAULT_REPORT = HERE / "validation_report.json"
+
+Assertion = Dict[str, Any]
+
+
+@dataclass(frozen=True)
+class EndpointRequest:
+    """An nba_api endpoint call, named as ``module.Class`` so nba_api loads lazily."""
+
+    endpoint: str
+    params: Tuple[Tuple[str, Any], ...] = ()
+
+    def resolve(self) -> Tuple[type, Dict[str, Any]]:
+        module, cls = self.endpoint.split(".")
+        return getattr(importlib.import_module(f"nba_api.stats.endpoints.{module}"), cls), dict(self.params)
+
+
+@dataclass(frozen=True)
+class IssueCheck:
+    name: str
+    issue: int
+    title: str
+    requests: Tuple[EndpointRequest, ...]
+    func: Callable[..., List[Assertion]]
+
+
+ISSUE_CHECKS: Dict[str, IssueCheck] = {}
+
+
+def request(endpoint: str, **params: Any) -> EndpointRequest:
+    return EndpointRequest(endpoint, tuple(sorted(params.items())))
+
+
+def issue_check(issue: int, title: str, *requests: EndpointRequest):
+    """Register a check; it is called with one loaded endpoint per request."""
+    def register(func: Callable[..., List[Assertion]]) -> Callable[..., List[Assertion]]:
+        ISSUE_CHECKS[func.__name__] = IssueCheck(func.__name__, issue, title, requests, func)
+        return func
+    return register
+
+
+def expect(description: str, passed: bool, detail: Any = None) -> Assertion:
+    return {"description": description, "passed": bool(passed), "detail": detail}
+
+
+def discover() -> Dict[str, IssueCheck]:
+    """Import every ``test_issue_*.py`` module here so its checks register."""
+    if str(HERE) not in sys.path:
+        sys.path.insert(0, str(HERE))
+    for path in sorted(HERE.glob("test_issue_*.py")):
+        importlib.import_module(path.stem)
+    # Run as a script this file is __main__, while the test_issue_* modules
+    # register with the importable ``validate_issues``; read that registry
+    return importlib.import_module("validate_issues").ISSUE_CHECKS
+
+
+# -- Checks ported from the issue notebooks ----------------------------------
+
+@issue_check(
+    98,
+    "get_data_frames() works on the shot location endpoints",
+    request("leaguedashteamshotlocations.LeagueDashTeamShotLocations",
+            team_id_nullable=1610612737, season="2024-25", season_type_all_star="Regular Season"),
+    request("leaguedashplayershotlocations.LeagueDashPlayerShotLocations",
+            season="2024-25", season_type_all_star="Regular Season"),
+)
+def shot_location_data_frames(team_shots, player_shots) -> List[Assertion]:
+    assertions = []
+    for label, endpoint in (("LeagueDashTeamShotLocations", team_shots), ("LeagueDashPlayerShotLocations", player_shots)):
+        frames = endpoint.get_data_frames()
+        assertions.append(expect(f"{label}.get_data_frames() returns a DataFrame", len(frames) > 0, len(frames)))
+        assertions.append(expect(f"{label} first frame has rows", bool(frames) and len(frames[0]) > 0,
+                                 list(frames[0].shape) if frames else None))
+    return assertions
+
+
+@issue_check(
+    596,
+    "ScoreboardV2 warns about its deprecation; ScoreboardV3 returns line scores",
+    request("scoreboardv3.ScoreboardV3", game_date="2025-10-22"),
+    request("scoreboardv3.ScoreboardV3", game_date="2024-10-22"),
+)
+def scoreboard_deprecation(scoreboard_2025, scoreboard_2024) -> List[Assertion]:
+    from nba_api.stats.endpoints.scoreboardv2 import ScoreboardV2
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        ScoreboardV2(game_date="2025-10-22", get_request=False)
+    deprecations = [str(warning.message) for warning in caught if issubclass(warning.category, DeprecationWarning)]
+    assertions = [expect("ScoreboardV2 raises a DeprecationWarning", deprecations, deprecations[:1])]
+    for season, scoreboard in (("2025-26", scoreboard_2025), ("2024-25", scoreboard_2024)):
+        games = scoreboard.get_dict().get("scoreboard", {}).get("games", [])
+        line_scores = scoreboard.line_score.get_dict()["data"]
+        assertions.append(expect(f"ScoreboardV3 {season} returns games", games, len(games)))
+        assertions.append(expect(f"ScoreboardV3 {season} returns line scores", line_scores, len(line_scores)))
+    return assertions
+
+
+@issue_check(
+    602,
+    "BoxScoreTraditionalV3 normalized methods return data",
+    request("boxscoretraditionalv3.BoxScoreTraditionalV3", game_id="0022500053"),
+)
+def boxscore_normalized_methods(box_score) -> List[Assertion]:
+    normalized = box_score.get_normalized_dict()
+    normalized_json = box_score.get_normalized_json()
+    frames = box_score.get_data_frames()
+    return [
+        expect("get_dict() returns data", box_score.get_dict(), sorted(box_score.get_dict())),
+        expect("get_json() returns data", box_score.get_json(), len(box_score.get_json())),
+        expect("get_normalized_dict() returns data", normalized, sorted(normalized) if normalized else None),
+        expect("get_normalized_json() parses to data", normalized_json and json.loads(normalized_json),
+               len(normalized_json or "")),
+        expect("get_data_frames() returns frames with rows", frames and len(frames[0]) > 0,
+               [list(frame.shape) for frame in frames]),
+    ]
+
+
+# -- Runner -------------------------------------------------------------------
+
+def plan_requests(checks: List[IssueCheck]) -> Tuple[Dict[str, Tuple[type, Dict[str, Any]]], Dict[str, List[str]]]:
+    """Map each distinct request to its cache key, and each check to its keys.
+
+    Requests are compared on the parameters nba_api would send, so two
+    spellings of the same call (``LeagueDashLineups()`` and
+    ``LeagueDashLineups(league_id_nullable="00")``) are fetched once.
+    """
+    unique: Dict[str, Tuple[type, Dict[str, Any]]] = {}
+    keys: Dict[str, List[str]] = {}
+    for check in checks:
+        keys[check.name] = []
+        for endpoint_request in check.requests:
+            cls, kwargs = endpoint_request.resolve()
+            probe = cls(**kwargs, get_request=False)
+            key = cache_key(probe.endpoint, probe.parameters)
+            unique.setdefault(key, (cls, kwargs))
+            keys[check.name].append(key)
+    return unique, keys
+
+
+def request_error(response: Any) -> Optional[str]:
+    """Why a fetched request is unusable, or None.
+
+    Non-retryable HTTP errors (a 404 for a missing recording, say) come back
+    as loaded endpoints, so the status code is checked as well.
+    """
+    if isinstance(response, Exception):
+        return f"{type(response).__name__}: {response}"
+    status_code = getattr(response.nba_response, "_status_code", None)
+    if status_code is not None and status_code >= 400:
+        return f"HTTP {status_code} from {response.nba_response.get_url()}"
+    return None
+
+
+def evaluate(check: IssueCheck, responses: List[Any]) -> Dict[str, Any]:
+    result = {"check": check.name, "issue": check.issue, "title": check.title, "status": None, "assertions": [], "error": None}
+    errors = [error for error in map(request_error, responses) if error]
+    if errors:
+        result["status"] = "error"
+        result["error"] = f"request failed: {errors[0]}"
+        return result
+    try:
+        result["assertions"] = check.func(*responses)
+    except Exception as exc:
+        result["status"] = "error"
+        result["error"] = f"{type(exc).__name__}: {exc}"
+        result["traceback"] = traceback.format_exc()
+        return result
+    result["status"] = "pass" if all(assertion["passed"] for assertion in result["assertions"]) else "fail"
+    return result
+
+
+def validate(checks: List[IssueCheck], concurrency: int = 8) -> Dict[str, Any]:
+    """Fetch every distinct request once, concurrently, then run the checks."""
+    started = time.perf_counter()
+    with warnings.catch_warnings():
+        # Probing deprecated endpoints would otherwise warn once per request
+        warnings.simplefilter("ignore", DeprecationWarning)
+        unique, keys = plan_requests(checks)
+        with nba_data.FetchSession(concurrency) as session:
+            responses = dict(zip(unique, session.fetch_all(unique.values())))
+    results = [evaluate(check, [responses[key] for key in keys[check.name]]) for check in checks]
+
+    try:
+        nba_api_version = version("nba_api")
+    except PackageNotFoundError:
+        nba_api_version = None
+    return {
+        "nba_api_version": nba_api_version,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "seconds": round(time.perf_counter() - started, 3),
+        "requests": {
+            "declared": sum(len(check_keys) for check_keys in keys.values()),
+            "unique": len(unique),
+            "failed": sum(request_error(response) is not None for response in responses.values()),
+        },
+        "summary": {status: sum(result["status"] == status for result in results) for status in ("pass", "fail", "error")},
+        "checks": results,
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    requests = report["requests"]
+    print(f"nba_api {report['nba_api_version']}: {len(report['checks'])} check(s), "
+          f"{requests['unique']} unique request(s) for {requests['declared']} declared, {report['seconds']:.2f}s")
+    for result in report["checks"]:
+        print(f"  [{result['status'].upper():<5}] #{result['issue']:<4} {result['check']}: {result['title']}")
+        for assertion in result["assertions"]:
+            if not assertion["passed"]:
+                print(f"           failed: {assertion['description']} ({assertion['detail']})")
+        if result["error"]:
+            print(f"           {result['error']}")
+    summary = report["summary"]
+    print(f"Passed {summary['pass']} | Failed {summary['fail']} | Errors {summary['error']}")
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Re-run every nba_api issue validation and report pass/fail.")
+    parser.add_argument("--issues", nargs="+", type=int, help="Only these issue numbers (default: all).")
+    parser.add_argument("--list", action="store_true", help="List the discovered checks and exit.")
+    parser.add_argument("--recordings", type=Path, help="Serve responses from this nba_data.standin recording directory.")
+    parser.add_argument("--record", action="store_true", help="With --recordings, fetch missing responses live and save them.")
+    parser.add_argument("--stats-server", help="Stats API base URL (default: $NBA_STATS_SERVER or the live API).")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight at once.")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the local response cache (always bypassed with --recordings).")
+    parser.add_argument("--report", type=Path, default=DEFAULT_REPORT, help="JSON report path.")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    checks = [check for check in discover().values() if not args.issues or check.issue in args.issues]
+    if args.list:
+        for check in sorted(checks, key=lambda check: check.issue):
+            print(f"#{check.issue:<4} {check.name}: {check.title} ({len(check.requests)} request(s))")
+        return 0
+    if not checks:
+        print("No checks selected.")
+        return 1
+
+    if args.no_cache or args.recordings:
+        # Recordings must see every request: a cache hit would neither be
+        # saved by --record nor check the recorded response on replay
+        nba_data.configure_cache(enabled=False)
+    server = None
+    if args.recordings:
+        from nba_data.standin import DEFAULT_UPSTREAM, RecordingStore, StandInServer
+
+        server = StandInServer(RecordingStore(args.recordings), port=0, upstream=DEFAULT_UPSTREAM if args.record else None)
+        server.start()
+        nba_data.configure_stats_server(server.base_url)
+        if not args.record:
+            # Replaying local files: the live API's spacing does not apply
+            nba_data.configure_rate_limiter(calls_per_hour=1e9, min_interval=0)
+    else:
+        nba_data.configure_stats_server(args.stats_server)
+
+    try:
+        report = validate(sorted(checks, key=lambda check: (check.issue, check.name)), args.concurrency)
+    finally:
+        if server is not None:
+            server.stop()
+    print_report(report)
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    args.report.write_text(json.dumps(report, indent=2, default=str) + "\n", encoding="utf-8")
+    print(f"Report written to {args.report}")
+    return 0 if report["summary"]["pass"] == len(report["checks"]) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
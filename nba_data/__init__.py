@@ -0,0 +1,47 @@
+"""
+Shared NBA stats fetching helpers used by the ballhog and flagrant_fouls workflows.
+
+Names are resolved on first access, so ``import nba_data`` (or importing a
+single submodule such as ``nba_data.journal``) does not pull in requests or
+nba_api until a fetch helper is actually used.
+"""
+import importlib
+
+_EXPORTS = {
+    "AsyncFetcher": "nba_data.aio",
+    "ExtractionJournal": "nba_data.journal",
+    "GameCatalog": "nba_data.catalog",
+    "FetchSession": "nba_data.aio",
+    "PipelineMetrics": "nba_data.metrics",
+    "RateLimiter": "nba_data.ratelimit",
+    "ResponseCache": "nba_data.cache",
+    "TRANSIENT_ERRORS": "nba_data.client",
+    "TransientHTTPError": "nba_data.client",
+    "cache_key": "nba_data.cache",
+    "configure_cache": "nba_data.client",
+    "configure_metrics": "nba_data.metrics",
+    "configure_rate_limiter": "nba_data.client",
+    "configure_stats_server": "nba_data.client",
+    "fetch": "nba_data.client",
+    "fetch_counts": "nba_data.client",
+    "fetch_player_game_logs": "nba_data.client",
+    "fetch_team_game_logs": "nba_data.client",
+    "get_cache": "nba_data.client",
+    "get_metrics": "nba_data.metrics",
+    "get_rate_limiter": "nba_data.client",
+    "lazy_import": "nba_data.lazy",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'nba_data' has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,197 @@
+"""
+asyncio fetch path for nba_api endpoints, with a pooled keep-alive client.
+
+``nba_data.fetch`` makes one blocking request at a time. ``AsyncFetcher``
+sends many requests concurrently instead: one ``httpx.AsyncClient`` keeps up
+to ``concurrency`` connections to the stats server alive, and a semaphore
+caps how many requests are in flight. While one response is on the wire,
+the waits for the others overlap with it instead of adding up.
+
+Everything else matches ``fetch``:
+
+* cache hits are answered without a request;
+* misses take a token from the shared ``RateLimiter``, with non-blocking
+  sleeps on the event loop;
+* timeouts, connection errors and 429/5xx responses are retried with the
+  limiter's backoff;
+* each result is the same endpoint object nba_api would build, so
+  ``get_data_frames()`` and the named data sets work unchanged.
+
+A transport error that survives every retry is re-raised as the matching
+requests exception, so ``nba_data.TRANSIENT_ERRORS`` classifies it the same
+way on both paths.
+
+Synchronous code such as the extraction loop uses ``FetchSession``. It owns
+an event loop and a fetcher, and keeps both across batches, so pooled
+connections survive from one batch to the next::
+
+    with FetchSession(concurrency=8) as session:
+        responses = session.fetch_all([(PlayByPlayV3, {"game_id": gid}) for gid in game_ids])
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+import httpx
+import requests
+from nba_api.stats.library.http import STATS_HEADERS, NBAStatsHTTP, NBAStatsResponse
+
+from nba_data import client
+from nba_data.client import MAX_RETRIES, TransientHTTPError
+from nba_data.metrics import get_metrics
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_TIMEOUT = 30.0  # seconds, nba_api's default
+
+_RETRYABLE = (httpx.TimeoutException, httpx.TransportError, TransientHTTPError)
+
+FetchCall = Tuple[Type[Any], Dict[str, Any]]
+
+
+def _as_requests_error(exc: Exception) -> Exception:
+    """Map an httpx transport failure onto the requests exception fetch would raise."""
+    if isinstance(exc, httpx.TimeoutException):
+        return requests.exceptions.Timeout(str(exc))
+    if isinstance(exc, httpx.TransportError):
+        return requests.exceptions.ConnectionError(str(exc))
+    return exc
+
+
+class AsyncFetcher:
+    """Concurrent, cache-aware nba_api fetches over one keep-alive connection pool."""
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_retries: int = MAX_RETRIES,
+    ) -> None:
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncFetcher":
+        self._client = httpx.AsyncClient(
+            # Only advertise encodings httpx can always decode (brotli is optional)
+            headers={**STATS_HEADERS, "Accept-Encoding": "gzip, deflate"},
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency,
+            ),
+        )
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _acquire(self) -> float:
+        limiter = client.get_rate_limiter()
+        waited = 0.0
+        while True:
+            wait = limiter.try_acquire()
+            if wait <= 0:
+                return waited
+            await asyncio.sleep(wait)
+            waited += wait
+
+    async def _send(self, request: Any) -> None:
+        """One HTTP round trip for an endpoint object, the async ``client._send``."""
+        # Same wire format as nba_api: sorted parameters, None values dropped
+        params = sorted(
+            (key, value) for key, value in request.parameters.items() if value is not None
+        )
+        response = await self._client.get(
+            NBAStatsHTTP.base_url.format(endpoint=request.endpoint),
+            params=params,
+            headers=getattr(request, "headers", None) or None,
+        )
+        if response.status_code == 429 or response.status_code >= 500:
+            raise TransientHTTPError(response.status_code, str(response.url))
+        request.nba_response = NBAStatsResponse(
+            response=response.text, status_code=response.status_code, url=str(response.url)
+        )
+
+    async def fetch(self, endpoint_cls: Type[Any], **kwargs: Any) -> Any:
+        """Async counterpart of ``nba_data.fetch`` (same return value and flags).
+
+        The returned object also carries ``fetch_seconds``, the time from
+        the first attempt to a loaded response. Rate-limit waits are included
+        in that time; semaphore queueing is not.
+        """
+        if self._client is None:
+            raise RuntimeError("AsyncFetcher must be used as 'async with AsyncFetcher() as fetcher'")
+        request = endpoint_cls(**kwargs, get_request=False)
+        if client.load_cached(request):
+            request.fetch_seconds = 0.0
+            return request
+
+        limiter = client.get_rate_limiter()
+        async with self._semaphore:
+            started = time.perf_counter()
+            waited, round_trips = 0.0, []
+            for attempt in range(self.max_retries + 1):
+                waited += await self._acquire()
+                sent = time.perf_counter()
+                try:
+                    await self._send(request)
+                except _RETRYABLE as exc:
+                    round_trips.append(time.perf_counter() - sent)
+                    if attempt == self.max_retries:
+                        get_metrics().record_failure(request.endpoint, waited, round_trips)
+                        raise _as_requests_error(exc) from exc
+                    client._count("retries")
+                    limiter.record_failure(attempt)
+                    continue
+                round_trips.append(time.perf_counter() - sent)
+                limiter.record_success()
+                break
+
+        client.store_response(request, waited, round_trips)
+        request.fetch_seconds = time.perf_counter() - started
+        return request
+
+    async def fetch_all(self, calls: Iterable[FetchCall]) -> List[Any]:
+        """Fetch every ``(endpoint_cls, kwargs)`` call concurrently, in order.
+
+        A call that fails after its retries holds the exception at its position,
+        and the other calls are unaffected.
+        """
+        return await asyncio.gather(
+            *(self.fetch(endpoint_cls, **kwargs) for endpoint_cls, kwargs in calls),
+            return_exceptions=True,
+        )
+
+
+class FetchSession:
+    """Blocking facade over ``AsyncFetcher`` that keeps its loop and pool alive."""
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, **kwargs: Any) -> None:
+        self._loop = asyncio.new_event_loop()
+        self.fetcher = AsyncFetcher(concurrency, **kwargs)
+        self._loop.run_until_complete(self.fetcher.__aenter__())
+
+    def fetch_all(self, calls: Iterable[FetchCall]) -> List[Any]:
+        """Run ``AsyncFetcher.fetch_all`` to completion and return its results."""
+        return self._loop.run_until_complete(self.fetcher.fetch_all(list(calls)))
+
+    def close(self) -> None:
+        if not self._loop.is_closed():
+            self._loop.run_until_complete(self.fetcher.aclose())
+            self._loop.close()
+
+    def __enter__(self) -> "FetchSession":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,197 @@
+"""
+Persistent, content-addressed on-disk cache for NBA stats API responses.
+
+Entries are keyed by a hash of the endpoint name plus its request parameters,
+stored gzip-compressed, and tracked in a small SQLite index that records
+expiry and last-access times so the cache can evict least-recently-used
+entries once it grows past its size budget.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[1] / ".nba_cache"
+DEFAULT_MAX_BYTES = 2 * 1024**3  # 2 GiB of compressed payloads
+CURRENT_SEASON_TTL = 6 * 60 * 60  # seconds; the live season changes nightly
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    parameters TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+"""
+
+
+def cache_key(endpoint: str, parameters: Dict[str, Any]) -> str:
+    """Return the content address for an endpoint request."""
+    payload = json.dumps(
+        {"endpoint": endpoint.lower(), "parameters": parameters},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def season_start_year(parameters: Dict[str, Any]) -> Optional[int]:
+    """Infer the season a request belongs to from its parameters.
+
+    Understands ``Season`` values such as ``2023-24`` and ten-digit game IDs
+    such as ``0022300405`` (characters 3-4 hold the season's start year).
+    """
+    season = parameters.get("Season")
+    if isinstance(season, str) and len(season) >= 4 and season[:4].isdigit():
+        return int(season[:4])
+
+    game_id = str(parameters.get("GameID") or "")
+    if len(game_id) == 10 and game_id.isdigit():
+        year = int(game_id[3:5])
+        return 1900 + year if year >= 46 else 2000 + year
+    return None
+
+
+def season_is_finished(start_year: int, now: Optional[datetime] = None) -> bool:
+    """A season is closed once the July after its playoffs has arrived."""
+    now = now or datetime.now()
+    return now >= datetime(start_year + 1, 7, 1)
+
+
+def default_ttl(parameters: Dict[str, Any], now: Optional[datetime] = None) -> Optional[float]:
+    """Return the TTL in seconds for a request, or ``None`` to keep it forever."""
+    start_year = season_start_year(parameters)
+    if start_year is not None and season_is_finished(start_year, now):
+        return None
+    return CURRENT_SEASON_TTL
+
+
+class ResponseCache:
+    """Size-bounded, compressed response store shared by every fetch."""
+
+    def __init__(
+        self,
+        root: Path = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.objects = self.root / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            self.root / "index.sqlite", timeout=30, check_same_thread=False
+        )
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+
+    def _path(self, key: str) -> Path:
+        return self.objects / key[:2] / f"{key}.json.gz"
+
+    def get(self, endpoint: str, parameters: Dict[str, Any]) -> Optional[str]:
+        """Return the cached response text, or ``None`` if missing or expired."""
+        key = cache_key(endpoint, parameters)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            expires_at = row[0]
+            path = self._path(key)
+            if (expires_at is not None and expires_at <= now) or not path.exists():
+                self._delete(key)
+                self._db.commit()
+                return None
+            self._db.execute(
+                "UPDATE entries SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._db.commit()
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            return handle.read()
+
+    def put(
+        self,
+        endpoint: str,
+        parameters: Dict[str, Any],
+        contents: str,
+        ttl: Optional[float] = None,
+    ) -> None:
+        """Store a response; ``ttl=None`` keeps it until evicted for space."""
+        key = cache_key(endpoint, parameters)
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temp file first so concurrent readers never see a torn entry
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as handle:
+            handle.write(contents.encode("utf-8"))
+        os.replace(tmp_name, path)
+
+        now = time.time()
+        expires_at = None if ttl is None else now + ttl
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    endpoint.lower(),
+                    json.dumps(parameters, sort_keys=True, default=str),
+                    path.stat().st_size,
+                    now,
+                    expires_at,
+                    now,
+                ),
+            )
+            self._evict()
+            self._db.commit()
+
+    def _delete(self, key: str) -> None:
+        self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _evict(self) -> None:
+        """Drop expired entries, then least-recently-used ones until under budget."""
+        now = time.time()
+        expired = self._db.execute(
+            "SELECT key FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (now,),
+        ).fetchall()
+        for (key,) in expired:
+            self._delete(key)
+
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute(
+            "SELECT key, size FROM entries ORDER BY last_access ASC"
+        ).fetchall():
+            self._delete(key)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count and total compressed size, for progress reporting."""
+        with self._lock:
+            count, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {"entries": count, "bytes": size}
@@ -0,0 +1,284 @@
+"""
+Persistent catalog of NBA games, so extraction jobs never re-query
+``LeagueGameFinder`` just to list game IDs.
+
+``LeagueGameFinder`` returns one row per team-game. The catalog stores one
+row per game in a small SQLite database next to the response cache,
+indexed on ``(season, season_type, game_date)``. Each row holds:
+
+* season
+* season type
+* date
+* home and away team IDs and abbreviations
+
+Season type comes from the game ID's third digit, and home/away from the
+``MATCHUP`` text ("BOS vs. NYK" is a home row, "BOS @ NYK" an away row).
+
+``refresh(season)`` fetches only what is new. A season is requested from the
+last catalogued date onward, so a nightly refresh pulls one day of games. A
+finished season that was refreshed after it ended is never requested again.
+Selections are indexed queries plus set lookups, with no API call and no
+pandas::
+
+    catalog = GameCatalog()
+    for season in ("2021-22", "2022-23", "2023-24"):
+        catalog.refresh(season)
+    playoff_ids = catalog.select(seasons=["2021-22", "2022-23", "2023-24"],
+                                 season_types=["Playoffs"], exclude=already_done)
+
+Command line:
+    python -m nba_data.catalog refresh --seasons 2022-23 2023-24
+    python -m nba_data.catalog select --seasons 2023-24 --season-types Playoffs
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from nba_data.cache import DEFAULT_CACHE_DIR, season_is_finished, season_start_year
+
+# Third digit of a game ID
+SEASON_TYPES = {
+    "1": "Pre Season",
+    "2": "Regular Season",
+    "3": "All Star",
+    "4": "Playoffs",
+    "5": "PlayIn",
+    "6": "IST",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game_id TEXT PRIMARY KEY,
+    season TEXT NOT NULL,
+    season_type TEXT NOT NULL,
+    game_date TEXT NOT NULL,
+    home_team_id INTEGER,
+    away_team_id INTEGER,
+    home_team TEXT,
+    away_team TEXT
+);
+CREATE INDEX IF NOT EXISTS games_season_type_date ON games (season, season_type, game_date);
+CREATE TABLE IF NOT EXISTS refreshes (
+    season TEXT PRIMARY KEY,
+    refreshed_at REAL NOT NULL,
+    complete INTEGER NOT NULL
+);
+"""
+
+COLUMNS = [
+    "game_id", "season", "season_type", "game_date",
+    "home_team_id", "away_team_id", "home_team", "away_team",
+]
+
+
+def default_catalog_path() -> Path:
+    return Path(os.environ.get("NBA_CACHE_DIR", DEFAULT_CACHE_DIR)) / "game_catalog.sqlite"
+
+
+def season_of(game_id: str) -> str:
+    """``0022300405`` -> ``2023-24``."""
+    start = season_start_year({"GameID": str(game_id).zfill(10)})
+    return f"{start}-{(start + 1) % 100:02d}"
+
+
+def season_type_of(game_id: str) -> str:
+    return SEASON_TYPES.get(str(game_id).zfill(10)[2], "Other")
+
+
+def games_from_finder(headers: List[str], rows: Iterable[List[Any]]) -> List[Dict[str, Any]]:
+    """Collapse ``LeagueGameFinder`` team-game rows into one record per game."""
+    col = {name: i for i, name in enumerate(headers)}
+    games: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        game_id = str(row[col["GAME_ID"]]).zfill(10)
+        game = games.get(game_id)
+        if game is None:
+            game = games[game_id] = {
+                "game_id": game_id,
+                "season": season_of(game_id),
+                "season_type": season_type_of(game_id),
+                "game_date": str(row[col["GAME_DATE"]])[:10],
+                "home_team_id": None,
+                "away_team_id": None,
+                "home_team": None,
+                "away_team": None,
+            }
+        side = "away" if "@" in str(row[col["MATCHUP"]]) else "home"
+        game[f"{side}_team_id"] = int(row[col["TEAM_ID"]])
+        game[f"{side}_team"] = row[col["TEAM_ABBREVIATION"]]
+    return list(games.values())
+
+
+class GameCatalog:
+    """SQLite-backed, incrementally refreshed index of games by season and type."""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = Path(path or default_catalog_path())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+    def __contains__(self, game_id: str) -> bool:
+        return self.get(game_id) is not None
+
+    def get(self, game_id: str) -> Optional[Dict[str, Any]]:
+        """One game's record by primary key."""
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM games WHERE game_id = ?", (str(game_id).zfill(10),)
+            ).fetchone()
+        return dict(zip(COLUMNS, row)) if row else None
+
+    def seasons(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT DISTINCT season FROM games ORDER BY season")]
+
+    def last_date(self, season: str) -> Optional[str]:
+        with self._lock:
+            return self._db.execute("SELECT MAX(game_date) FROM games WHERE season = ?", (season,)).fetchone()[0]
+
+    def is_complete(self, season: str) -> bool:
+        with self._lock:
+            row = self._db.execute("SELECT complete FROM refreshes WHERE season = ?", (season,)).fetchone()
+        return bool(row and row[0])
+
+    def upsert(self, games: Iterable[Dict[str, Any]]) -> int:
+        """Insert or update game records; return how many were new."""
+        games = list(games)
+        with self._lock:
+            before = self._db.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO games ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                [tuple(game[name] for name in COLUMNS) for game in games],
+            )
+            self._db.commit()
+            return self._db.execute("SELECT COUNT(*) FROM games").fetchone()[0] - before
+
+    def refresh(self, season: str, force: bool = False) -> int:
+        """Fetch games for ``season`` dated on or after the last catalogued date.
+
+        The last date is fetched again, so games that were still being played
+        when it was last fetched are picked up. Returns how many games were
+        new. A finished season that was refreshed after it ended is skipped
+        unless ``force`` is set.
+        """
+        if self.is_complete(season) and not force:
+            return 0
+        from nba_api.stats.endpoints.leaguegamefinder import LeagueGameFinder
+
+        from nba_data.client import fetch
+
+        last = None if force else self.last_date(season)
+        kwargs = {"season_nullable": season}
+        if last:
+            kwargs["date_from_nullable"] = datetime.strptime(last, "%Y-%m-%d").strftime("%m/%d/%Y")
+        result = fetch(LeagueGameFinder, **kwargs).league_game_finder_results.get_dict()
+        added = self.upsert(games_from_finder(result["headers"], result["data"]))
+
+        complete = season_is_finished(int(season[:4]))
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO refreshes (season, refreshed_at, complete) VALUES (?, ?, ?)",
+                (season, time.time(), int(complete)),
+            )
+            self._db.commit()
+        return added
+
+    def select(
+        self,
+        seasons: Optional[Iterable[str]] = None,
+        season_types: Optional[Iterable[str]] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        team: Optional[str] = None,
+        exclude: Iterable[str] = (),
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        """Game IDs matching every filter, oldest first.
+
+        Dates are ISO ``YYYY-MM-DD`` and inclusive. ``team`` matches either
+        side's abbreviation. ``exclude`` is a set of IDs to skip, typically
+        the games already extracted, so ``limit`` counts only new work.
+        """
+        clauses, params = [], []
+        for column, values in (("season", seasons), ("season_type", season_types)):
+            if values is not None:
+                values = list(values)
+                clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params += values
+        if date_from:
+            clauses.append("game_date >= ?")
+            params.append(date_from)
+        if date_to:
+            clauses.append("game_date <= ?")
+            params.append(date_to)
+        if team:
+            clauses.append("(home_team = ? OR away_team = ?)")
+            params += [team, team]
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT game_id FROM games {where} ORDER BY game_date, game_id", params
+            ).fetchall()
+
+        exclude = exclude if isinstance(exclude, (set, frozenset)) else set(exclude)
+        selected = []
+        for (game_id,) in rows:
+            if game_id in exclude:
+                continue
+            selected.append(game_id)
+            if limit and len(selected) >= limit:
+                break
+        return selected
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Maintain and query the local game catalog.")
+    parser.add_argument("command", choices=["refresh", "select", "stats"])
+    parser.add_argument("--catalog", type=Path, help="Catalog database (default: .nba_cache/game_catalog.sqlite).")
+    parser.add_argument("--seasons", nargs="+", help="Seasons such as 2023-24.")
+    parser.add_argument("--season-types", nargs="+", choices=sorted(SEASON_TYPES.values()))
+    parser.add_argument("--date-from", help="YYYY-MM-DD, inclusive.")
+    parser.add_argument("--date-to", help="YYYY-MM-DD, inclusive.")
+    parser.add_argument("--team", help="Team abbreviation, home or away.")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--force", action="store_true", help="Refresh whole seasons, even finished ones.")
+    args = parser.parse_args(argv)
+
+    catalog = GameCatalog(args.catalog)
+    if args.command == "refresh":
+        for season in args.seasons or []:
+            added = catalog.refresh(season, force=args.force)
+            print(f"{season}: {added} new game(s), through {catalog.last_date(season)}")
+    elif args.command == "select":
+        for game_id in catalog.select(
+            args.seasons, args.season_types, args.date_from, args.date_to, args.team, limit=args.limit
+        ):
+            print(game_id)
+    else:
+        print(f"{len(catalog)} game(s) in {catalog.path}")
+        for season in catalog.seasons():
+            print(f"  {season}: through {catalog.last_date(season)}{' (complete)' if catalog.is_complete(season) else ''}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,299 @@
+"""
+Cache-aware, rate-limited wrapper around nba_api endpoint classes.
+
+``fetch(LeagueDashPlayerStats, season="2023-24", ...)`` returns the same
+endpoint object nba_api would, so callers keep using ``get_data_frames()`` or
+the named data sets, but identical requests are served from the shared
+``ResponseCache`` instead of stats.nba.com. Requests that do reach the network
+go through the shared ``RateLimiter`` and are retried with backoff on
+timeouts and 429/5xx responses.
+
+Setting ``NBA_STATS_SERVER`` (or calling ``configure_stats_server``) sends
+every nba_api stats request to another base URL, such as the local stand-in
+server in ``nba_data.standin``. Its responses are cached in a ``standin``
+subdirectory, apart from live ones, and the rate limiter keeps its state in a
+separate file, so load tests never spend the live API's hourly budget.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Type
+
+import requests
+from nba_api.stats.library.http import NBAStatsHTTP, NBAStatsResponse
+
+from nba_data.cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, ResponseCache, default_ttl
+from nba_data.metrics import get_metrics
+from nba_data.ratelimit import DEFAULT_CALLS_PER_HOUR, DEFAULT_MIN_INTERVAL, RateLimiter
+
+MAX_RETRIES = 4
+LIVE_STATS_URL = NBAStatsHTTP.base_url
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+_cache_enabled = os.environ.get("NBA_CACHE_DISABLE", "") not in ("1", "true")
+# Set by configure_cache; None means NBA_CACHE_DIR / NBA_CACHE_MAX_BYTES
+_cache_root: Optional[Path] = None
+_cache_max_bytes: Optional[int] = None
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+# Running totals so scripts can report how many requests reached the network
+fetch_counts: Dict[str, int] = {"hits": 0, "misses": 0, "retries": 0}
+_counts_lock = threading.Lock()
+
+
+class TransientHTTPError(Exception):
+    """Raised for responses worth retrying (rate limiting or server errors)."""
+
+    def __init__(self, status_code: int, url: Optional[str]) -> None:
+        super().__init__(f"HTTP {status_code} from {url}")
+        self.status_code = status_code
+
+
+TRANSIENT_ERRORS = (
+    requests.exceptions.Timeout,
+    requests.exceptions.ConnectionError,
+    TransientHTTPError,
+)
+
+
+def _cache_dir() -> Path:
+    return Path(os.environ.get("NBA_CACHE_DIR", DEFAULT_CACHE_DIR))
+
+
+def _response_cache_dir() -> Path:
+    """Where responses from the current stats server are cached.
+
+    A stand-in gets its own directory: otherwise a warm live cache would
+    answer its requests, so injected faults never fire, and its recorded or
+    faulty responses would be served to later live runs.
+    """
+    root = _cache_root or _cache_dir()
+    return root / "standin" if using_stats_server() else root
+
+
+def configure_cache(
+    cache_dir: Optional[Path] = None,
+    max_bytes: Optional[int] = None,
+    enabled: bool = True,
+) -> None:
+    """Point the shared cache somewhere else, resize it, or switch it off."""
+    global _cache, _cache_enabled, _cache_root, _cache_max_bytes
+    with _cache_lock:
+        _cache_enabled = enabled
+        _cache_root = Path(cache_dir) if cache_dir else None
+        _cache_max_bytes = max_bytes
+        _cache = None
+        if enabled:
+            _cache = ResponseCache(
+                _response_cache_dir(), max_bytes or DEFAULT_MAX_BYTES
+            )
+
+
+def get_cache() -> Optional[ResponseCache]:
+    """Return the process-wide cache, creating it on first use.
+
+    It is reopened in the matching directory if the stats server has changed
+    since it was created.
+    """
+    global _cache
+    if not _cache_enabled:
+        return None
+    with _cache_lock:
+        root = _response_cache_dir()
+        if _cache is None or _cache.root != root:
+            _cache = ResponseCache(
+                root,
+                _cache_max_bytes
+                or int(os.environ.get("NBA_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+            )
+        return _cache
+
+
+def configure_stats_server(base_url: Optional[str] = None) -> str:
+    """Route nba_api stats requests to ``base_url`` instead of stats.nba.com.
+
+    ``base_url`` is the prefix endpoints hang off, e.g.
+    ``http://127.0.0.1:8765/stats``. Without an argument the
+    ``NBA_STATS_SERVER`` variable is used, falling back to the live API.
+    Returns the URL template now in effect.
+    """
+    base_url = base_url or os.environ.get("NBA_STATS_SERVER")
+    NBAStatsHTTP.base_url = (
+        base_url.rstrip("/") + "/{endpoint}" if base_url else LIVE_STATS_URL
+    )
+    return NBAStatsHTTP.base_url
+
+
+def using_stats_server() -> bool:
+    """True when requests go somewhere other than the live API."""
+    return NBAStatsHTTP.base_url != LIVE_STATS_URL
+
+
+def configure_rate_limiter(
+    calls_per_hour: float = DEFAULT_CALLS_PER_HOUR,
+    burst: Optional[int] = None,
+    state_file: Optional[Path] = None,
+    min_interval: Optional[float] = None,
+) -> RateLimiter:
+    """Replace the shared limiter, e.g. from a ``--calls-per-hour`` flag.
+
+    The bucket state lives next to the response cache unless ``state_file``
+    says otherwise, so consecutive runs within the same hour share one budget.
+    Runs against a stand-in server use their own state file. ``min_interval``
+    defaults to ``NBA_MIN_INTERVAL`` or the live API's spacing.
+    """
+    global _limiter
+    if state_file is None:
+        name = "ratelimit-standin.json" if using_stats_server() else "ratelimit.json"
+        state_file = _cache_dir() / name
+    if min_interval is None:
+        min_interval = float(os.environ.get("NBA_MIN_INTERVAL", DEFAULT_MIN_INTERVAL))
+    with _limiter_lock:
+        _limiter = RateLimiter(
+            calls_per_hour,
+            burst=burst,
+            min_interval=min_interval,
+            state_file=state_file,
+        )
+        return _limiter
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide limiter, creating it on first use."""
+    if _limiter is None:
+        configure_rate_limiter(
+            float(os.environ.get("NBA_CALLS_PER_HOUR", DEFAULT_CALLS_PER_HOUR))
+        )
+    return _limiter
+
+
+configure_stats_server()
+
+
+def _count(name: str) -> None:
+    with _counts_lock:
+        fetch_counts[name] += 1
+
+
+def _send(request: Any) -> None:
+    """Issue one HTTP request for an endpoint object; ``store_response`` parses it."""
+    response = NBAStatsHTTP().send_api_request(
+        endpoint=request.endpoint,
+        parameters=request.parameters,
+        proxy=getattr(request, "proxy", None),
+        headers=getattr(request, "headers", None),
+        timeout=getattr(request, "timeout", 30),
+    )
+    status_code = getattr(response, "_status_code", None)
+    if status_code is not None and (status_code == 429 or status_code >= 500):
+        raise TransientHTTPError(status_code, response.get_url())
+    request.nba_response = response
+
+
+def _load(request: Any) -> float:
+    """Build the endpoint's data sets from its response; return the seconds taken."""
+    started = time.perf_counter()
+    request.load_response()
+    return time.perf_counter() - started
+
+
+def load_cached(request: Any) -> bool:
+    """Answer an unsent endpoint object from the cache; return whether it hit."""
+    cache = get_cache()
+    if cache is None:
+        return False
+    contents = cache.get(request.endpoint, request.parameters)
+    if contents is None:
+        return False
+    request.nba_response = NBAStatsResponse(response=contents, status_code=200, url=None)
+    parse_seconds = _load(request)
+    request.from_cache = True
+    _count("hits")
+    get_metrics().record_fetch(request.endpoint, "cache", parse_seconds, len(contents.encode("utf-8")))
+    return True
+
+
+def store_response(
+    request: Any, wait_seconds: float = 0.0, round_trips: Iterable[float] = ()
+) -> None:
+    """Parse a network response, record its metrics, and cache valid JSON.
+
+    ``wait_seconds`` is the time spent on the rate limiter and ``round_trips``
+    the duration of each HTTP attempt, failed ones included.
+    """
+    parse_seconds = _load(request)
+    request.from_cache = False
+    _count("misses")
+    contents = request.nba_response.get_response()
+    get_metrics().record_fetch(
+        request.endpoint,
+        "network",
+        parse_seconds,
+        len(contents.encode("utf-8")),
+        wait_seconds,
+        round_trips,
+    )
+    cache = get_cache()
+    if cache is not None and request.nba_response.valid_json():
+        cache.put(
+            request.endpoint,
+            request.parameters,
+            contents,
+            ttl=default_ttl(request.parameters),
+        )
+
+
+def fetch(endpoint_cls: Type[Any], max_retries: int = MAX_RETRIES, **kwargs: Any) -> Any:
+    """Build an nba_api endpoint, answering from the cache when possible.
+
+    The returned object carries a ``from_cache`` flag. Cache hits never touch
+    the rate limiter; misses wait for a token and are retried up to
+    ``max_retries`` times on transient failures before the error propagates.
+    """
+    request = endpoint_cls(**kwargs, get_request=False)
+    if load_cached(request):
+        return request
+
+    limiter = get_rate_limiter()
+    waited, round_trips = 0.0, []
+    for attempt in range(max_retries + 1):
+        waited += limiter.acquire()
+        started = time.perf_counter()
+        try:
+            _send(request)
+        except TRANSIENT_ERRORS:
+            round_trips.append(time.perf_counter() - started)
+            if attempt == max_retries:
+                get_metrics().record_failure(request.endpoint, waited, round_trips)
+                raise
+            _count("retries")
+            limiter.record_failure(attempt)
+            continue
+        round_trips.append(time.perf_counter() - started)
+        limiter.record_success()
+        break
+
+    store_response(request, waited, round_trips)
+    return request
+
+
+def fetch_player_game_logs(season: str, season_type: str) -> Any:
+    """One row per player-game for a season (PlayerGameLogs, Base totals), as a DataFrame."""
+    from nba_api.stats.endpoints.playergamelogs import PlayerGameLogs
+
+    response = fetch(PlayerGameLogs, season_nullable=season, season_type_nullable=season_type)
+    return response.get_data_frames()[0]
+
+
+def fetch_team_game_logs(season: str, season_type: str) -> Any:
+    """One row per team-game for a season (TeamGameLogs, Base totals), as a DataFrame."""
+    from nba_api.stats.endpoints.teamgamelogs import TeamGameLogs
+
+    response = fetch(TeamGameLogs, season_nullable=season, season_type_nullable=season_type)
+    return response.get_data_frames()[0]
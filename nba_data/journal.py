@@ -0,0 +1,91 @@
+"""
+Append-only journal of per-game extraction outcomes.
+
+Each line is a JSON record ``{"game_id", "status", "reason", "timestamp"}``
+where status is ``done`` (row safely flushed to the output file), ``failed``
+(transient error, eligible for retry) or ``skipped`` (permanent error, e.g. a
+game with no play-by-play). Replaying the file on start-up tells a restarted
+extraction exactly which games are finished, which to retry and which to
+leave alone.
+"""
+from __future__ import annotations
+
+import json
+import os
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+class ExtractionJournal:
+    """Durable record of which game IDs have been processed and how."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.status: Dict[str, str] = {}
+        self.reasons: Dict[str, str] = {}
+        self.failures: Counter = Counter()
+        if self.path.exists():
+            self._replay()
+
+    def _replay(self) -> None:
+        with open(self.path, encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write can leave one torn trailing line
+                    continue
+                self._apply(record)
+
+    def _apply(self, record: Dict[str, str]) -> None:
+        game_id = record["game_id"]
+        self.status[game_id] = record["status"]
+        if record.get("reason"):
+            self.reasons[game_id] = record["reason"]
+        if record["status"] == FAILED:
+            self.failures[game_id] += 1
+
+    def _ids_with(self, status: str) -> Set[str]:
+        return {game_id for game_id, value in self.status.items() if value == status}
+
+    @property
+    def completed(self) -> Set[str]:
+        return self._ids_with(DONE)
+
+    @property
+    def skipped(self) -> Set[str]:
+        return self._ids_with(SKIPPED)
+
+    @property
+    def failed(self) -> Set[str]:
+        return self._ids_with(FAILED)
+
+    def record_many(self, entries: Iterable[Tuple[str, str, Optional[str]]]) -> None:
+        """Append ``(game_id, status, reason)`` records and fsync them."""
+        timestamp = datetime.now().isoformat()
+        records = [
+            {"game_id": str(game_id), "status": status, "reason": reason, "timestamp": timestamp}
+            for game_id, status, reason in entries
+        ]
+        if not records:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as handle:
+            for record in records:
+                handle.write(json.dumps(record) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        for record in records:
+            self._apply(record)
+
+    def record(self, game_id: str, status: str, reason: Optional[str] = None) -> None:
+        self.record_many([(game_id, status, reason)])
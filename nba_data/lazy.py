@@ -0,0 +1,40 @@
+"""
+Deferred imports for heavy dependencies.
+
+``pd = lazy_import("pandas")`` binds a stand-in module whose first attribute
+access performs the real import, so a script can keep its usual module-level
+aliases while ``--help`` and plain imports never pay for pandas, scipy or
+pyarrow. Dotted names such as ``"scipy.stats"`` do not import their parent
+package until then either.
+"""
+from __future__ import annotations
+
+import importlib
+import types
+from typing import Any
+
+
+class _LazyModule(types.ModuleType):
+    """Module placeholder that imports the real module on first use."""
+
+    def _load(self) -> types.ModuleType:
+        module = importlib.import_module(self.__name__)
+        # Later lookups hit the instance dict and skip __getattr__ entirely
+        self.__dict__.update(module.__dict__)
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        # Assignments such as ``store.events_dir = path`` must reach the real module
+        setattr(self._load(), attr, value)
+        self.__dict__[attr] = value
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """Return ``name`` as a module that is only imported when first touched."""
+    return _LazyModule(name)
@@ -0,0 +1,292 @@
+"""
+Pipeline instrumentation: where does a run's time go?
+
+Every ``fetch`` (blocking or async) reports to the process-wide
+``PipelineMetrics``:
+
+* the round-trip latency of each HTTP attempt, as a per-endpoint histogram;
+* bytes received, per endpoint and source (network or cache);
+* cache hits and misses, retries and requests that gave up;
+* seconds spent waiting on the rate limiter, backoff pauses included;
+* seconds nba_api spent parsing the JSON into data sets.
+
+Pipelines wrap their pandas work in ``get_metrics().stage("name")``, which
+records per-stage wall time.
+
+Outputs:
+
+* an optional JSON-lines event log with one line per fetch and per stage;
+* a Prometheus text-format snapshot;
+* a summary report that compares the network, rate-limit and CPU totals to
+  name the bottleneck.
+
+These are totals summed across threads and tasks, so with concurrent
+fetching they can add up to more than the wall clock. What matters is how
+they compare with each other.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from bisect import bisect_right
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+LATENCY_BUCKETS: Tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+BOUND_LABELS = {"network": "network-bound", "rate_limit": "rate-limit-bound", "cpu": "CPU-bound"}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(**labels: str) -> Labels:
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels: Labels, extra: str = "") -> str:
+    parts = [f'{key}="{value}"' for key, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _quantile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class PipelineMetrics:
+    """Thread-safe counters, latency histograms and stage timers for one run."""
+
+    def __init__(self, events_path: Optional[Path] = None) -> None:
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._latencies: Dict[str, List[float]] = {}
+        self._events: Optional[IO[str]] = None
+        self.events_path = Path(events_path) if events_path else None
+        if self.events_path is not None:
+            self.events_path.parent.mkdir(parents=True, exist_ok=True)
+            self._events = self.events_path.open("a", encoding="utf-8")
+
+    def _add(self, name: str, value: float, labels: Labels = ()) -> None:
+        key = (name, labels)
+        self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def _emit(self, event: Dict[str, Any]) -> None:
+        if self._events is not None:
+            self._events.write(json.dumps({"ts": round(time.time(), 3), **event}) + "\n")
+
+    def total(self, name: str, **labels: str) -> float:
+        """Sum of a counter over every label set that matches ``labels``."""
+        wanted = set(labels.items())
+        with self._lock:
+            return sum(
+                value for (counter, key), value in self._counters.items()
+                if counter == name and wanted <= set(key)
+            )
+
+    def record_fetch(
+        self,
+        endpoint: str,
+        source: str,
+        parse_seconds: float,
+        nbytes: int,
+        wait_seconds: float = 0.0,
+        round_trips: Iterable[float] = (),
+    ) -> None:
+        """One completed request, answered from ``source`` ("network" or "cache")."""
+        round_trips = list(round_trips)
+        with self._lock:
+            self._add("nba_fetch_requests_total", 1, _labels(endpoint=endpoint, source=source))
+            self._add("nba_fetch_bytes_total", nbytes, _labels(endpoint=endpoint, source=source))
+            self._add("nba_fetch_parse_seconds_total", parse_seconds, _labels(endpoint=endpoint))
+            self._record_network(endpoint, wait_seconds, round_trips)
+            self._emit({
+                "event": "fetch",
+                "endpoint": endpoint,
+                "source": source,
+                "bytes": nbytes,
+                "parse_s": round(parse_seconds, 6),
+                "wait_s": round(wait_seconds, 6),
+                "round_trips_s": [round(seconds, 6) for seconds in round_trips],
+            })
+
+    def record_failure(self, endpoint: str, wait_seconds: float, round_trips: Iterable[float]) -> None:
+        """A request that exhausted its retries."""
+        round_trips = list(round_trips)
+        with self._lock:
+            self._add("nba_fetch_failures_total", 1, _labels(endpoint=endpoint))
+            self._record_network(endpoint, wait_seconds, round_trips)
+            self._emit({
+                "event": "failure",
+                "endpoint": endpoint,
+                "wait_s": round(wait_seconds, 6),
+                "round_trips_s": [round(seconds, 6) for seconds in round_trips],
+            })
+
+    def _record_network(self, endpoint: str, wait_seconds: float, round_trips: List[float]) -> None:
+        if round_trips:
+            self._latencies.setdefault(endpoint, []).extend(round_trips)
+            self._add("nba_fetch_retries_total", len(round_trips) - 1, _labels(endpoint=endpoint))
+        self._add("nba_ratelimit_wait_seconds_total", wait_seconds)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block of pipeline work (typically pandas) under ``name``."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._add("nba_stage_seconds_total", elapsed, _labels(stage=name))
+                self._add("nba_stage_runs_total", 1, _labels(stage=name))
+                self._emit({"event": "stage", "stage": name, "seconds": round(elapsed, 6)})
+
+    def prometheus(self) -> str:
+        """Everything recorded so far in the Prometheus text exposition format."""
+        lines = [
+            "# HELP nba_fetch_latency_seconds Round-trip time of each HTTP attempt.",
+            "# TYPE nba_fetch_latency_seconds histogram",
+        ]
+        with self._lock:
+            for endpoint, samples in sorted(self._latencies.items()):
+                labels = _labels(endpoint=endpoint)
+                ordered = sorted(samples)
+                for bound in LATENCY_BUCKETS:
+                    count = bisect_right(ordered, bound)
+                    bucket = _format_labels(labels, f'le="{bound}"')
+                    lines.append(f"nba_fetch_latency_seconds_bucket{bucket} {count}")
+                bucket = _format_labels(labels, 'le="+Inf"')
+                lines.append(f"nba_fetch_latency_seconds_bucket{bucket} {len(ordered)}")
+                lines.append(f"nba_fetch_latency_seconds_sum{_format_labels(labels)} {sum(ordered):.6f}")
+                lines.append(f"nba_fetch_latency_seconds_count{_format_labels(labels)} {len(ordered)}")
+
+            names = sorted({name for name, _ in self._counters})
+            for name in names:
+                lines.append(f"# TYPE {name} counter")
+                for (counter, labels), value in sorted(self._counters.items()):
+                    if counter == name:
+                        lines.append(f"{name}{_format_labels(labels)} {value:.6g}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict[str, Any]:
+        """Run totals, per-endpoint latency percentiles, and the dominant cost."""
+        hits = self.total("nba_fetch_requests_total", source="cache")
+        misses = self.total("nba_fetch_requests_total", source="network")
+        with self._lock:
+            latencies = {endpoint: list(samples) for endpoint, samples in self._latencies.items()}
+        endpoints = {}
+        for endpoint, samples in sorted(latencies.items()):
+            endpoints[endpoint] = {
+                "attempts": len(samples),
+                "p50_s": round(_quantile(samples, 0.50), 4),
+                "p95_s": round(_quantile(samples, 0.95), 4),
+                "max_s": round(max(samples), 4),
+                "bytes": int(self.total("nba_fetch_bytes_total", endpoint=endpoint, source="network")),
+                "retries": int(self.total("nba_fetch_retries_total", endpoint=endpoint)),
+            }
+        stages = {}
+        with self._lock:
+            stage_names = sorted({dict(labels)["stage"] for name, labels in self._counters if name == "nba_stage_seconds_total"})
+        for name in stage_names:
+            stages[name] = {
+                "seconds": round(self.total("nba_stage_seconds_total", stage=name), 4),
+                "runs": int(self.total("nba_stage_runs_total", stage=name)),
+            }
+
+        time_split = {
+            "network": sum(sum(samples) for samples in latencies.values()),
+            "rate_limit": self.total("nba_ratelimit_wait_seconds_total"),
+            "cpu": self.total("nba_fetch_parse_seconds_total") + self.total("nba_stage_seconds_total"),
+        }
+        return {
+            "wall_s": round(time.perf_counter() - self.started, 3),
+            "requests": int(hits + misses),
+            "cache_hits": int(hits),
+            "cache_hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "retries": int(self.total("nba_fetch_retries_total")),
+            "failures": int(self.total("nba_fetch_failures_total")),
+            "network_bytes": int(self.total("nba_fetch_bytes_total", source="network")),
+            "parse_s": round(self.total("nba_fetch_parse_seconds_total"), 4),
+            "endpoints": endpoints,
+            "stages": stages,
+            "time_split_s": {key: round(value, 4) for key, value in time_split.items()},
+            "bound": max(time_split, key=time_split.get) if any(time_split.values()) else None,
+        }
+
+    def report(self) -> str:
+        """Human-readable version of ``summary``."""
+        summary = self.summary()
+        lines = [
+            f"\nPipeline metrics (wall {summary['wall_s']:.2f}s):",
+            f"  Requests {summary['requests']} | cache hit rate {summary['cache_hit_rate']:.1%} | "
+            f"retries {summary['retries']} | failures {summary['failures']} | "
+            f"{summary['network_bytes'] / 2**20:.2f} MB from the network | parse {summary['parse_s']:.2f}s",
+        ]
+        if summary["endpoints"]:
+            lines.append(f"  {'endpoint':<28} {'attempts':>8} {'p50':>8} {'p95':>8} {'max':>8} {'MB':>8}")
+        for endpoint, stats in summary["endpoints"].items():
+            lines.append(
+                f"  {endpoint:<28} {stats['attempts']:>8} {stats['p50_s']:>7.3f}s {stats['p95_s']:>7.3f}s "
+                f"{stats['max_s']:>7.3f}s {stats['bytes'] / 2**20:>8.2f}"
+            )
+        for name, stats in summary["stages"].items():
+            lines.append(f"  stage {name:<22} {stats['runs']:>8} run(s) {stats['seconds']:>9.3f}s")
+        split = summary["time_split_s"]
+        lines.append(
+            f"  Time: network {split['network']:.2f}s | rate-limit wait {split['rate_limit']:.2f}s | "
+            f"CPU (parse + stages) {split['cpu']:.2f}s"
+        )
+        if summary["bound"]:
+            lines.append(f"  Bottleneck: {BOUND_LABELS[summary['bound']]}")
+        return "\n".join(lines)
+
+    def write(self, directory: Path) -> None:
+        """Write ``metrics.prom`` and ``summary.json`` into ``directory``."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / "metrics.prom").write_text(self.prometheus(), encoding="utf-8")
+        (directory / "summary.json").write_text(json.dumps(self.summary(), indent=2) + "\n", encoding="utf-8")
+
+    def finish(self, directory: Optional[Path] = None) -> None:
+        """End-of-run hook: print the report, write the snapshot files, close the log."""
+        print(self.report())
+        if directory is not None:
+            self.write(directory)
+            print(f"  Metrics written to {directory}")
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._events is not None:
+                self._events.close()
+                self._events = None
+
+
+_metrics: Optional[PipelineMetrics] = None
+_metrics_lock = threading.Lock()
+
+
+def configure_metrics(events_path: Optional[Path] = None) -> PipelineMetrics:
+    """Start a fresh metrics registry, optionally logging events as JSON lines."""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is not None:
+            _metrics.close()
+        _metrics = PipelineMetrics(events_path)
+        return _metrics
+
+
+def get_metrics() -> PipelineMetrics:
+    """Return the process-wide registry, creating it on first use."""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = PipelineMetrics()
+        return _metrics
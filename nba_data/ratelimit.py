@@ -0,0 +1,144 @@
+"""
+Adaptive token-bucket rate limiter for stats.nba.com.
+
+The bucket holds up to ``burst`` tokens and refills at ``calls_per_hour``, so a
+fresh run can spend its hourly budget immediately instead of sleeping after
+every call. Timeouts and 429/5xx responses halve the refill rate and pause all
+callers for an exponentially growing, jittered interval; successful calls
+slowly restore the configured rate.
+
+When ``state_file`` is set the bucket is persisted and guarded by an advisory
+file lock, so back-to-back runs and parallel worker processes draw from one
+shared budget.
+"""
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to an in-process bucket
+    fcntl = None
+
+DEFAULT_CALLS_PER_HOUR = 550
+DEFAULT_MIN_INTERVAL = 0.6  # seconds between request starts
+BASE_BACKOFF = 10.0  # seconds
+MAX_BACKOFF = 600.0  # seconds
+
+
+class RateLimiter:
+    """Thread-safe token bucket with multiplicative backoff on failures."""
+
+    def __init__(
+        self,
+        calls_per_hour: float = DEFAULT_CALLS_PER_HOUR,
+        burst: Optional[int] = None,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        state_file: Optional[Path] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.calls_per_hour = calls_per_hour
+        self.burst = burst if burst is not None else int(calls_per_hour)
+        self.min_interval = min_interval
+        self.state_file = Path(state_file) if state_file and fcntl else None
+        self._base_rate = calls_per_hour / 3600.0
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._state: Dict[str, float] = self._fresh_state()
+
+    def _fresh_state(self) -> Dict[str, float]:
+        return {
+            "tokens": float(self.burst),
+            "rate": self._base_rate,
+            "updated": time.time(),
+            "last_call": 0.0,
+            "paused_until": 0.0,
+        }
+
+    @contextmanager
+    def _shared_state(self) -> Iterator[Dict[str, float]]:
+        """Yield the bucket state, loading and saving it under a file lock."""
+        with self._lock:
+            if self.state_file is None:
+                yield self._state
+                return
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.state_file, "a+") as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    handle.seek(0)
+                    raw = handle.read()
+                    state = json.loads(raw) if raw.strip() else self._fresh_state()
+                    yield state
+                    handle.seek(0)
+                    handle.truncate()
+                    json.dump(state, handle)
+                    handle.flush()
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _refill(self, state: Dict[str, float], now: float) -> None:
+        elapsed = max(0.0, now - state["updated"])
+        state["tokens"] = min(float(self.burst), state["tokens"] + elapsed * state["rate"])
+        state["updated"] = now
+
+    def try_acquire(self) -> float:
+        """Take a token if one is available now and return 0.
+
+        Otherwise take nothing and return the seconds until one might be, so
+        callers that cannot block (e.g. asyncio tasks) can sleep their own way.
+        """
+        with self._shared_state() as state:
+            now = time.time()
+            self._refill(state, now)
+            wait = max(
+                state["paused_until"] - now,
+                state["last_call"] + self.min_interval - now,
+                (1.0 - state["tokens"]) / state["rate"],
+                0.0,
+            )
+            if wait <= 0:
+                state["tokens"] -= 1.0
+                state["last_call"] = now
+                return 0.0
+            return wait
+
+    def acquire(self) -> float:
+        """Block until a request may be sent; return the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    def record_success(self) -> None:
+        """Additively restore the refill rate after a healthy response."""
+        with self._shared_state() as state:
+            state["rate"] = min(self._base_rate, state["rate"] + 0.05 * self._base_rate)
+
+    def record_failure(self, attempt: int) -> float:
+        """Halve the refill rate and pause everyone; return the pause length."""
+        backoff = min(MAX_BACKOFF, BASE_BACKOFF * 2**attempt)
+        delay = backoff * self._random.uniform(0.5, 1.5)
+        with self._shared_state() as state:
+            now = time.time()
+            self._refill(state, now)
+            state["rate"] = max(0.1 * self._base_rate, state["rate"] * 0.5)
+            state["tokens"] = 0.0
+            state["paused_until"] = max(state["paused_until"], now + delay)
+        return delay
+
+    def estimate_wait(self, calls: int) -> float:
+        """Seconds of throttling needed for ``calls`` more requests right now."""
+        with self._shared_state() as state:
+            self._refill(state, time.time())
+            shortfall = max(0.0, calls - state["tokens"])
+            return max(shortfall / state["rate"], calls * self.min_interval)
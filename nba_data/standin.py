@@ -0,0 +1,393 @@
+"""
+Local stand-in for stats.nba.com: record real responses once, replay them offline.
+
+The server answers ``GET /stats/<endpoint>?<query>`` the way stats.nba.com
+does. Point the scripts at it with ``NBA_STATS_SERVER=http://127.0.0.1:8765/stats``
+(or ``nba_data.configure_stats_server``). It runs in one of two modes:
+
+* record: every request is forwarded to ``--upstream`` (the live API by
+  default), and each successful response is saved to the recording directory
+  before it is returned.
+* replay: responses come only from the recording directory. An unrecorded
+  request gets a 404.
+
+Either mode can inject faults so that throughput, retries and backoff can be
+exercised deterministically. The faults are extra latency, stalled
+connections that trip the client timeout, 429 rate-limit responses and 503
+server errors:
+
+    uv run python3 -m nba_data.standin serve --recordings recordings --record
+    uv run python3 -m nba_data.standin serve --recordings recordings \\
+        --latency-ms 80 --jitter-ms 40 --rate-limit-rate 0.05 --timeout-rate 0.01
+    uv run python3 -m nba_data.standin import-cache --recordings recordings
+
+Recordings are keyed the way requests puts them on the wire. ``None``
+parameters are dropped and every value is sent as a string, so keys recorded
+by the server and keys imported from the response cache line up.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from nba_data.cache import DEFAULT_CACHE_DIR, cache_key
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_UPSTREAM = "https://stats.nba.com/stats"
+DEFAULT_STALL_SECONDS = 35.0  # longer than nba_api's 30 s default timeout
+RETRY_AFTER_SECONDS = 1
+
+# Request headers never forwarded upstream in record mode
+_HOP_HEADERS = {"host", "connection", "keep-alive", "content-length", "accept-encoding"}
+
+
+def wire_parameters(parameters: Mapping[str, Any]) -> Dict[str, str]:
+    """Return ``parameters`` as requests sends them: no ``None``, all strings."""
+    return {key: str(value) for key, value in parameters.items() if value is not None}
+
+
+class RecordingStore:
+    """Directory of recorded responses, one gzip file per endpoint request.
+
+    Files live at ``<root>/<endpoint>/<key>.json.gz``. Each file holds a small
+    JSON envelope with the endpoint, wire parameters and response body, so a
+    recording can be inspected or pruned without an index.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, endpoint: str, parameters: Mapping[str, Any]) -> Path:
+        key = cache_key(endpoint, wire_parameters(parameters))
+        return self.root / endpoint.lower() / f"{key}.json.gz"
+
+    def get(self, endpoint: str, parameters: Mapping[str, Any]) -> Optional[str]:
+        """Return the recorded response body, or ``None`` if never recorded."""
+        path = self._path(endpoint, parameters)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                return json.load(handle)["body"]
+        except FileNotFoundError:
+            return None
+
+    def put(self, endpoint: str, parameters: Mapping[str, Any], body: str) -> None:
+        """Save one response, replacing any earlier recording of the same request."""
+        path = self._path(endpoint, parameters)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        envelope = {
+            "endpoint": endpoint.lower(),
+            "parameters": wire_parameters(parameters),
+            "recorded_at": time.time(),
+            "body": body,
+        }
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as handle:
+            handle.write(json.dumps(envelope).encode("utf-8"))
+        os.replace(tmp_name, path)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.root.glob("*/*.json.gz"))
+
+    def import_cache(self, cache_root: Path = DEFAULT_CACHE_DIR) -> int:
+        """Copy every entry of a ``ResponseCache`` directory into this store.
+
+        Expired entries are included as well: for replay, a stale body is still
+        a realistic one. Returns the number of responses imported.
+        """
+        cache_root = Path(cache_root)
+        db = sqlite3.connect(cache_root / "index.sqlite")
+        try:
+            rows = db.execute("SELECT key, endpoint, parameters FROM entries").fetchall()
+        finally:
+            db.close()
+        imported = 0
+        for key, endpoint, parameters in rows:
+            path = cache_root / "objects" / key[:2] / f"{key}.json.gz"
+            if not path.exists():
+                continue
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                self.put(endpoint, json.loads(parameters), handle.read())
+            imported += 1
+        return imported
+
+
+class FaultProfile:
+    """Seeded fault injection applied to every request before it is answered.
+
+    Each request first waits ``latency_ms`` plus up to ``jitter_ms``. It then
+    stalls with probability ``timeout_rate``, gets a 429 with probability
+    ``rate_limit_rate``, or gets a 503 with probability ``error_rate``. A
+    stalled request sleeps ``stall_seconds`` and the connection is dropped
+    without a response. A client with a shorter timeout sees a timeout; any
+    other client sees a connection error.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        timeout_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        error_rate: float = 0.0,
+        stall_seconds: float = DEFAULT_STALL_SECONDS,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.timeout_rate = timeout_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.error_rate = error_rate
+        self.stall_seconds = stall_seconds
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self) -> Tuple[float, Any]:
+        """Return ``(delay_seconds, fault)`` where fault is None, "timeout", 429 or 503."""
+        with self._lock:
+            delay = (self.latency_ms + self._random.random() * self.jitter_ms) / 1000.0
+            roll = self._random.random()
+        if roll < self.timeout_rate:
+            return delay, "timeout"
+        roll -= self.timeout_rate
+        if roll < self.rate_limit_rate:
+            return delay, 429
+        roll -= self.rate_limit_rate
+        if roll < self.error_rate:
+            return delay, 503
+        return delay, None
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Threaded HTTP server that replays (or records) stats.nba.com responses."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        store: RecordingStore,
+        faults: Optional[FaultProfile] = None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        upstream: Optional[str] = None,
+        quiet: bool = True,
+    ) -> None:
+        super().__init__((host, port), _Handler)
+        self.store = store
+        self.faults = faults or FaultProfile()
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.quiet = quiet
+        self.counts: Dict[str, int] = {
+            "requests": 0, "served": 0, "recorded": 0, "missing": 0,
+            "timeouts": 0, "rate_limited": 0, "errors": 0,
+        }
+        self._counts_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Value for ``NBA_STATS_SERVER`` that routes nba_api here."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/stats"
+
+    def count(self, name: str) -> None:
+        with self._counts_lock:
+            self.counts[name] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        """Copy of the request counters (also served at ``/_standin/stats``)."""
+        with self._counts_lock:
+            return dict(self.counts)
+
+    def start(self) -> "StandInServer":
+        """Serve from a background daemon thread and return ``self``."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StandInServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _reply(self, status: int, body: str, headers: Optional[Dict[str, str]] = None) -> None:
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path == "/_standin/stats":
+            self._reply(200, json.dumps(self.server.snapshot()))
+            return
+        if not url.path.startswith("/stats/"):
+            self._reply(404, json.dumps({"message": f"Unknown path {url.path}"}))
+            return
+
+        server = self.server
+        server.count("requests")
+        endpoint = url.path[len("/stats/"):].strip("/")
+        parameters = dict(parse_qsl(url.query, keep_blank_values=True))
+
+        delay, fault = server.faults.draw()
+        if delay:
+            time.sleep(delay)
+        if fault == "timeout":
+            server.count("timeouts")
+            time.sleep(server.faults.stall_seconds)
+            self.close_connection = True
+            return
+        if fault == 429:
+            server.count("rate_limited")
+            self._reply(429, json.dumps({"message": "Too Many Requests"}),
+                        {"Retry-After": str(RETRY_AFTER_SECONDS)})
+            return
+        if fault == 503:
+            server.count("errors")
+            self._reply(503, json.dumps({"message": "Service Unavailable"}))
+            return
+
+        body = server.store.get(endpoint, parameters)
+        if body is None and server.upstream is not None:
+            body = self._record(endpoint, parameters)
+            if body is None:
+                return
+        if body is None:
+            server.count("missing")
+            self._reply(404, json.dumps({"message": f"No recording for {endpoint} {parameters}"}))
+            return
+        server.count("served")
+        self._reply(200, body)
+
+    def _record(self, endpoint: str, parameters: Dict[str, str]) -> Optional[str]:
+        """Forward one request upstream; save and return the body if it is valid JSON."""
+        import requests
+
+        headers = {
+            name: value for name, value in self.headers.items()
+            if name.lower() not in _HOP_HEADERS
+        }
+        try:
+            response = requests.get(
+                f"{self.server.upstream}/{endpoint}",
+                params=sorted(parameters.items()),
+                headers=headers,
+                timeout=60,
+            )
+        except requests.exceptions.RequestException as exc:
+            self._reply(502, json.dumps({"message": f"Upstream request failed: {exc}"}))
+            return None
+        body = response.text
+        try:
+            json.loads(body)
+        except ValueError:
+            self._reply(response.status_code if response.status_code >= 400 else 502, body)
+            return None
+        if response.status_code != 200:
+            self._reply(response.status_code, body)
+            return None
+        self.server.store.put(endpoint, parameters, body)
+        self.server.count("recorded")
+        return body
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Record and replay stats.nba.com responses locally.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Run the stand-in server.")
+    serve.add_argument("--recordings", type=Path, required=True, help="Recording directory.")
+    serve.add_argument("--host", default=DEFAULT_HOST)
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--record", action="store_true", help="Forward misses upstream and save the responses.")
+    serve.add_argument("--upstream", default=DEFAULT_UPSTREAM, help="Upstream base URL in record mode.")
+    serve.add_argument("--latency-ms", type=float, default=0.0, help="Added delay per request.")
+    serve.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform random extra delay.")
+    serve.add_argument("--timeout-rate", type=float, default=0.0, help="Fraction of requests that stall.")
+    serve.add_argument("--stall-seconds", type=float, default=DEFAULT_STALL_SECONDS)
+    serve.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction answered with 429.")
+    serve.add_argument("--error-rate", type=float, default=0.0, help="Fraction answered with 503.")
+    serve.add_argument("--seed", type=int, help="Seed for reproducible fault sequences.")
+    serve.add_argument("--verbose", action="store_true", help="Log every request.")
+
+    imports = commands.add_parser("import-cache", help="Seed recordings from a response cache.")
+    imports.add_argument("--recordings", type=Path, required=True)
+    imports.add_argument("--cache-dir", type=Path, default=Path(os.environ.get("NBA_CACHE_DIR", DEFAULT_CACHE_DIR)))
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    store = RecordingStore(args.recordings)
+
+    if args.command == "import-cache":
+        imported = store.import_cache(args.cache_dir)
+        print(f"Imported {imported} response(s) from {args.cache_dir} into {args.recordings}")
+        return 0
+
+    faults = FaultProfile(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        timeout_rate=args.timeout_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        error_rate=args.error_rate,
+        stall_seconds=args.stall_seconds,
+        seed=args.seed,
+    )
+    server = StandInServer(
+        store,
+        faults,
+        host=args.host,
+        port=args.port,
+        upstream=args.upstream if args.record else None,
+        quiet=not args.verbose,
+    )
+    mode = f"recording from {server.upstream}" if args.record else "replay only"
+    print(f"Serving {len(store)} recording(s) from {args.recordings} ({mode})")
+    print(f"export NBA_STATS_SERVER={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\nRequest counts: {json.dumps(server.snapshot())}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,226 @@
+"""
+Season-partitioned Parquet storage with declared schemas.
+
+Both datasets are written as hive-partitioned Parquet directories
+(``<root>/SEASON=2023-24/part-0.parquet``) so that loading one season reads
+only that partition. The schemas pin ID columns to strings/categoricals
+(keeping ``game_id`` leading zeros and ten-digit team IDs intact), counts to
+int16 and metrics to float32.
+
+The loaders accept either a Parquet directory or a legacy CSV and return
+identically-typed frames, so analysis code does not care which it was given::
+
+    python -m nba_data.storage ballhog/ballhog_metrics.csv leaderboard
+    python -m nba_data.storage flagrant_fouls/nba_flagrant_fouls.csv flagrant_games
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+LEADERBOARD_SCHEMA = pa.schema(
+    [
+        ("SEASON", pa.string()),
+        ("PLAYER_ID", pa.string()),
+        ("PLAYER_NAME", pa.string()),
+        ("TEAM_ID", CATEGORY),
+        ("TEAM_ABBREVIATION", CATEGORY),
+        ("GP", pa.int16()),
+        ("MIN", pa.float32()),
+        ("FGA", pa.int16()),
+        ("FTA", pa.int16()),
+        ("TOV", pa.int16()),
+        ("AST_PCT", pa.float32()),
+        ("TEAM_NAME", CATEGORY),
+        ("GP_TEAM", pa.int16()),
+        ("FGA_TEAM", pa.int16()),
+        ("FTA_TEAM", pa.int16()),
+        ("TOV_TEAM", pa.int16()),
+        ("PLAYER_POSSESSIONS", pa.float32()),
+        ("TEAM_POSSESSIONS", pa.float32()),
+        ("USG_PCT", pa.float32()),
+        ("SELF_CREATION_INDEX", pa.float32()),
+        ("AST_TO_USG_RATIO", pa.float32()),
+        ("SHOT_CREATION_LOAD", pa.float32()),
+        ("SELFISHNESS_SCORE", pa.float32()),
+        ("KOBE_QUOTIENT", pa.float32()),
+        ("TEAM_RANK", pa.int16()),
+        ("LEAGUE_RANK", pa.int16()),
+    ]
+)
+
+ROLLING_SELFISHNESS_SCHEMA = pa.schema(
+    [
+        ("SEASON", pa.string()),
+        ("PLAYER_ID", pa.int32()),
+        ("PLAYER_NAME", CATEGORY),
+        ("TEAM_ID", CATEGORY),
+        ("GAME_ID", pa.string()),
+        ("GAME_DATE", pa.date32()),
+        ("WINDOW", pa.int16()),
+        ("GAMES", pa.int16()),
+        ("USG_PCT", pa.float32()),
+        ("AST_PCT", pa.float32()),
+        ("SELF_CREATION_INDEX", pa.float32()),
+        ("AST_TO_USG_RATIO", pa.float32()),
+        ("SHOT_CREATION_LOAD", pa.float32()),
+        ("SELFISHNESS_SCORE", pa.float32()),
+    ]
+)
+
+_GAME_COUNT_COLUMNS = [
+    f"{side}_{stat}"
+    for stat in (
+        "flagrants",
+        "score",
+        "rebounds",
+        "assists",
+        "turnovers",
+        "ftm",
+        "fta",
+        "inactive_players",
+    )
+    for side in ("home", "away")
+]
+
+# Play-by-play rule features (flagrant_fouls/pbp_rules.py); null for games
+# extracted before they existed
+_GAME_EVENT_COLUMNS = [
+    f"{side}_{feature}"
+    for feature in ("technicals", "ejections", "foul_outs", "first_flagrant_period")
+    for side in ("home", "away")
+]
+
+FLAGRANT_GAMES_SCHEMA = pa.schema(
+    [
+        ("season", pa.string()),
+        ("game_id", pa.string()),
+        ("home_team", CATEGORY),
+        ("away_team", CATEGORY),
+    ]
+    + [(name, pa.int16()) for name in _GAME_COUNT_COLUMNS + _GAME_EVENT_COLUMNS]
+)
+
+# Dataset name -> (schema, partition column)
+DATASETS: Dict[str, tuple] = {
+    "leaderboard": (LEADERBOARD_SCHEMA, "SEASON"),
+    "flagrant_games": (FLAGRANT_GAMES_SCHEMA, "season"),
+    "rolling_selfishness": (ROLLING_SELFISHNESS_SCHEMA, "SEASON"),
+}
+
+_STRING_TYPES = (pa.string(), CATEGORY)
+
+
+def season_from_game_id(game_id: str) -> str:
+    """Map a ten-digit game ID such as ``0022300405`` to ``2023-24``."""
+    year = int(str(game_id).zfill(10)[3:5])
+    start = 1900 + year if year >= 46 else 2000 + year
+    return f"{start}-{(start + 1) % 100:02d}"
+
+
+def conform(df: pd.DataFrame, dataset: str) -> pa.Table:
+    """Cast a frame to the dataset's declared schema (extra columns are dropped)."""
+    schema, partition_col = DATASETS[dataset]
+    df = df.copy()
+    if dataset == "flagrant_games":
+        df["game_id"] = df["game_id"].astype(str).str.zfill(10)
+        if "season" not in df.columns:
+            df["season"] = df["game_id"].map(season_from_game_id)
+        for name in _GAME_EVENT_COLUMNS:
+            if name not in df.columns:
+                df[name] = pd.Series(pd.NA, index=df.index, dtype="Int16")
+    for field in schema:
+        if field.type in _STRING_TYPES and field.name in df.columns:
+            df[field.name] = df[field.name].astype(str)
+    return pa.Table.from_pandas(df[schema.names], schema=schema, preserve_index=False)
+
+
+def write_partitioned(df: pd.DataFrame, root: Path, dataset: str) -> None:
+    """Write ``df`` as season partitions, replacing only the seasons it contains."""
+    schema, partition_col = DATASETS[dataset]
+    table = conform(df, dataset)
+    ds.write_dataset(
+        table,
+        str(root),
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([(partition_col, pa.string())]), flavor="hive"),
+        existing_data_behavior="delete_matching",
+        basename_template="part-{i}.parquet",
+    )
+
+
+def _csv_dtypes(schema: pa.Schema) -> Dict[str, type]:
+    return {field.name: str for field in schema if field.type in _STRING_TYPES}
+
+
+def load(
+    path: Path,
+    dataset: str,
+    seasons: Optional[Iterable[str]] = None,
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """Load a dataset from a Parquet directory or CSV, optionally for some seasons.
+
+    For Parquet the season filter is pushed down to partition pruning, so
+    unrequested seasons are never read from disk.
+    """
+    schema, partition_col = DATASETS[dataset]
+    path = Path(path)
+    seasons = list(seasons) if seasons is not None else None
+
+    if path.is_dir():
+        dataset_obj = ds.dataset(
+            str(path),
+            format="parquet",
+            schema=schema,
+            partitioning=ds.partitioning(pa.schema([(partition_col, pa.string())]), flavor="hive"),
+        )
+        row_filter = ds.field(partition_col).isin(seasons) if seasons is not None else None
+        table = dataset_obj.to_table(columns=columns, filter=row_filter)
+    else:
+        df = pd.read_csv(path, dtype=_csv_dtypes(schema))
+        table = conform(df, dataset)
+        if seasons is not None:
+            table = table.filter(ds.field(partition_col).isin(seasons))
+        if columns is not None:
+            table = table.select(columns)
+    return table.to_pandas()
+
+
+def load_leaderboard(path: Path, seasons: Optional[Iterable[str]] = None, **kwargs) -> pd.DataFrame:
+    return load(path, "leaderboard", seasons, **kwargs)
+
+
+def load_flagrant_games(path: Path, seasons: Optional[Iterable[str]] = None, **kwargs) -> pd.DataFrame:
+    return load(path, "flagrant_games", seasons, **kwargs)
+
+
+def load_rolling_selfishness(path: Path, seasons: Optional[Iterable[str]] = None, **kwargs) -> pd.DataFrame:
+    return load(path, "rolling_selfishness", seasons, **kwargs)
+
+
+def main(argv: List[str]) -> int:
+    """Convert a legacy CSV into a partitioned Parquet directory next to it."""
+    parser = argparse.ArgumentParser(description="Convert a CSV dataset to partitioned Parquet.")
+    parser.add_argument("csv", type=Path)
+    parser.add_argument("dataset", choices=sorted(DATASETS))
+    parser.add_argument("--output", type=Path, help="Defaults to the CSV path with a .parquet suffix.")
+    args = parser.parse_args(argv)
+
+    output = args.output or args.csv.with_suffix(".parquet")
+    df = load(args.csv, args.dataset)
+    write_partitioned(df, output, args.dataset)
+    print(f"Wrote {len(df)} rows to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))